@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+import jwt
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from backend.conf import Config
+from backend.database.async_db import AsyncTriviaDatabaseManager
+from backend.ratelimit import ConcurrencyLimiter
+
+
+logger = logging.getLogger(__name__)
+
+ALGORITHM = "HS256"
+
+
+class AuthenticationError(Exception):
+    """Missing, invalid, expired or revoked credentials."""
+
+
+class AuthBusyError(Exception):
+    """Too many logins are waiting for the argon2 threads."""
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    user_id: int
+    session_id: str
+    admin: bool
+    expires_at: int  # unix time
+
+
+def log_code(email: str, code: str):
+    """Development stand-in for mailing the login code."""
+    logger.warning("No login code delivery configured; code for %s is %s", email, code)
+
+
+class Authenticator:
+    """Passwordless login with emailed codes, then stateless signed access tokens.
+
+    Only logins touch argon2 and the database: ``request_code`` stores a
+    hashed one-time code, and ``login`` verifies it and starts a session.
+    A code is discarded after ``max_code_attempts`` wrong guesses, so it
+    can't be brute-forced within its lifetime.
+    Both hash on a small dedicated executor behind a ConcurrencyLimiter,
+    so a burst of logins queues there (and is shed when the queue is full)
+    instead of occupying request or DB threads.
+
+    Every other request is checked by ``verify``: a JWT signature and expiry
+    check plus a lookup in the in-memory set of revoked sessions, with no
+    database access. The set is reloaded from RevokedSessions by
+    ``sync_revocations`` whenever the database changes, so a logout in one
+    worker reaches the others within a change-poll interval.
+    """
+
+    def __init__(self,
+                 db: AsyncTriviaDatabaseManager,
+                 secret_key: str = Config.AUTH_SECRET_KEY,
+                 token_ttl: int = Config.AUTH_TOKEN_TTL,
+                 code_ttl: int = Config.AUTH_CODE_TTL,
+                 max_code_attempts: int = Config.AUTH_MAX_CODE_ATTEMPTS,
+                 hash_workers: int = Config.AUTH_HASH_WORKERS,
+                 max_pending_hashes: int = Config.AUTH_MAX_PENDING_HASHES,
+                 hash_queue_timeout: float = Config.AUTH_HASH_QUEUE_TIMEOUT,
+                 admin_emails: frozenset[str] = Config.AUTH_ADMIN_EMAILS,
+                 send_code: Callable[[str, str], None] = log_code
+    ):
+        self._db = db
+        self._secret_key = secret_key
+        self.token_ttl = token_ttl
+        self._code_ttl = code_ttl
+        self._max_code_attempts = max_code_attempts
+        self._admin_emails = admin_emails
+        self._send_code = send_code
+        self._hasher = PasswordHash((Argon2Hasher(),))
+        self._hash_workers = hash_workers
+        self._hash_slots = ConcurrencyLimiter(hash_workers, max_pending_hashes, hash_queue_timeout)
+        self._executor: ThreadPoolExecutor | None = None
+        self._revoked: frozenset[str] = frozenset()
+
+    async def _hash_job(self, fn, *args):
+        if not await self._hash_slots.acquire():
+            raise AuthBusyError("Too many logins in progress")
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._hash_workers,
+                    thread_name_prefix="trivia-auth"
+                )
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._hash_slots.release()
+
+    async def request_code(self, email: str):
+        """Create and send a login code. Unknown emails are ignored, so callers can't probe for users."""
+        code = f"{secrets.randbelow(10 ** Config.AUTH_CODE_DIGITS):0{Config.AUTH_CODE_DIGITS}d}"
+        hashed_code = await self._hash_job(self._hasher.hash, code)
+        if await self._db.set_mfa_code(email, hashed_code, self._code_ttl) is not None:
+            self._send_code(email, code)
+
+    async def login(self, email: str, code: str) -> str:
+        """Exchange a valid login code for an access token, starting a new session."""
+        stored = await self._db.get_mfa_code(email)
+        if stored is None:
+            raise AuthenticationError("Invalid or expired login code")
+
+        user_id, hashed_code = stored
+        if not await self._hash_job(self._hasher.verify, code, hashed_code):
+            await self._db.fail_mfa_code(user_id, hashed_code, self._max_code_attempts)
+            raise AuthenticationError("Invalid or expired login code")
+
+        session_id = secrets.token_urlsafe(16)
+        if not await self._db.start_session(user_id, hashed_code, session_id, int(time.time()) + self.token_ttl):
+            raise AuthenticationError("Invalid or expired login code")  # Used up or discarded while verifying
+        return self.issue_token(user_id, session_id, admin=self.is_admin(email))
+
+    def is_admin(self, email: str) -> bool:
+        return email.lower() in self._admin_emails
+
+    def issue_token(self, user_id: int, session_id: str, admin: bool = False) -> str:
+        now = int(time.time())
+        return jwt.encode(
+            {"sub": str(user_id), "sid": session_id, "adm": admin, "iat": now, "exp": now + self.token_ttl},
+            self._secret_key,
+            algorithm=ALGORITHM
+        )
+
+    def verify(self, token: str) -> TokenClaims:
+        """Claims of a valid token; checked in memory only."""
+        try:
+            payload = jwt.decode(
+                token, self._secret_key, algorithms=[ALGORITHM], options={"require": ["exp", "sub", "sid"]}
+            )
+        except jwt.InvalidTokenError as e:
+            raise AuthenticationError(f"Invalid token: {e}")
+
+        if payload["sid"] in self._revoked:
+            raise AuthenticationError("Session has been logged out")
+        return TokenClaims(
+            user_id=int(payload["sub"]),
+            session_id=payload["sid"],
+            admin=bool(payload.get("adm", False)),
+            expires_at=payload["exp"]
+        )
+
+    async def refresh(self, claims: TokenClaims) -> str:
+        """A new token for a still current session; one DB write per token lifetime.
+
+        Admin status is looked up again rather than copied from ``claims``, so
+        removing an email from the admin list takes effect on the next refresh.
+        """
+        email = await self._db.refresh_session(claims.user_id, claims.session_id)
+        if email is None:
+            raise AuthenticationError("Session has ended")
+        return self.issue_token(claims.user_id, claims.session_id, admin=self.is_admin(email))
+
+    async def logout(self, claims: TokenClaims):
+        # Revoked until the newest token of the session could expire
+        await self._db.end_session(claims.user_id, claims.session_id, int(time.time()) + self.token_ttl)
+        self._revoked = self._revoked | {claims.session_id}
+
+    def sync_revocations(self):
+        """Reload revoked sessions from the database (blocking; run off the event loop)."""
+        self._revoked = frozenset(self._db.sync.get_revoked_sessions())
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
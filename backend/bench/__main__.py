@@ -0,0 +1,4 @@
+import sys
+from backend.bench.run import main
+
+sys.exit(main())
@@ -0,0 +1,316 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable
+import httpx
+from backend.bench.synthetic import correct_answer, generate_question_bank, CATEGORIES, DIFFICULTIES
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+ROUND_SIZE = 5
+
+
+@dataclass
+class OperationStats:
+    """Latency summary for one kind of request, in milliseconds."""
+    requests: int
+    errors: int
+    rps: float
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> OperationStats:
+    values = sorted(latency * 1000 for latency in latencies)
+    return OperationStats(
+        requests=len(values),
+        errors=errors,
+        rps=round(len(values) / seconds, 1) if seconds else 0.0,
+        mean=round(sum(values) / len(values), 3) if values else 0.0,
+        p50=round(percentile(values, 50), 3),
+        p95=round(percentile(values, 95), 3),
+        p99=round(percentile(values, 99), 3),
+        max=round(values[-1], 3) if values else 0.0,
+    )
+
+
+class Recorder:
+    """Collects per-operation latencies and error counts while ``active``."""
+
+    def __init__(self):
+        self.active = False
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    async def request(self, client: httpx.AsyncClient, operation: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        elapsed = time.perf_counter() - started
+
+        if self.active:
+            if ok:
+                self.latencies.setdefault(operation, []).append(elapsed)
+            else:
+                self.errors[operation] = self.errors.get(operation, 0) + 1
+        return response if ok else None
+
+
+Scenario = Callable[[httpx.AsyncClient, Recorder, random.Random, "BenchConfig"], Awaitable[None]]
+
+
+@dataclass
+class BenchConfig:
+    questions: int = 10_000
+    users: int = 1000
+    concurrency: int = 16
+    duration: float = 10.0
+    warmup: float = 2.0
+    scenarios: list[str] = field(default_factory=lambda: list(SCENARIOS))
+
+
+async def scenario_random(client, recorder, rng, config):
+    params = {}
+    if rng.random() < 0.5:
+        params['category'] = rng.choice(CATEGORIES)
+    if rng.random() < 0.5:
+        params['difficulty'] = rng.choice(DIFFICULTIES)
+    await recorder.request(client, "random", "GET", "/questions/random", params=params)
+
+
+async def scenario_listing(client, recorder, rng, config):
+    category = rng.choice(CATEGORIES)
+    response = await recorder.request(
+        client, "listing", "GET", f"/questions/category/{category}", params={'limit': 100}
+    )
+    after = response.headers.get('x-next-after') if response is not None else None
+    if after is not None:
+        await recorder.request(
+            client, "listing.next_page", "GET", f"/questions/category/{category}",
+            params={'limit': 100, 'after': after}
+        )
+
+
+async def scenario_answer(client, recorder, rng, config):
+    question_id = rng.randint(1, config.questions)
+    text = correct_answer(question_id) if rng.random() < 0.5 else "no idea"
+    await recorder.request(
+        client, "answer", "POST", "/questions/responses/", json={'question_id': question_id, 'text': text}
+    )
+
+
+async def scenario_round(client, recorder, rng, config):
+    response = await recorder.request(
+        client, "round.create", "POST", "/rounds/create",
+        params={'user_id': rng.randint(1, config.users), 'size': ROUND_SIZE}
+    )
+    if response is None:
+        return
+    round_id = response.json()['round_id']
+    for _ in range(ROUND_SIZE):
+        response = await recorder.request(client, "round.current", "GET", f"/rounds/{round_id}/questions/current")
+        if response is None:
+            return
+        question_id = response.json()['question_id']
+        text = correct_answer(question_id) if rng.random() < 0.5 else "no idea"
+        await recorder.request(
+            client, "round.answer", "POST", f"/rounds/{round_id}/answers",
+            json={'question_id': question_id, 'text': text}
+        )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    'random': scenario_random,
+    'listing': scenario_listing,
+    'answer': scenario_answer,
+    'round': scenario_round,
+}
+
+
+async def run_scenario(base_url: str, name: str, config: BenchConfig, seed: int) -> dict[str, OperationStats]:
+    """Drive one scenario with ``config.concurrency`` clients; warm up, then measure for ``config.duration``."""
+    scenario = SCENARIOS[name]
+    recorder = Recorder()
+    stop_at = time.perf_counter() + config.warmup + config.duration
+    limits = httpx.Limits(max_connections=config.concurrency, max_keepalive_connections=config.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def worker(worker_id: int):
+            rng = random.Random(seed * 1000 + worker_id)
+            while time.perf_counter() < stop_at:
+                await scenario(client, recorder, rng, config)
+
+        async def measure():
+            await asyncio.sleep(config.warmup)
+            recorder.active = True
+            started = time.perf_counter()
+            await asyncio.sleep(config.duration)
+            recorder.active = False
+            return time.perf_counter() - started
+
+        *_, seconds = await asyncio.gather(*(worker(i) for i in range(config.concurrency)), measure())
+
+    operations = set(recorder.latencies) | set(recorder.errors)
+    return {
+        operation: summarize(recorder.latencies.get(operation, []), recorder.errors.get(operation, 0), seconds)
+        for operation in sorted(operations)
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path: str, port: int, startup_timeout: float) -> subprocess.Popen:
+    """Run the real app under uvicorn against ``db_path`` and wait until it answers."""
+    # Every simulated client shares one IP, so the per-client limits would dominate the results
+    env = dict(os.environ, TRIVIA_DB_PATH=db_path, TRIVIA_RATE_LIMIT_ENABLED="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=REPO_ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1.0).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise TimeoutError(f"Server did not start within {startup_timeout}s")
+
+
+def run_benchmarks(db_path: str, config: BenchConfig, seed: int = 0, startup_timeout: float = 300.0) -> dict:
+    port = free_port()
+    server = start_server(db_path, port, startup_timeout)
+    try:
+        results = {}
+        for i, name in enumerate(config.scenarios):
+            results.update(asyncio.run(run_scenario(f"http://127.0.0.1:{port}", name, config, seed + i)))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return {
+        'meta': {
+            **asdict(config),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'results': {operation: asdict(stats) for operation, stats in results.items()},
+    }
+
+
+def format_results(report: dict) -> str:
+    lines = [f"{'operation':<20}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>8}"]
+    for operation, stats in report['results'].items():
+        lines.append(
+            f"{operation:<20}{stats['rps']:>10.1f}{stats['p50']:>10.2f}{stats['p95']:>10.2f}"
+            f"{stats['p99']:>10.2f}{stats['max']:>10.2f}{stats['errors']:>8}"
+        )
+    return "\n".join(lines)
+
+
+def compare(baseline: dict, current: dict, threshold: float = 10.0) -> tuple[list[str], list[str]]:
+    """Compare two reports; returns (lines, regressions).
+
+    A regression is a p50/p95/p99 latency that grew, or a req/s that fell,
+    by more than ``threshold`` percent.
+    """
+    lines, regressions = [], []
+    for operation, stats in current['results'].items():
+        base = baseline['results'].get(operation)
+        if base is None:
+            lines.append(f"{operation}: new, no baseline")
+            continue
+
+        changes = []
+        for metric in ('rps', 'p50', 'p95', 'p99'):
+            before, after = base[metric], stats[metric]
+            change = (after - before) / before * 100 if before else 0.0
+            worse = -change if metric == 'rps' else change
+            flag = " !" if worse > threshold else ""
+            changes.append(f"{metric} {before:.2f} -> {after:.2f} ({change:+.1f}%){flag}")
+            if flag:
+                regressions.append(f"{operation} {metric} {change:+.1f}%")
+        lines.append(f"{operation}: " + ", ".join(changes))
+    return lines, regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the trivia API against a synthetic question bank.")
+    parser.add_argument('--questions', type=int, default=10_000, help="Synthetic questions to generate")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--db', help="Database to benchmark; generated here if the file does not exist")
+    parser.add_argument('--concurrency', type=int, default=16, help="Concurrent clients")
+    parser.add_argument('--duration', type=float, default=10.0, help="Measured seconds per scenario")
+    parser.add_argument('--warmup', type=float, default=2.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), help="Repeatable, default all")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help="Write the report to this JSON file")
+    parser.add_argument('--compare', help="Baseline JSON report to compare against")
+    parser.add_argument('--threshold', type=float, default=10.0, help="Regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    config = BenchConfig(
+        questions=args.questions,
+        users=args.users,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        warmup=args.warmup,
+        scenarios=args.scenario or list(SCENARIOS),
+    )
+
+    with tempfile.TemporaryDirectory(prefix="trivia-bench-") as tmp:
+        db_path = args.db or str(Path(tmp) / "bench.db")
+        if not Path(db_path).exists():
+            started = time.perf_counter()
+            generate_question_bank(db_path, config.questions, users=config.users, seed=args.seed)
+            print(f"Generated {config.questions:,} questions in {time.perf_counter() - started:.1f}s: {db_path}")
+
+        report = run_benchmarks(db_path, config, seed=args.seed)
+
+    print(format_results(report))
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2))
+        print(f"Saved report to {args.save}")
+
+    if args.compare:
+        lines, regressions = compare(json.loads(Path(args.compare).read_text()), report, args.threshold)
+        print(f"\nCompared with {args.compare} (threshold {args.threshold:.0f}%):")
+        print("\n".join(lines))
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): " + "; ".join(regressions))
+            return 1
+    return 0
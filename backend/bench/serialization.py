@@ -0,0 +1,70 @@
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from pydantic import TypeAdapter
+from backend.bench.synthetic import generate_question_bank
+from backend.schemas import Question
+from backend.serialization import encode_questions, question_from_row
+
+
+QUESTION_LIST = TypeAdapter(list[Question])
+
+
+def validated_path(rows) -> bytes:
+    """What get_all_questions + FastAPI did before: validate each row, then validate and dump the list again."""
+    questions = [Question(**row) for row in rows]
+    return QUESTION_LIST.dump_json(QUESTION_LIST.validate_python(questions))
+
+
+def lean_path(rows) -> bytes:
+    """Trusted rows -> unvalidated models -> pre-encoded JSON, as the listing routes now do."""
+    return encode_questions([question_from_row(row) for row in rows])
+
+
+def best_of(fn, rows, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(questions: int, repeat: int = 5) -> dict[str, float]:
+    """Seconds (best of ``repeat``) to turn every question row into the response body, per path."""
+    with tempfile.TemporaryDirectory(prefix="trivia-bench-") as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        generate_question_bank(db_path, questions, users=1)
+        with sqlite3.connect(db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT question_id, difficulty, category, question_text FROM Questions"
+            ).fetchall()
+
+    if validated_path(rows) != lean_path(rows):
+        raise AssertionError("Lean path produced a different response body")
+
+    return {
+        'validated': best_of(validated_path, rows, repeat),
+        'lean': best_of(lean_path, rows, repeat),
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Compare validated vs lean serialization of get_all_questions results."
+    )
+    parser.add_argument('--questions', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    timings = run(args.questions, args.repeat)
+    for name, seconds in timings.items():
+        print(f"{name:<10}{seconds * 1000:>10.1f} ms  {args.questions / seconds:>12,.0f} rows/s")
+    print(f"speedup   {timings['validated'] / timings['lean']:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
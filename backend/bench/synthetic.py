@@ -0,0 +1,66 @@
+import random
+import sqlite3
+from typing import Iterator
+from backend.conf import Config
+from backend.database.load import LoadStats, bulk_load_records
+from backend.schemas import CategoryChoices, DifficultyChoices
+
+
+CATEGORIES = [category.value for category in CategoryChoices]
+DIFFICULTIES = [difficulty.value for difficulty in DifficultyChoices]
+WORDS = (
+    "river mountain king queen battle planet element painter novel symphony "
+    "engine island empire composer atom galaxy recipe stadium poet invention "
+    "ocean desert castle treaty volcano comet sculpture opera circuit harvest"
+).split()
+
+
+def correct_answer(question_id: int) -> str:
+    """The correct answer stored for a synthetic question, so clients can answer right."""
+    return f"Answer {question_id}"
+
+
+def question_records(count: int, seed: int = 0) -> Iterator[dict]:
+    rng = random.Random(seed)
+    for question_id in range(1, count + 1):
+        topic = " ".join(rng.sample(WORDS, 3))
+        yield {
+            'category': rng.choice(CATEGORIES),
+            'difficulty': rng.choice(DIFFICULTIES),
+            'question_text': f"Synthetic question {question_id}: which {topic}?",
+        }
+
+
+def answer_records(count: int) -> Iterator[dict]:
+    for question_id in range(1, count + 1):
+        yield {'question_id': question_id, 'answer_text': correct_answer(question_id), 'is_correct': 1}
+        yield {'question_id': question_id, 'answer_text': f"Wrong {question_id}", 'is_correct': 0}
+
+
+def generate_question_bank(
+    db_path: str,
+    questions: int,
+    users: int = 1000,
+    seed: int = 0,
+    batch_size: int = Config.BULK_LOAD_BATCH_SIZE
+) -> list[LoadStats]:
+    """Create a database at ``db_path`` with ``questions`` synthetic questions and ``users`` users.
+
+    Questions get ids 1..questions (the database must be new), each with one
+    correct and one wrong answer. Users get ids 1..users.
+    """
+    stats = bulk_load_records(
+        db_path,
+        questions=question_records(questions, seed),
+        answers=answer_records(questions),
+        batch_size=batch_size,
+        dedupe=False,  # Synthetic texts are unique, skip fingerprinting millions of rows
+        link_answers=False
+    )
+
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO Users (user_id, email, username) VALUES (?, ?, ?)",
+            ((user_id, f"bench{user_id}@trivial.pub", f"bench{user_id}") for user_id in range(1, users + 1))
+        )
+    return stats
@@ -1,6 +1,134 @@
+import os
+import secrets
 from dataclasses import dataclass
+from typing import ClassVar
 
 
 @dataclass
 class Config:
-    MAX_QUERY_PARAMETER_LENGTH: int = 32
\ No newline at end of file
+    MAX_QUERY_PARAMETER_LENGTH: int = 32
+
+    # Database
+    DB_PATH: str = os.environ.get("TRIVIA_DB_PATH", "./backend/database/test.db")
+    DB_POOL_SIZE: int = int(os.environ.get("TRIVIA_DB_POOL_SIZE", 8))
+    DB_POOL_TIMEOUT: float = 5.0  # seconds to wait for a free connection
+    DB_SYNCHRONOUS: str = "NORMAL"  # Safe with WAL, avoids an fsync per commit
+    DB_CACHE_SIZE_KIB: int = 16 * 1024  # Page cache per connection
+    DB_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_MAX_IN_PARAMETERS: int = 500  # ids bound per IN (...) query
+    SLOW_QUERY_SECONDS: float = 0.1  # Statements slower than this are logged with their query plan
+
+    # Server
+    WORKERS: int = int(os.environ.get("TRIVIA_WORKERS", 1))  # uvicorn worker processes
+    CHANGE_POLL_INTERVAL: float = 0.25  # seconds between checks for question writes by other workers
+    SYNC_FULL_RELOAD_THRESHOLD: int = 1000  # pending changes above which workers reload everything
+
+    # Question cache
+    QUESTION_CACHE_SIZE: int = int(os.environ.get("TRIVIA_QUESTION_CACHE_SIZE", 4096))  # entries
+    QUESTION_CACHE_TTL: float | None = 300.0  # seconds, None = no expiry
+
+    # Question snapshot (reads served from memory instead of SQLite)
+    QUESTION_SNAPSHOT: bool = os.environ.get("TRIVIA_QUESTION_SNAPSHOT", "0") == "1"
+    # File the snapshot is written to and memory-mapped from, so workers share one copy; None = per process
+    QUESTION_SNAPSHOT_PATH: str | None = os.environ.get("TRIVIA_QUESTION_SNAPSHOT_PATH")
+
+    # Listing / export
+    QUESTION_PAGE_SIZE: int = 100  # Default page size when paginating
+    QUESTION_MAX_PAGE_SIZE: int = 1000
+    QUESTION_EXPORT_BATCH_SIZE: int = 1000  # Rows per fetchmany() when streaming
+
+    # Batch endpoints
+    MAX_BATCH_SIZE: int = 200  # ids / responses per batch request
+
+    # Search
+    DUPLICATE_SIMILARITY_THRESHOLD: float = 0.8  # Word-set similarity at which questions count as duplicates
+    DUPLICATE_CANDIDATES: int = 20  # Full-text matches scored per duplicate check
+
+    # HTTP caching of question reads
+    HTTP_CACHE_MAX_AGE: int = 60  # seconds clients and CDNs may reuse a response without revalidating
+
+    # Rate limiting and admission control
+    RATE_LIMIT_ENABLED: bool = os.environ.get("TRIVIA_RATE_LIMIT_ENABLED", "1") == "1"
+    RATE_LIMIT_IP_RATE: float = 20.0  # tokens per second per client IP
+    RATE_LIMIT_IP_BURST: float = 200.0
+    RATE_LIMIT_USER_RATE: float = 10.0  # tokens per second per user_id
+    RATE_LIMIT_USER_BURST: float = 100.0
+    RATE_LIMIT_MAX_CLIENTS: int = 100_000  # buckets kept per limiter, least recently seen dropped first
+    # Tokens per request by route template; unlisted routes cost 1. For RATE_LIMIT_PAGED_ROUTES these
+    # are unpaginated dumps: requests with limit/after pay RATE_LIMIT_PAGE_COST per page instead
+    RATE_LIMIT_ROUTE_COSTS: ClassVar[dict[str, float]] = {
+        "/questions": 50,
+        "/questions/export": 100,
+        "/questions/category": 10,
+        "/questions/category/{category}": 10,
+        "/questions/difficulty": 10,
+        "/questions/difficulty/{difficulty}": 10,
+        "/questions/search": 5,
+        "/questions/duplicates": 5,
+        "/questions/batch": 5,
+        "/answers/check/batch": 5,
+        "/users/create": 5,
+        "/rounds/create": 2,
+        "/games/create": 5,
+        "/auth/code": 20,
+        "/auth/login": 20,  # argon2 verification
+    }
+    RATE_LIMIT_PAGED_ROUTES: frozenset = frozenset({
+        "/questions",
+        "/questions/category",
+        "/questions/category/{category}",
+        "/questions/difficulty",
+        "/questions/difficulty/{difficulty}",
+    })
+    RATE_LIMIT_PAGE_COST: float = 1.0  # tokens per QUESTION_PAGE_SIZE rows requested, capped at the route cost
+    RATE_LIMIT_REVALIDATION_COST: float = 1.0  # conditional GETs answered with a 304
+    RATE_LIMIT_EXEMPT_PATHS: frozenset = frozenset({"/metrics"})
+    MAX_CONCURRENT_REQUESTS: int = 4 * DB_POOL_SIZE  # in flight per worker before requests queue
+    ADMISSION_QUEUE_SIZE: int = 64  # requests that may wait for a slot; more are shed with a 503
+    ADMISSION_QUEUE_TIMEOUT: float = 0.5  # seconds a queued request waits before a 503
+    ADMISSION_RETRY_AFTER: int = 1  # seconds, sent with 503s
+
+    # Auth
+    # Signs access tokens. Set it in production: a generated key does not survive restarts
+    # (``python -m backend.main`` shares one between its workers)
+    AUTH_SECRET_KEY: str = os.environ.get("TRIVIA_AUTH_SECRET_KEY") or secrets.token_urlsafe(32)
+    AUTH_TOKEN_TTL: int = 15 * 60  # seconds an access token is valid without a refresh
+    AUTH_CODE_TTL: int = 10 * 60  # seconds a login code is valid
+    AUTH_CODE_DIGITS: int = 6
+    AUTH_MAX_CODE_ATTEMPTS: int = 5  # wrong guesses before a login code is discarded
+    AUTH_HASH_WORKERS: int = 2  # argon2 threads, separate from request and DB threads
+    AUTH_MAX_PENDING_HASHES: int = 32  # queued hash/verify jobs before logins get a 503
+    AUTH_HASH_QUEUE_TIMEOUT: float = 5.0  # seconds a login waits for an argon2 thread
+    AUTH_ADMIN_EMAILS: frozenset = frozenset(
+        email.strip().lower() for email in os.environ.get("TRIVIA_ADMIN_EMAILS", "").split(",") if email.strip()
+    )
+
+    # Bulk loading
+    BULK_LOAD_BATCH_SIZE: int = 10_000  # Rows per executemany()
+    BULK_ADMIN_MAX_ROWS: int = 10_000  # Rows per bulk admin upload, applied in one transaction
+
+    # Rounds
+    ROUND_SIZE: int = 10  # Questions per round
+    MAX_ROUND_SIZE: int = 50
+
+    # Round sessions (write-behind)
+    ROUND_FLUSH_INTERVAL: float = 1.0  # seconds between background flushes
+    ROUND_FLUSH_BATCH_SIZE: int = 500  # pending answers that trigger an early flush
+    ROUND_SESSION_IDLE_TIMEOUT: float = 15 * 60.0  # seconds before an idle round is evicted
+
+    # Live games
+    LIVE_GAME_MAX_PLAYERS: int = 200
+    LIVE_EVENT_QUEUE_SIZE: int = 64  # Undelivered events per connection before it is dropped as too slow
+    LIVE_KEEPALIVE_INTERVAL: float = 15.0  # seconds between SSE keep-alive comments
+
+    # Seen questions
+    SEEN_QUESTIONS_CACHE_SIZE: int = 10_000  # Users whose seen-set bitmaps are kept in memory
+
+    # Answer checking
+    ANSWER_FUZZY_MATCHING: bool = True  # Accept near misses such as small typos
+    ANSWER_FUZZY_MAX_DISTANCE: int = 2  # Upper bound on edits, scaled down for short answers
+
+    # Leaderboard
+    LEADERBOARD_SIZE: int = 10  # Default number of entries returned
+    LEADERBOARD_MAX_SIZE: int = 100
+    LEADERBOARD_RECONCILE_INTERVAL: float = 10 * 60.0  # seconds between rebuilds from the stored round answers
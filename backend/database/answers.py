@@ -0,0 +1,126 @@
+import re
+import threading
+import unicodedata
+from backend.conf import Config
+
+
+ARTICLES = frozenset({"a", "an", "the"})
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_answer(text: str) -> str:
+    """Canonical form for comparing answers.
+
+    Case-folds, strips accents and punctuation, drops articles and collapses
+    whitespace: " The  Brasília! " -> "brasilia".
+    """
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    words = _NON_WORD.sub(" ", text).split()
+    return " ".join([word for word in words if word not in ARTICLES] or words)
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int | None:
+    """Levenshtein distance between ``a`` and ``b``, or None if it exceeds ``max_distance``.
+
+    Only the diagonal band of width ``2 * max_distance + 1`` is computed and
+    the loop exits as soon as every cell in a row is over the bound.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+
+    over = max_distance + 1
+    previous = [j if j <= max_distance else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        lo = max(1, i - max_distance)
+        hi = min(len(b), i + max_distance)
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= max_distance else over
+        row_min = current[0]
+        for j in range(lo, hi + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost, over)
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return None
+        previous = current
+
+    return previous[len(b)] if previous[len(b)] <= max_distance else None
+
+
+class AnswerChecker:
+    """Precomputed map of accepted answers per question, for grading without the DB.
+
+    Holds question_id -> (display answer, normalized accepted answers).
+    Questions can have several accepted answers (several is_correct rows).
+    With ``fuzzy`` enabled, near misses within a length-scaled edit distance
+    (at most ``max_distance``) are accepted for non-numeric answers.
+    """
+
+    def __init__(self,
+                 fuzzy: bool = Config.ANSWER_FUZZY_MATCHING,
+                 max_distance: int = Config.ANSWER_FUZZY_MAX_DISTANCE
+    ):
+        self._fuzzy = fuzzy
+        self._max_distance = max_distance
+        self._lock = threading.Lock()
+        self._answers: dict[int, tuple[str, tuple[str, ...]]] = {}
+
+    def load(self, rows):
+        """Replace the map with (question_id, answer_text) rows of correct answers."""
+        answers: dict[int, tuple[str, tuple[str, ...]]] = {}
+        for question_id, answer_text in rows:
+            display, accepted = answers.get(question_id, (answer_text, ()))
+            normalized = normalize_answer(answer_text)
+            if normalized not in accepted:
+                accepted += (normalized,)
+            answers[question_id] = (display, accepted)
+
+        with self._lock:
+            self._answers = answers
+
+    def add(self, question_id: int, answer_text: str):
+        normalized = normalize_answer(answer_text)
+        with self._lock:
+            display, accepted = self._answers.get(question_id, (answer_text, ()))
+            if normalized not in accepted:
+                self._answers[question_id] = (display, accepted + (normalized,))
+
+    def discard(self, question_id: int):
+        with self._lock:
+            self._answers.pop(question_id, None)
+
+    def correct_answer(self, question_id: int) -> str | None:
+        entry = self._answers.get(question_id)
+        return entry[0] if entry is not None else None
+
+    def _allowed_distance(self, expected: str) -> int:
+        if not self._fuzzy or any(c.isdigit() for c in expected):
+            return 0
+        return min(self._max_distance, len(expected) // 5)
+
+    def check(self, question_id: int, text: str) -> tuple[bool, str | None]:
+        """Return (answered_correctly, correct_answer) for a response to a question."""
+        entry = self._answers.get(question_id)
+        if entry is None:
+            return False, None
+
+        display, accepted = entry
+        given = normalize_answer(text)
+        if given in accepted:
+            return True, display
+
+        for expected in accepted:
+            allowed = self._allowed_distance(expected)
+            if allowed and bounded_edit_distance(given, expected, allowed) is not None:
+                return True, display
+
+        return False, display
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def __contains__(self, question_id: int) -> bool:
+        return question_id in self._answers
@@ -0,0 +1,69 @@
+import asyncio
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from backend.conf import Config
+from backend.database.db import TriviaDatabaseManager
+
+
+class AsyncTriviaDatabaseManager:
+    """Async variant of TriviaDatabaseManager with the same method surface.
+
+    Every call is dispatched to a dedicated DB executor sized to the
+    connection pool, so blocking sqlite3 work never runs on the event loop
+    and never competes with Starlette's shared threadpool. Methods are
+    resolved from the wrapped sync manager, e.g.::
+
+        question = await db.get_random_question(category=category)
+    """
+
+    def __init__(self, manager: TriviaDatabaseManager | None = None, **kwargs):
+        self._manager = manager if manager is not None else TriviaDatabaseManager(**kwargs)
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def sync(self) -> TriviaDatabaseManager:
+        """The wrapped sync manager, for code that already runs off the event loop."""
+        return self._manager
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking callable on the DB executor."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._manager.pool_size,
+                thread_name_prefix="trivia-db"
+            )
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._manager, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        return method
+
+    async def iter_questions(self, *args, batch_size: int = Config.QUESTION_EXPORT_BATCH_SIZE, **kwargs):
+        """Async generator over TriviaDatabaseManager.iter_questions, one executor hop per batch."""
+        questions = self._manager.iter_questions(*args, batch_size=batch_size, **kwargs)
+        try:
+            while batch := await self.run(lambda: list(itertools.islice(questions, batch_size))):
+                for question in batch:
+                    yield question
+        finally:
+            await self.run(questions.close)
+
+    def close(self):
+        """Shut down the DB executor and close pooled connections.
+
+        Both are recreated lazily if the manager is used again.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self._manager.close()
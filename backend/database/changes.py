@@ -0,0 +1,64 @@
+import logging
+import sqlite3
+import threading
+from typing import Callable
+from backend.conf import Config
+from backend.database.db import TriviaDatabaseManager
+
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeWatcher:
+    """Keeps a manager in step with question writes made by other processes.
+
+    Polls ``PRAGMA data_version`` on a dedicated connection; it changes
+    whenever any other connection commits, so an idle database costs one
+    pragma per ``interval``. On a change the manager replays new
+    QuestionChanges rows with ``sync_changes()``, then each of
+    ``listeners`` runs to pick up other shared state.
+    """
+
+    def __init__(self,
+                 db: TriviaDatabaseManager,
+                 db_path: str,
+                 interval: float = Config.CHANGE_POLL_INTERVAL,
+                 listeners: list[Callable[[], None]] = ()
+    ):
+        self._db = db
+        self._listeners = list(listeners)
+        self._db_path = db_path
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="question-change-watcher", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        try:
+            data_version = None
+            while not self._stopped.wait(self._interval):
+                try:
+                    current = conn.execute("PRAGMA data_version").fetchone()[0]
+                    if current != data_version:
+                        data_version = current
+                        self._db.sync_changes()
+                        for listener in self._listeners:
+                            listener()
+                except Exception:
+                    logger.exception("Syncing question changes failed, will retry")
+                    data_version = None
+        finally:
+            conn.close()
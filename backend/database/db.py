@@ -1,154 +1,681 @@
+import random
 import sqlite3
+import threading
+from contextlib import ExitStack
 from dataclasses import dataclass
-import pandas as pd
-from backend.schemas import CategoryChoices, DifficultyChoices, Question, QuestionResponseFormData, User, RoundInfo
+from backend.conf import Config
+from typing import Iterable
+from backend.schemas import (
+    BulkResult, BulkRowError, CategoryChoices, DifficultyChoices, Question, QuestionResponse, QuestionStats,
+    User, RoundInfo, RoundStatus, RoundAnswerResult
+)
 from backend.models import DBQuestion
+from backend.database.pool import ConnectionPool
+from backend.database.instrumentation import instrumented
+from backend.serialization import question_from_row
+from backend.database.index import QuestionIndex
+from backend.database.cache import LRUCache
+from backend.database.answers import AnswerChecker
+from backend.database.leaderboard import UserStatsRecord
+from backend.database.seen import SeenBitmap, SeenQuestions
+from backend.database.search import fts_query, text_similarity
+from backend.database.snapshot import QuestionSnapshot, source_id
+from backend.database.migrations import migrate
+from backend.database.load import (
+    QuestionRecord, bulk_load, next_question_id, parse_question_id, parse_question_record
+)
 from datetime import datetime
 
 
 class TriviaDatabaseManager:
     def __init__(self,
-                 db_path: str='./backend/database/test.db', 
+                 db_path: str=Config.DB_PATH, 
                  init: bool=False,  # populate db with data
                  init_sql_path: str='./backend/database/init.sql',  # TODO replace with os path
                  table_init_paths: dict={
                     #  'categories': '../data/categories_v1.csv',
                      'Questions': '../data/questions_v3.csv',
-                     'Answers': '../data/answers_v2.csv'
-                 }
+                     'TriviaAnswers': '../data/answers_v2.csv'
+                 },
+                 pool_size: int=Config.DB_POOL_SIZE,
+                 cache_size: int=Config.QUESTION_CACHE_SIZE,
+                 cache_ttl: float | None=Config.QUESTION_CACHE_TTL,
+                 snapshot: bool=Config.QUESTION_SNAPSHOT,
+                 snapshot_path: str | None=Config.QUESTION_SNAPSHOT_PATH
     ):
         self._db_path = db_path
+        self._pool = ConnectionPool(db_path, size=pool_size)
+        self._cache = LRUCache(cache_size, ttl=cache_ttl)
 
         if init:
-            with sqlite3.connect(self._db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.cursor()
                 with open(init_sql_path, 'r') as f:
                     sql_script = f.read()
                     cursor.executescript(sql_script)
 
-                for k, v in table_init_paths.items():
-                    df = pd.read_csv(v)
-                    df.to_sql(k, conn, if_exists='append', index=False)
+            bulk_load(
+                db_path,
+                questions_path=table_init_paths.get('Questions'),
+                answers_path=table_init_paths.get('TriviaAnswers')
+            )
 
-    def get_question_by_id(self, question_id: int) -> list[Question]:
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        # Schema upgrades, a no-op once the database is current
+        with self._pool.connection() as conn:
+            migrate(conn)
+
+        # Read before the indexes are built: changes that land meanwhile are
+        # replayed by the next sync_changes(), which is idempotent
+        self._sync_lock = threading.Lock()
+        self._change_id = self.get_last_change_id()
+
+        # Question reads are served from an immutable in-memory snapshot,
+        # replaced wholesale by sync_changes() after every write
+        self._snapshot_enabled = snapshot
+        self._snapshot_path = snapshot_path
+        self._snapshot: QuestionSnapshot | None = None
+        if snapshot:
+            with self._pool.connection() as conn:
+                self._swap_snapshot(conn.cursor(), self._change_id)
+
+        self._index = QuestionIndex()
+        self.load_question_index()
+        self._answers = AnswerChecker()
+        self.load_answer_index()
+        self._seen = SeenQuestions(self.get_answered_question_ids)
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool.size
+
+    @property
+    def db_path(self) -> str:
+        return self._db_path
+
+    @instrumented
+    def load_question_index(self):
+        """(Re)build the in-memory question_id index from the Questions table."""
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT question_id, difficulty, category, question_text 
-                FROM Questions 
-                WHERE question_id = ?
-                """, 
-                (question_id,)
+                SELECT question_id, category, difficulty
+                FROM Questions
+                """
             )
-            rows = cursor.fetchall()
-            return [Question(**row) for row in rows]
-        
-    def get_question_by_category(self, category: CategoryChoices) -> list[Question]:
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
+            self._index.load(cursor.fetchall())
+
+    @instrumented
+    def load_answer_index(self):
+        """(Re)build the in-memory map of correct answers used for grading."""
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT question_id, difficulty, category, question_text 
-                FROM Questions 
-                WHERE category = ?
-                """, 
-                (category.value,)
+                SELECT question_id, answer_text
+                FROM TriviaAnswers
+                WHERE is_correct = 1
+                ORDER BY answer_id
+                """
             )
-            rows = cursor.fetchall()
-            return [Question(**row) for row in rows]
+            self._answers.load(cursor.fetchall())
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the question cache, for sizing QUESTION_CACHE_SIZE."""
+        return self._cache.stats()
+
+    @property
+    def question_bank_version(self) -> str:
+        """Opaque version of the question bank: the last QuestionChanges row applied.
+
+        Shared by every worker on the same database, so ETags agree across them.
+        """
+        return str(self._change_id)
+
+    def _invalidate_question(self, question_id: int, *buckets: tuple[str, str]):
+        """Drop the cached question and every cached listing containing its buckets."""
+        keys = [("id", question_id)]
+        for category, difficulty in buckets:
+            keys.extend(("list", *key) for key in QuestionIndex.covering_keys(category, difficulty))
+        self._cache.invalidate(*keys)
+
+    @staticmethod
+    def _record_change(cursor: sqlite3.Cursor, question_id: int | None):
+        """Log a question write in the caller's transaction; None means reload everything."""
+        cursor.execute("INSERT INTO QuestionChanges (question_id) VALUES (?)", (question_id,))
+
+    @staticmethod
+    def _record_changes(cursor: sqlite3.Cursor, question_ids: list[int]):
+        """Log a batch of question writes; batches other workers would reload for anyway log one reload."""
+        if len(question_ids) > Config.SYNC_FULL_RELOAD_THRESHOLD:
+            cursor.execute("INSERT INTO QuestionChanges (question_id) VALUES (NULL)")
+        else:
+            cursor.executemany(
+                "INSERT INTO QuestionChanges (question_id) VALUES (?)",
+                [(question_id,) for question_id in question_ids]
+            )
+
+    def get_last_change_id(self) -> int:
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(change_id), 0) FROM QuestionChanges")
+            return cursor.fetchone()[0]
+
+    def _refresh_question(self, cursor: sqlite3.Cursor, question_id: int):
+        """Bring the index, answer map, seen-sets and cache in line with one question's rows."""
+        cursor.execute(
+            """
+            SELECT question_id, difficulty, category, question_text
+            FROM Questions
+            WHERE question_id = ?
+            """,
+            (question_id,)
+        )
+        row = cursor.fetchone()
+        cursor.execute(
+            """
+            SELECT answer_text
+            FROM TriviaAnswers
+            WHERE is_correct = 1 AND question_id = ?
+            ORDER BY answer_id
+            """,
+            (question_id,)
+        )
+        answers = [answer_text for answer_text, in cursor.fetchall()]
+
+        old_bucket = self._index.get(question_id)
+        buckets = [old_bucket] if old_bucket is not None else []
+        self._answers.discard(question_id)
+        if row is None:
+            self._index.discard(question_id)
+            self._seen.discard_question(question_id)
+        else:
+            self._index.add(question_id, row['category'], row['difficulty'])
+            buckets.append((row['category'], row['difficulty']))
+            for answer_text in answers:
+                self._answers.add(question_id, answer_text)
+        self._invalidate_question(question_id, *buckets)
+
+    def _swap_snapshot(self, cursor: sqlite3.Cursor, change_id: int):
+        """Replace the snapshot with one at least as new as ``change_id``.
+
+        With a snapshot path, a file already written by another worker for
+        this change is memory-mapped instead of rebuilding it, provided it
+        was built from this database file at its current schema version.
+        """
+        if self._snapshot_path is not None:
+            try:
+                snapshot = QuestionSnapshot.open(self._snapshot_path, *self._snapshot_source(cursor))
+                if snapshot.change_id >= change_id:
+                    self._snapshot = snapshot
+                    return
+            except (OSError, ValueError):
+                pass  # Missing, stale or unreadable: rebuild it
+
+        snapshot = self.build_question_snapshot(cursor, change_id)
+        if self._snapshot_path is not None:
+            snapshot.save(self._snapshot_path)
+        self._snapshot = snapshot
+
+    def _snapshot_source(self, cursor: sqlite3.Cursor) -> tuple[bytes, int]:
+        """(source database identity, schema version) recorded in and checked against snapshots."""
+        cursor.execute("PRAGMA user_version")
+        return source_id(self._db_path), cursor.fetchone()[0]
+
+    @instrumented
+    def build_question_snapshot(self, cursor: sqlite3.Cursor, change_id: int) -> QuestionSnapshot:
+        """Read every question and its first correct answer into a new QuestionSnapshot."""
+        cursor.execute(
+            """
+            SELECT question_id, answer_text
+            FROM TriviaAnswers
+            WHERE is_correct = 1
+            ORDER BY answer_id
+            """
+        )
+        answers = cursor.fetchall()
+        source, schema_version = self._snapshot_source(cursor)
+        cursor.execute(
+            """
+            SELECT question_id, category, difficulty, question_text
+            FROM Questions
+            ORDER BY question_id
+            """
+        )
+        return QuestionSnapshot.from_rows(cursor, answers, change_id, source, schema_version)
+
+    def reload(self):
+        """Rebuild every in-memory structure from the database."""
+        self.load_question_index()
+        self.load_answer_index()
+        self._cache.clear()
+        self._seen.clear()
+
+    @instrumented
+    def sync_changes(self) -> int:
+        """Apply question writes made by other processes; returns how many changes were applied.
+
+        Reads QuestionChanges past the last applied change_id and refreshes
+        only the questions they name. A change without a question_id (bulk
+        loads), or more than SYNC_FULL_RELOAD_THRESHOLD changes, reloads everything.
+        """
+        with self._sync_lock:
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT change_id, question_id
+                    FROM QuestionChanges
+                    WHERE change_id > ?
+                    ORDER BY change_id
+                    """,
+                    (self._change_id,)
+                )
+                changes = cursor.fetchall()
+                if not changes:
+                    return 0
+
+                # Swapped before the cache is invalidated below, so evicted
+                # entries cannot be refilled from the old snapshot
+                if self._snapshot_enabled:
+                    self._swap_snapshot(cursor, changes[-1][0])
+
+                question_ids = dict.fromkeys(question_id for _, question_id in changes)
+                full_reload = None in question_ids or len(question_ids) > Config.SYNC_FULL_RELOAD_THRESHOLD
+                if not full_reload:
+                    for question_id in question_ids:
+                        self._refresh_question(cursor, question_id)
+
+            if full_reload:
+                self.reload()
+            self._change_id = changes[-1][0]
+            return len(changes)
+
+    @instrumented
+    def get_question_by_id(self, question_id: int) -> list[Question]:
+        key = ("id", question_id)
+        generation = self._cache.generation  # Before reading, see LRUCache
+        questions = self._cache.get(key)
+        if questions is not None:
+            return list(questions)
+
+        snapshot = self._snapshot
+        if snapshot is not None:
+            question = snapshot.get(question_id)
+            questions = [question] if question is not None else []
+        else:
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT question_id, difficulty, category, question_text 
+                    FROM Questions 
+                    WHERE question_id = ?
+                    """, 
+                    (question_id,)
+                )
+                rows = cursor.fetchall()
+                questions = [question_from_row(row) for row in rows]
+
+        self._cache.set(key, questions, generation)
+        return list(questions)
         
+    @instrumented
+    def get_questions_by_ids(self, question_ids: list[int]) -> tuple[list[Question], list[int]]:
+        """(questions, missing ids) for ``question_ids``, both in request order.
+
+        Cached questions are served from the cache; the rest are read with
+        one ``IN`` query per ``SQLITE_MAX_IN_PARAMETERS`` ids and cached.
+        """
+        found: dict[int, Question | None] = {}
+        uncached: list[int] = []
+        generation = self._cache.generation
+        for question_id in dict.fromkeys(question_ids):
+            questions = self._cache.get(("id", question_id))
+            if questions is None:
+                uncached.append(question_id)
+            else:
+                found[question_id] = questions[0] if questions else None
+
+        snapshot = self._snapshot
+        if uncached and snapshot is not None:
+            for question_id in uncached:
+                found[question_id] = snapshot.get(question_id)
+        elif uncached:
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
+                for start in range(0, len(uncached), Config.SQLITE_MAX_IN_PARAMETERS):
+                    chunk = uncached[start:start + Config.SQLITE_MAX_IN_PARAMETERS]
+                    cursor.execute(
+                        f"""
+                        SELECT question_id, difficulty, category, question_text
+                        FROM Questions
+                        WHERE question_id IN ({", ".join("?" * len(chunk))})
+                        """,
+                        chunk
+                    )
+                    for row in cursor.fetchall():
+                        found[row['question_id']] = question_from_row(row)
+
+        for question_id in uncached:
+            question = found.setdefault(question_id, None)
+            self._cache.set(("id", question_id), [question] if question is not None else [], generation)
+
+        questions = [found[i] for i in question_ids if found[i] is not None]
+        missing = [i for i in question_ids if found[i] is None]
+        return questions, missing
+
+    @instrumented
+    def get_question_by_category(self, category: CategoryChoices) -> list[Question]:
+        key = ("list", category.value, None)
+        generation = self._cache.generation  # Before reading, see LRUCache
+        questions = self._cache.get(key)
+        if questions is not None:
+            return list(questions)
+
+        snapshot = self._snapshot
+        if snapshot is not None:
+            questions = snapshot.select(category=category)
+        else:
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT question_id, difficulty, category, question_text 
+                    FROM Questions 
+                    WHERE category = ?
+                    """, 
+                    (category.value,)
+                )
+                rows = cursor.fetchall()
+                questions = [question_from_row(row) for row in rows]
+
+        self._cache.set(key, questions, generation)
+        return list(questions)
+        
+    @instrumented
     def get_question_by_difficulty(self, difficulty: DifficultyChoices) -> list[Question]:
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT question_id, difficulty, category, question_text 
-                FROM Questions 
-                WHERE difficulty = ?
-                """, 
-                (difficulty.value,)
-            )
-            rows = cursor.fetchall()
-            return [Question(**row) for row in rows]
+        key = ("list", None, difficulty.value)
+        generation = self._cache.generation  # Before reading, see LRUCache
+        questions = self._cache.get(key)
+        if questions is not None:
+            return list(questions)
+
+        snapshot = self._snapshot
+        if snapshot is not None:
+            questions = snapshot.select(difficulty=difficulty)
+        else:
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT question_id, difficulty, category, question_text 
+                    FROM Questions 
+                    WHERE difficulty = ?
+                    """, 
+                    (difficulty.value,)
+                )
+                rows = cursor.fetchall()
+                questions = [question_from_row(row) for row in rows]
+
+        self._cache.set(key, questions, generation)
+        return list(questions)
         
+    @instrumented
     def get_questions_by_category_and_difficulty(
         self,
         category: CategoryChoices,
         difficulty: DifficultyChoices
     ) -> list[Question]:
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        key = ("list", category.value, difficulty.value)
+        generation = self._cache.generation  # Before reading, see LRUCache
+        questions = self._cache.get(key)
+        if questions is not None:
+            return list(questions)
+
+        snapshot = self._snapshot
+        if snapshot is not None:
+            questions = snapshot.select(category, difficulty)
+        else:
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT question_id, difficulty, category, question_text 
+                    FROM Questions 
+                    WHERE category = ? and difficulty = ?
+                    """, 
+                    (category.value, difficulty.value)
+                )
+                rows = cursor.fetchall()
+                questions = [question_from_row(row) for row in rows]
+
+        self._cache.set(key, questions, generation)
+        return list(questions)
+        
+    @instrumented
+    def get_all_questions(self):
+        key = ("list", None, None)
+        generation = self._cache.generation  # Before reading, see LRUCache
+        questions = self._cache.get(key)
+        if questions is not None:
+            return list(questions)
+
+        snapshot = self._snapshot
+        if snapshot is not None:
+            questions = snapshot.select()
+        else:
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT question_id, difficulty, category, question_text 
+                    FROM Questions 
+                    """ 
+                )
+                rows = cursor.fetchall()
+                questions = [question_from_row(row) for row in rows]
+
+        self._cache.set(key, questions, generation)
+        return list(questions)
+
+    @staticmethod
+    def _question_filters(
+        category: CategoryChoices | None,
+        difficulty: DifficultyChoices | None
+    ) -> tuple[list[str], list]:
+        where_conditions = []
+        params = []
+
+        if category is not None:
+            where_conditions.append("category = ?")
+            params.append(category.value)
+
+        if difficulty is not None:
+            where_conditions.append("difficulty = ?")
+            params.append(difficulty.value)
+
+        return where_conditions, params
+
+    @instrumented
+    def get_questions_page(self,
+        category: CategoryChoices | None = None,
+        difficulty: DifficultyChoices | None = None,
+        after: int | None = None,
+        limit: int = Config.QUESTION_PAGE_SIZE
+    ) -> list[Question]:
+        """Keyset pagination on question_id: up to ``limit`` questions with id > ``after``."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot.page(category, difficulty, after=after, limit=limit)
+
+        where_conditions, params = self._question_filters(category, difficulty)
+        where_conditions.append("question_id > ?")
+        params.append(after if after is not None else 0)
+
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                SELECT question_id, difficulty, category, question_text 
-                FROM Questions 
-                WHERE category = ? and difficulty = ?
-                """, 
-                (category.value, difficulty.value)
+                f"""
+                SELECT question_id, difficulty, category, question_text
+                FROM Questions
+                WHERE {" AND ".join(where_conditions)}
+                ORDER BY question_id
+                LIMIT ?
+                """,
+                (*params, limit)
             )
             rows = cursor.fetchall()
-            return [Question(**row) for row in rows]
-        
-    def get_all_questions(self):
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
+            return [question_from_row(row) for row in rows]
+
+    @instrumented
+    def search_questions(self,
+        text: str,
+        category: CategoryChoices | None = None,
+        difficulty: DifficultyChoices | None = None,
+        offset: int = 0,
+        limit: int = Config.QUESTION_PAGE_SIZE
+    ) -> list[Question]:
+        """Questions whose text contains every word of ``text``, best BM25 match first."""
+        match = fts_query(text)
+        if match is None:
+            return []
+
+        where_conditions, params = self._question_filters(category, difficulty)
+        where_conditions.insert(0, "QuestionsSearch MATCH ?")
+        params.insert(0, match)
+
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT q.question_id, q.difficulty, q.category, q.question_text
+                FROM QuestionsSearch
+                JOIN Questions q ON q.question_id = QuestionsSearch.rowid
+                WHERE {" AND ".join(where_conditions)}
+                ORDER BY QuestionsSearch.rank, q.question_id
+                LIMIT ? OFFSET ?
+                """,
+                (*params, limit, offset)
+            )
+            rows = cursor.fetchall()
+            return [question_from_row(row) for row in rows]
+
+    @instrumented
+    def find_duplicate_questions(self,
+        question_text: str,
+        threshold: float = Config.DUPLICATE_SIMILARITY_THRESHOLD,
+        candidates: int = Config.DUPLICATE_CANDIDATES
+    ) -> list[tuple[Question, float]]:
+        """Existing questions worded like ``question_text``, as (question, similarity), most similar first.
+
+        The full-text index narrows the bank to the ``candidates`` best BM25
+        matches on any of the words; those are scored by word-set similarity.
+        """
+        match = fts_query(question_text, match_any=True, prefix=False)
+        if match is None:
+            return []
+
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT question_id, difficulty, category, question_text 
-                FROM Questions 
-                """ 
+                SELECT q.question_id, q.difficulty, q.category, q.question_text
+                FROM QuestionsSearch
+                JOIN Questions q ON q.question_id = QuestionsSearch.rowid
+                WHERE QuestionsSearch MATCH ?
+                ORDER BY QuestionsSearch.rank
+                LIMIT ?
+                """,
+                (match, candidates)
             )
             rows = cursor.fetchall()
-            return [Question(**row) for row in rows]
-        
+
+        scored = [
+            (question_from_row(row), text_similarity(question_text, row['question_text']))
+            for row in rows
+        ]
+        duplicates = [(question, score) for question, score in scored if score >= threshold]
+        duplicates.sort(key=lambda item: (-item[1], item[0].question_id))
+        return duplicates
+
+    def iter_questions(self,
+        category: CategoryChoices | None = None,
+        difficulty: DifficultyChoices | None = None,
+        batch_size: int = Config.QUESTION_EXPORT_BATCH_SIZE
+    ):
+        """Yield questions in question_id order, reading ``batch_size`` rows at a time.
+
+        Every batch is a keyset page with its own short connection checkout,
+        so a slow consumer, such as an export streaming to a slow client,
+        never holds a pooled connection between batches. Questions written
+        during the iteration may or may not be included.
+        """
+        after = None
+        while batch := self.get_questions_page(category, difficulty, after=after, limit=batch_size):
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            after = batch[-1].question_id
+
+    @instrumented
     def get_random_question(self,
         category: CategoryChoices | None = None,
         difficulty: DifficultyChoices | None = None
     ) -> Question:
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            where_conditions = []
-            params = []
+        # Pick from the in-memory index and fetch by primary key instead of
+        # ORDER BY RANDOM(), which scans and sorts every matching row.
+        while True:
+            question_id = self._index.random_id(category, difficulty)
+            if question_id is None:
+                raise IndexError("No questions match the given filters")
 
-            if category is not None:
-                where_conditions.append("category = ?")
-                params.append(category.value)
+            questions = self.get_question_by_id(question_id)
+            if questions:
+                return questions[0]
 
-            if difficulty is not None:
-                where_conditions.append("difficulty = ?")
-                params.append(difficulty.value)
+            # Row was removed behind our back (e.g. another process), drop it and retry.
+            self._index.discard(question_id)
+            self._cache.invalidate(("id", question_id))
 
-            where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+    def count_questions(self,
+        category: CategoryChoices | None = None,
+        difficulty: DifficultyChoices | None = None
+    ) -> int:
+        """How many questions match the filter, answered from the in-memory index."""
+        return self._index.count(category, difficulty)
 
-            cursor.execute(
-                f"""
-                SELECT question_id, difficulty, category, question_text
-                FROM Questions
-                WHERE {where_clause}
-                ORDER BY RANDOM()
-                LIMIT 1;
-                """,
-                params
-            )
-            rows = cursor.fetchall()
-            return [Question(**row) for row in rows][0]
+    def question_stats(self) -> QuestionStats:
+        """Question counts per category and difficulty, zeros included, from the in-memory index."""
+        version = self.question_bank_version  # Read first: counts may only be newer, never older
+        counts = self._index.counts()
+        categories = [category.value for category in CategoryChoices]
+        difficulties = [difficulty.value for difficulty in DifficultyChoices]
+        return QuestionStats(
+            total=counts.get((None, None), 0),
+            version=version,
+            categories={category: counts.get((category, None), 0) for category in categories},
+            difficulties={difficulty: counts.get((None, difficulty), 0) for difficulty in difficulties},
+            buckets={
+                category: {difficulty: counts.get((category, difficulty), 0) for difficulty in difficulties}
+                for category in categories
+            }
+        )
 
+    @instrumented
     def get_correct_answer_by_question_id(self, question_id: int) -> str:
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        snapshot = self._snapshot
+        if snapshot is not None:
+            answer = snapshot.answer(question_id)
+            if answer is not None:
+                return answer
+
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
                 SELECT answer_text 
-                FROM Answers 
+                FROM TriviaAnswers 
                 WHERE is_correct = 1 AND question_id = ?
                 """, 
                 (question_id,)
@@ -156,12 +683,13 @@ class TriviaDatabaseManager:
             return cursor.fetchone()[0]
 
 
+    @instrumented
     def add_question(self,
         category: CategoryChoices,
         difficulty: DifficultyChoices,
         question_text: str
     ) -> Question:
-        with sqlite3.connect(self._db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -170,11 +698,18 @@ class TriviaDatabaseManager:
                 """,
                 (category.value, difficulty.value, question_text)
             )
-            conn.commit()
             question_id = cursor.lastrowid
-            return self.get_question_by_id(question_id)[0]
+            self._record_change(cursor, question_id)
+            conn.commit()
+
+        self._index.add(question_id, category.value, difficulty.value)
+        self._invalidate_question(question_id, (category.value, difficulty.value))
+        self.sync_changes()
+        return self.get_question_by_id(question_id)[0]
 
+    @instrumented
     def update_question(self, question_id: int, **kwargs):
+        kwargs = {k: v for k, v in kwargs.items() if v is not None}
         if not kwargs:
             raise ValueError("No fields provided to update")
 
@@ -188,7 +723,7 @@ class TriviaDatabaseManager:
         set_clause = ", ".join([f"{field} = ?" for field in kwargs.keys()])
         values = list(kwargs.values())
 
-        with sqlite3.connect(self._db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 f"""
@@ -202,11 +737,25 @@ class TriviaDatabaseManager:
             if cursor.rowcount == 0:
                 raise ValueError(f"No question found with id: {question_id}")
 
+            self._record_change(cursor, question_id)
             conn.commit()
-            return self.get_question_by_id(question_id)
 
+        old_bucket = self._index.get(question_id)
+        if old_bucket is not None:
+            new_bucket = (kwargs.get('category', old_bucket[0]), kwargs.get('difficulty', old_bucket[1]))
+            self._invalidate_question(question_id, old_bucket, new_bucket)
+        else:
+            self._invalidate_question(question_id)
+        self.sync_changes()  # Before reading back, so a snapshot has the new row
+
+        questions = self.get_question_by_id(question_id)
+        for question in questions:
+            self._index.add(question.question_id, question.category, question.difficulty)
+        return questions
+
+    @instrumented
     def delete_question(self, question_id: int) -> int:  # TODO: check cascades when deleting a question
-        with sqlite3.connect(self._db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -219,49 +768,220 @@ class TriviaDatabaseManager:
             if cursor.rowcount == 0:
                 raise ValueError(f"No question found with id: {question_id}")
             
+            self._record_change(cursor, question_id)
             conn.commit()
-            return question_id
-        
-    def get_next_question(self, user_id: int, **kwargs) -> Question:
-        if user_id is None:
-            raise ValueError("user_id required.")
+
+        old_bucket = self._index.get(question_id)
+        self._index.discard(question_id)
+        self._answers.discard(question_id)  # Answers are removed by ON DELETE CASCADE
+        self._seen.discard_question(question_id)
+        self._invalidate_question(question_id, *([old_bucket] if old_bucket else []))
+        self.sync_changes()
+        return question_id
         
-        if not kwargs:
-            # get any question that has not yet been tried by the user.
-            # if there are no questions that have not yet been tried by the
-            # user, then get a question that has already been tried.
-            pass
+    @staticmethod
+    def _parse_bulk(records: Iterable, parse) -> tuple[list[tuple[int, object]], list[BulkRowError]]:
+        """(row, parsed) for the valid records and an error per invalid one; rows count from 1."""
+        parsed, errors = [], []
+        for row, record in enumerate(records, 1):
+            try:
+                parsed.append((row, parse(record)))
+            except ValueError as e:
+                errors.append(BulkRowError(row=row, error=str(e)))
+        return parsed, errors
 
-        if 'category' in kwargs and isinstance(kwargs['category'], CategoryChoices):
-            kwargs['category'] = kwargs['category'].value
-    
-        if 'difficulty' in kwargs and isinstance(kwargs['difficulty'], DifficultyChoices):
-            kwargs['difficulty'] = kwargs['difficulty'].value
+    @staticmethod
+    def _replace_answers(cursor: sqlite3.Cursor, records: list[QuestionRecord]):
+        records = [record for record in records if record.answers is not None]
+        cursor.executemany(
+            "DELETE FROM TriviaAnswers WHERE question_id = ?",
+            [(record.question_id,) for record in records]
+        )
+        cursor.executemany(
+            """
+            INSERT INTO TriviaAnswers (question_id, answer_text, is_correct)
+            VALUES (?, ?, ?)
+            """,
+            [
+                (record.question_id, answer_text, is_correct)
+                for record in records
+                for answer_text, is_correct in record.answers
+            ]
+        )
 
-        where_clause = ", ".join([f"{field} = ?" for field in kwargs.keys()])
-        values = list(kwargs.values())
+    @instrumented
+    def import_questions(self, records: Iterable[dict]) -> BulkResult:
+        """Insert questions with their answers in one transaction; see parse_question_record.
 
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        Invalid rows are skipped and reported. The rest are written with
+        executemany under one write lock and one commit, and the index,
+        answer map, caches and snapshot are brought up to date once.
+        """
+        parsed, errors = self._parse_bulk(records, parse_question_record)
+        if not parsed:
+            return BulkResult(applied=0, question_ids=[], errors=errors)
+
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")  # No other writer can take the ids assigned below
+            next_id = next_question_id(conn)
+            questions = [record for _, record in parsed]
+            for question_id, record in enumerate(questions, next_id):
+                record.question_id = question_id
+
+            cursor.executemany(
+                """
+                INSERT INTO Questions (question_id, category, difficulty, question_text)
+                VALUES (?, ?, ?, ?)
+                """,
+                [(record.question_id, record.category, record.difficulty, record.question_text) for record in questions]
+            )
+            self._replace_answers(cursor, questions)
+            question_ids = [record.question_id for record in questions]
+            self._record_changes(cursor, question_ids)
+
+        self.sync_changes()
+        return BulkResult(applied=len(question_ids), question_ids=question_ids, errors=errors)
+
+    def _existing_question_ids(self, cursor: sqlite3.Cursor, question_ids: list[int]) -> set[int]:
+        existing = set()
+        for start in range(0, len(question_ids), Config.SQLITE_MAX_IN_PARAMETERS):
+            chunk = question_ids[start:start + Config.SQLITE_MAX_IN_PARAMETERS]
             cursor.execute(
                 f"""
-                SELECT question_id, difficulty, category, question_text 
-                FROM Questions 
-                WHERE {where_clause}
-                """, 
-                (*values, user_id,)
+                SELECT question_id
+                FROM Questions
+                WHERE question_id IN ({", ".join("?" * len(chunk))})
+                """,
+                chunk
             )
-            rows = cursor.fetchall()
-            return [Question(**row) for row in rows]
-        
+            existing.update(question_id for question_id, in cursor.fetchall())
+        return existing
+
+    @instrumented
+    def update_questions(self, records: Iterable[dict]) -> BulkResult:
+        """Apply partial question updates in one transaction; see import_questions.
+
+        Fields left out of a record keep their value; ``answers`` replace all
+        of the question's answers. Unknown or repeated question_ids are reported.
+        """
+        parsed, errors = self._parse_bulk(records, lambda record: parse_question_record(record, update=True))
+        candidates: dict[int, tuple[int, QuestionRecord]] = {}  # question_id -> (row, record)
+        for row, record in parsed:
+            if record.question_id in candidates:
+                errors.append(BulkRowError(row=row, error=f"Duplicate question_id in upload: {record.question_id}"))
+            else:
+                candidates[record.question_id] = (row, record)
+
+        updates = []
+        if candidates:
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")  # Existence checked below holds until the commit
+                existing = self._existing_question_ids(cursor, list(candidates))
+                for question_id, (row, record) in candidates.items():
+                    if question_id in existing:
+                        updates.append(record)
+                    else:
+                        errors.append(BulkRowError(row=row, error=f"No question found with id: {question_id}"))
+
+                cursor.executemany(
+                    """
+                    UPDATE Questions
+                    SET category = COALESCE(?, category),
+                        difficulty = COALESCE(?, difficulty),
+                        question_text = COALESCE(?, question_text),
+                        updated_at = ?
+                    WHERE question_id = ?
+                    """,
+                    [
+                        (record.category, record.difficulty, record.question_text, datetime.now(), record.question_id)
+                        for record in updates
+                    ]
+                )
+                self._replace_answers(cursor, updates)
+                self._record_changes(cursor, [record.question_id for record in updates])
+
+            self.sync_changes()
+
+        errors.sort(key=lambda error: error.row)
+        question_ids = [record.question_id for record in updates]
+        return BulkResult(applied=len(question_ids), question_ids=question_ids, errors=errors)
+
+    @instrumented
+    def delete_questions(self, records: Iterable) -> BulkResult:
+        """Delete questions, given as ids or records with a question_id, in one transaction.
+
+        Answers go with them (ON DELETE CASCADE); ids that do not exist are reported.
+        """
+        parsed, errors = self._parse_bulk(records, parse_question_id)
+        deleted: set[int] = set()
+        if parsed:
+            question_ids = list(dict.fromkeys(question_id for _, question_id in parsed))
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
+                for start in range(0, len(question_ids), Config.SQLITE_MAX_IN_PARAMETERS):
+                    chunk = question_ids[start:start + Config.SQLITE_MAX_IN_PARAMETERS]
+                    cursor.execute(
+                        f"""
+                        DELETE FROM Questions
+                        WHERE question_id IN ({", ".join("?" * len(chunk))})
+                        RETURNING question_id
+                        """,
+                        chunk
+                    )
+                    deleted.update(question_id for question_id, in cursor.fetchall())
+                self._record_changes(cursor, sorted(deleted))
+
+            self.sync_changes()
+
+        for row, question_id in parsed:
+            if question_id not in deleted:
+                errors.append(BulkRowError(row=row, error=f"No question found with id: {question_id}"))
+        question_ids = [question_id for question_id in dict.fromkeys(i for _, i in parsed) if question_id in deleted]
+        errors.sort(key=lambda error: error.row)
+        return BulkResult(applied=len(question_ids), question_ids=question_ids, errors=errors)
+
+    @instrumented
+    def get_next_question(self,
+        user_id: int,
+        category: CategoryChoices | None = None,
+        difficulty: DifficultyChoices | None = None
+    ) -> Question:
+        """A random question the user has not tried yet.
+
+        Falls back to an already tried question once the user has seen every
+        question matching the filter. Raises IndexError if nothing matches.
+        """
+        if user_id is None:
+            raise ValueError("user_id required.")
+
+        seen = self._seen.get(user_id)
+        for _ in range(3):  # The picked question can be deleted before it is read
+            picked = self._index.sample(category, difficulty, exclude=seen)
+            question_id = picked[0] if picked else self._index.random_id(category, difficulty)
+            if question_id is None:
+                raise IndexError("No questions match the given filters")
+
+            questions = self.get_question_by_id(question_id)
+            if questions:
+                return questions[0]
+            self._index.discard(question_id)
+
+        raise IndexError("No questions match the given filters")
+
+    def mark_question_seen(self, user_id: int, question_id: int):
+        """Record a tried question in the user's seen-set, if it is loaded or loadable."""
+        self._seen.mark(user_id, question_id)
+
+    @instrumented
     def create_user(self, email: str, username: str = None):
-        with sqlite3.connect(self._db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                INSERT INTO Users (email)
-                VALUES (?)
+                INSERT INTO Users (email, username)
+                VALUES (?, ?)
                 """,
                 (email, username)
             )
@@ -269,52 +989,533 @@ class TriviaDatabaseManager:
 
             user_id = cursor.lastrowid
             return user_id
-        
-    def create_round(self, user_id: int) -> RoundInfo:
-        with sqlite3.connect(self._db_path) as conn:
+
+    @instrumented
+    def set_mfa_code(self, email: str, hashed_code: str, ttl: float) -> int | None:
+        """Store a hashed login code valid for ``ttl`` seconds; the user_id, or None for an unknown email."""
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                INSERT INTO Rounds (user_id)
-                VALUES (?)
+                UPDATE Users
+                SET hashed_mfa_code = ?, hashed_mfa_code_expires_at = datetime('now', ?), mfa_code_attempts = 0
+                WHERE email = ?
+                RETURNING user_id
                 """,
-                (user_id,)
+                (hashed_code, f"+{int(ttl)} seconds", email)
+            )
+            row = cursor.fetchone()
+            conn.commit()
+            return row[0] if row is not None else None
+
+    @instrumented
+    def get_mfa_code(self, email: str) -> tuple[int, str] | None:
+        """(user_id, hashed code) of the user's unexpired login code, if any."""
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT user_id, hashed_mfa_code
+                FROM Users
+                WHERE email = ?
+                    AND hashed_mfa_code IS NOT NULL
+                    AND hashed_mfa_code_expires_at > CURRENT_TIMESTAMP
+                """,
+                (email,)
+            )
+            row = cursor.fetchone()
+            return (row[0], row[1]) if row is not None else None
+
+    @instrumented
+    def fail_mfa_code(self, user_id: int, hashed_code: str, max_attempts: int) -> bool:
+        """Count a wrong guess at a login code, discarding the code on the ``max_attempts``-th; True if discarded.
+
+        Only counts against ``hashed_code``, so guesses at a replaced code don't use up the new one.
+        """
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE Users
+                SET mfa_code_attempts = mfa_code_attempts + 1,
+                    hashed_mfa_code = iif(mfa_code_attempts + 1 >= ?, NULL, hashed_mfa_code)
+                WHERE user_id = ? AND hashed_mfa_code = ?
+                RETURNING hashed_mfa_code IS NULL
+                """,
+                (max_attempts, user_id, hashed_code)
+            )
+            row = cursor.fetchone()
+            conn.commit()
+            return row is None or bool(row[0])
+
+    @instrumented
+    def start_session(self, user_id: int, hashed_code: str, session_id: str, expires_at: int) -> bool:
+        """Use up the login code ``hashed_code`` and make ``session_id`` the user's session.
+
+        False, without starting a session, if the code has since been used,
+        replaced, discarded or has expired. The previous session is revoked
+        until ``expires_at`` (unix time), the latest expiry of a token it may
+        have been issued.
+        """
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            # Consuming the code first makes concurrent logins with it race on this write
+            cursor.execute(
+                """
+                UPDATE Users
+                SET hashed_mfa_code = NULL, hashed_mfa_code_expires_at = NULL
+                WHERE user_id = ?
+                    AND hashed_mfa_code = ?
+                    AND hashed_mfa_code_expires_at > CURRENT_TIMESTAMP
+                RETURNING session_id
+                """,
+                (user_id, hashed_code)
+            )
+            previous = cursor.fetchone()
+            if previous is None:
+                conn.rollback()
+                return False
+            if previous[0] is not None:
+                self._revoke_session(cursor, previous[0], expires_at)
+            cursor.execute(
+                """
+                UPDATE Users
+                SET session_id = ?, session_refreshed_at = CURRENT_TIMESTAMP
+                WHERE user_id = ?
+                """,
+                (session_id, user_id)
+            )
+            conn.commit()
+            return True
+
+    @instrumented
+    def refresh_session(self, user_id: int, session_id: str) -> str | None:
+        """Record a token refresh; the user's current email, or None if ``session_id`` is no longer their session."""
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE Users
+                SET session_refreshed_at = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND session_id = ?
+                RETURNING email
+                """,
+                (user_id, session_id)
+            )
+            row = cursor.fetchone()
+            conn.commit()
+            return row[0] if row is not None else None
+
+    @staticmethod
+    def _revoke_session(cursor: sqlite3.Cursor, session_id: str, expires_at: int):
+        cursor.execute(
+            """
+            INSERT INTO RevokedSessions (session_id, expires_at)
+            VALUES (?, datetime(?, 'unixepoch'))
+            ON CONFLICT (session_id) DO UPDATE SET expires_at = MAX(expires_at, excluded.expires_at)
+            """,
+            (session_id, expires_at)
+        )
+        cursor.execute("DELETE FROM RevokedSessions WHERE expires_at <= CURRENT_TIMESTAMP")
+
+    @instrumented
+    def end_session(self, user_id: int, session_id: str, expires_at: int):
+        """Log a session out: clear it from the user and revoke it until ``expires_at`` (unix time)."""
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE Users SET session_id = NULL WHERE user_id = ? AND session_id = ?",
+                (user_id, session_id)
             )
+            self._revoke_session(cursor, session_id, expires_at)
             conn.commit()
+
+    @instrumented
+    def get_revoked_sessions(self) -> set[str]:
+        """Revoked session ids whose tokens may not have expired yet."""
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT session_id FROM RevokedSessions WHERE expires_at > CURRENT_TIMESTAMP")
+            return {session_id for session_id, in cursor.fetchall()}
+
+    @instrumented
+    def get_answered_question_ids(self, user_id: int) -> set[int]:
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT question_id
+                FROM RoundAnswers
+                WHERE user_id = ?
+                """,
+                (user_id,)
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def _pick_round_questions(self,
+        size: int,
+        category: CategoryChoices | None,
+        difficulty: DifficultyChoices | None,
+        answered: set[int] | SeenBitmap
+    ) -> list[int]:
+        """Pick ``size`` question_ids spread evenly over the matching buckets.
+
+        Questions the user already answered are skipped unless there are not
+        enough unanswered ones left to fill the round.
+        """
+        buckets = self._index.leaf_keys(category, difficulty)
+        random.shuffle(buckets)
+        picked: list[int] = []
+
+        for i, (bucket_category, bucket_difficulty) in enumerate(buckets):
+            quota = size // len(buckets) + (1 if i < size % len(buckets) else 0)
+            picked += self._index.sample(bucket_category, bucket_difficulty, quota, exclude=answered)
+
+        # Top up from the whole filter when some buckets ran short
+        for exclude in (answered, frozenset()):
+            if len(picked) < size:
+                picked += self._index.sample(
+                    category, difficulty, size - len(picked), exclude=exclude | set(picked)
+                )
+
+        random.shuffle(picked)
+        return picked
+
+    def pick_questions(self,
+        size: int,
+        category: CategoryChoices | None = None,
+        difficulty: DifficultyChoices | None = None
+    ) -> list[int]:
+        """``size`` random question_ids spread over the matching buckets, for rounds not tied to one user."""
+        return self._pick_round_questions(size, category, difficulty, frozenset())
+
+    @instrumented
+    def create_round(self,
+        user_id: int,
+        size: int = Config.ROUND_SIZE,
+        category: CategoryChoices | None = None,
+        difficulty: DifficultyChoices | None = None,
+        question_ids: list[int] | None = None
+    ) -> RoundInfo:
+        """Create a round and materialize its questions up front in RoundQuestions.
+
+        ``question_ids`` fixes the questions (rounds shared by a live game)
+        instead of picking ``size`` the user has not seen.
+        """
+        if question_ids is None:
+            question_ids = self._pick_round_questions(size, category, difficulty, self._seen.get(user_id))
+        if not question_ids:
+            raise ValueError("No questions match the given filters")
+
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    """
+                    INSERT INTO Rounds (user_id, round_status, current_index)
+                    VALUES (?, ?, 0)
+                    """,
+                    (user_id, RoundStatus.IN_PROGRESS.value)
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError(f"No user found with id: {user_id}")
             round_id = cursor.lastrowid
-            return self.get_round_by_id(round_id)
+            cursor.executemany(
+                """
+                INSERT INTO RoundQuestions (round_id, question_id, ordinal)
+                VALUES (?, ?, ?)
+                """,
+                [(round_id, question_id, ordinal) for ordinal, question_id in enumerate(question_ids)]
+            )
+            conn.commit()
+
+        return self.get_round_by_id(round_id)
         
+    @instrumented
     def get_round_by_id(self, round_id: int) -> RoundInfo:
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT round_id, user_id 
+                SELECT round_id, user_id, round_status, current_index,
+                    (SELECT COUNT(*) FROM RoundQuestions WHERE round_id = Rounds.round_id) AS question_count
                 FROM Rounds 
                 WHERE round_id = ?
                 """, 
                 (round_id,)
             )
             row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"No round found with id: {round_id}")
             return RoundInfo(**row)
         
-    def get_round_current_unanswered_question(self, round_id: int) -> Question:
-        with sqlite3.connect(self._db_path) as conn:
-            conn.row_factory = sqlite3.Row
+    @instrumented
+    def get_round_current_unanswered_question(self, round_id: int) -> Question | None:
+        """The question at the round's current_index, or None once the round is complete."""
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT question_id, difficulty, category, question_text 
-                FROM Questions
-                WHERE 
+                SELECT q.question_id, q.difficulty, q.category, q.question_text 
+                FROM Rounds r
+                JOIN RoundQuestions rq ON rq.round_id = r.round_id AND rq.ordinal = r.current_index
+                JOIN Questions q ON q.question_id = rq.question_id
+                WHERE r.round_id = ?
                 """,
                 (round_id,)
             )
             row = cursor.fetchone()
-            return Question(**row)
+            return question_from_row(row) if row is not None else None
+
+    def grade_answer(self, question_id: int, text: str) -> tuple[bool, str | None]:
+        """Return (answered_correctly, correct_answer), checked against the in-memory answer map."""
+        return self._answers.check(question_id, text)
+
+    def grade_answers(self, responses: list[QuestionResponse]) -> list[tuple[bool, str | None]]:
+        """grade_answer for each response, in order."""
+        return [self._answers.check(response.question_id, response.text) for response in responses]
+
+    @instrumented
+    def answer_round_question(self, round_id: int, response: QuestionResponse) -> RoundAnswerResult:
+        """Grade the answer to the round's current question, record it and advance the round."""
+        answered_correctly, correct_answer = self.grade_answer(response.question_id, response.text)
+
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT r.user_id, r.current_index, r.round_status, rq.question_id,
+                    (SELECT COUNT(*) FROM RoundQuestions WHERE round_id = r.round_id) AS question_count
+                FROM Rounds r
+                LEFT JOIN RoundQuestions rq ON rq.round_id = r.round_id AND rq.ordinal = r.current_index
+                WHERE r.round_id = ?
+                """,
+                (round_id,)
+            )
+            current = cursor.fetchone()
+            if current is None:
+                raise ValueError(f"No round found with id: {round_id}")
+            if current['question_id'] is None:
+                raise ValueError(f"Round {round_id} is already complete")
+            if current['question_id'] != response.question_id:
+                raise ValueError(
+                    f"Question {response.question_id} is not the current question of round {round_id}"
+                )
+
+            cursor.execute(
+                """
+                INSERT INTO RoundAnswers (question_id, user_id, answer_text, answered_correctly)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (question_id, user_id) DO UPDATE SET
+                    answer_text = excluded.answer_text,
+                    answered_correctly = excluded.answered_correctly,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                (response.question_id, current['user_id'], response.text, int(answered_correctly))
+            )
+            cursor.execute(
+                """
+                UPDATE RoundQuestions
+                SET answered_correctly = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE round_id = ? AND question_id = ?
+                """,
+                (int(answered_correctly), round_id, response.question_id)
+            )
+
+            next_index = current['current_index'] + 1
+            round_status = (
+                RoundStatus.COMPLETED if next_index >= current['question_count'] else RoundStatus.IN_PROGRESS
+            )
+            cursor.execute(
+                """
+                UPDATE Rounds
+                SET current_index = ?, round_status = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE round_id = ? AND current_index = ?
+                """,
+                (next_index, round_status.value, round_id, current['current_index'])
+            )
+            if cursor.rowcount == 0:  # Lost a race with a concurrent answer
+                raise ValueError(f"Question {response.question_id} of round {round_id} was already answered")
+
+            conn.commit()
+
+        self._seen.mark(current['user_id'], response.question_id)
+        return RoundAnswerResult(
+            round_id=round_id,
+            question_id=response.question_id,
+            answered_correctly=answered_correctly,
+            correct_answer=correct_answer,
+            current_index=next_index,
+            round_status=round_status
+        )
+
+    @instrumented
+    def load_round(self, round_id: int) -> tuple[RoundInfo, list[int]]:
+        """A round and its question_ids in ordinal order, for the round session store."""
+        round_info = self.get_round_by_id(round_id)
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT question_id
+                FROM RoundQuestions
+                WHERE round_id = ?
+                ORDER BY ordinal
+                """,
+                (round_id,)
+            )
+            return round_info, [row[0] for row in cursor.fetchall()]
+
+    @instrumented
+    def save_round_progress(self,
+        answers: list[tuple[int, int, int, str, bool]],
+        rounds: list[tuple[int, int, RoundStatus]],
+        user_stats: list[UserStatsRecord] = ()
+    ):
+        """Persist buffered round state in one transaction.
+
+        ``answers`` are (round_id, question_id, user_id, answer_text, answered_correctly)
+        rows for RoundAnswers and RoundQuestions; ``rounds`` are (round_id, current_index, round_status);
+        ``user_stats`` are the leaderboard aggregates touched by those answers.
+        """
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            self._write_user_stats(cursor, user_stats)
+            cursor.executemany(
+                """
+                INSERT INTO RoundAnswers (question_id, user_id, answer_text, answered_correctly)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (question_id, user_id) DO UPDATE SET
+                    answer_text = excluded.answer_text,
+                    answered_correctly = excluded.answered_correctly,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                [(question_id, user_id, text, int(correct)) for _, question_id, user_id, text, correct in answers]
+            )
+            cursor.executemany(
+                """
+                UPDATE RoundQuestions
+                SET answered_correctly = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE round_id = ? AND question_id = ?
+                """,
+                [(int(correct), round_id, question_id) for round_id, question_id, _, _, correct in answers]
+            )
+            cursor.executemany(
+                """
+                UPDATE Rounds
+                SET current_index = ?, round_status = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE round_id = ?
+                """,
+                [(current_index, round_status.value, round_id) for round_id, current_index, round_status in rounds]
+            )
+            conn.commit()
+
+    def get_question_bucket(self, question_id: int) -> tuple[str, str] | None:
+        """(category, difficulty) of a question, from the in-memory index."""
+        return self._index.get(question_id)
+
+    @staticmethod
+    def _write_user_stats(cursor: sqlite3.Cursor, records: list[UserStatsRecord]):
+        cursor.executemany(
+            """
+            INSERT INTO UserStats (user_id, answered, correct, streak, best_streak)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET
+                answered = excluded.answered,
+                correct = excluded.correct,
+                streak = excluded.streak,
+                best_streak = excluded.best_streak,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            [(r.user_id, r.answered, r.correct, r.streak, r.best_streak) for r in records]
+        )
+        cursor.executemany(
+            """
+            INSERT INTO UserCategoryStats (user_id, category, answered, correct)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (user_id, category) DO UPDATE SET
+                answered = excluded.answered,
+                correct = excluded.correct
+            """,
+            [
+                (r.user_id, category, answered, correct)
+                for r in records
+                for category, (answered, correct) in r.categories.items()
+            ]
+        )
+
+    @instrumented
+    def load_user_stats(self) -> list[UserStatsRecord]:
+        """Leaderboard aggregates as last persisted in the summary tables."""
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT user_id, answered, correct, streak, best_streak
+                FROM UserStats
+                """
+            )
+            records = {row['user_id']: UserStatsRecord(**row) for row in cursor.fetchall()}
+            cursor.execute(
+                """
+                SELECT user_id, category, answered, correct
+                FROM UserCategoryStats
+                """
+            )
+            for row in cursor.fetchall():
+                if row['user_id'] in records:
+                    records[row['user_id']].categories[row['category']] = [row['answered'], row['correct']]
+            return list(records.values())
+
+    @instrumented
+    def reconcile_user_stats(self) -> list[UserStatsRecord]:
+        """Recompute leaderboard aggregates from every round's answers and overwrite the summary tables.
+
+        Counts each answer, like ``Leaderboard.record_answer``, so a question
+        answered in several rounds counts once per round.
+        """
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT r.user_id, q.category, rq.answered_correctly
+                FROM RoundQuestions rq
+                JOIN Rounds r ON r.round_id = rq.round_id
+                LEFT JOIN Questions q ON q.question_id = rq.question_id
+                WHERE rq.answered_correctly IS NOT NULL
+                ORDER BY r.user_id, rq.updated_at, rq.rowid
+                """
+            )
+            records: dict[int, UserStatsRecord] = {}
+            while rows := cursor.fetchmany(Config.QUESTION_EXPORT_BATCH_SIZE):
+                for user_id, category, answered_correctly in rows:
+                    record = records.get(user_id)
+                    if record is None:
+                        record = records[user_id] = UserStatsRecord(user_id)
+                    record.record(category, bool(answered_correctly))
+
+            cursor.execute("DELETE FROM UserCategoryStats")
+            cursor.execute("DELETE FROM UserStats")
+            self._write_user_stats(cursor, list(records.values()))
+            conn.commit()
+            return list(records.values())
+
+    @instrumented
+    def warm_up(self):
+        """Open every pooled connection and pull the question tables into the page cache.
 
+        Called from the app lifespan so the first requests of each worker
+        do not pay for connection setup and cold pages.
+        """
+        with ExitStack() as stack:
+            connections = [stack.enter_context(self._pool.connection()) for _ in range(self._pool.size)]
+            cursor = connections[0].cursor()
+            cursor.execute("SELECT SUM(LENGTH(question_text)) FROM Questions")
+            cursor.execute("SELECT COUNT(answer_text) FROM TriviaAnswers WHERE is_correct = 1")
 
+    def close(self):
+        """Close pooled connections. Called from the app lifespan on shutdown."""
+        self._pool.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+import random
+import threading
+from typing import Container
+from backend.schemas import CategoryChoices, DifficultyChoices
+
+
+BucketKey = tuple[str | None, str | None]  # (category, difficulty), None = any
+
+
+class QuestionIndex:
+    """In-memory index of question_ids per (category, difficulty) bucket.
+
+    Every question is stored in four buckets: (category, difficulty),
+    (category, any), (any, difficulty) and (any, any), so each filter
+    combination supported by ``/questions/random`` is a single list. Each
+    bucket keeps a position map so removals are O(1) swap-with-last.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: dict[BucketKey, list[int]] = {}
+        self._positions: dict[BucketKey, dict[int, int]] = {}
+        self._keys: dict[int, tuple[str, str]] = {}  # question_id -> (category, difficulty)
+
+    @staticmethod
+    def bucket_key(
+        category: CategoryChoices | str | None = None,
+        difficulty: DifficultyChoices | str | None = None
+    ) -> BucketKey:
+        if isinstance(category, CategoryChoices):
+            category = category.value
+        if isinstance(difficulty, DifficultyChoices):
+            difficulty = difficulty.value
+        return (category, difficulty)
+
+    @staticmethod
+    def covering_keys(category: str, difficulty: str) -> tuple[BucketKey, ...]:
+        """All bucket keys a question with this category and difficulty belongs to."""
+        return (
+            (category, difficulty),
+            (category, None),
+            (None, difficulty),
+            (None, None),
+        )
+
+    def _add(self, question_id: int, category: str, difficulty: str):
+        for key in self.covering_keys(category, difficulty):
+            bucket = self._buckets.setdefault(key, [])
+            self._positions.setdefault(key, {})[question_id] = len(bucket)
+            bucket.append(question_id)
+        self._keys[question_id] = (category, difficulty)
+
+    def _remove(self, question_id: int):
+        category, difficulty = self._keys.pop(question_id)
+        for key in self.covering_keys(category, difficulty):
+            bucket = self._buckets[key]
+            positions = self._positions[key]
+            pos = positions.pop(question_id)
+            last = bucket.pop()
+            if last != question_id:
+                bucket[pos] = last
+                positions[last] = pos
+
+    def load(self, rows):
+        """Replace the index contents with (question_id, category, difficulty) rows."""
+        with self._lock:
+            self._buckets = {}
+            self._positions = {}
+            self._keys = {}
+            for question_id, category, difficulty in rows:
+                self._add(question_id, category, difficulty)
+
+    def add(self, question_id: int, category: str, difficulty: str):
+        with self._lock:
+            if question_id in self._keys:
+                self._remove(question_id)
+            self._add(question_id, category, difficulty)
+
+    def discard(self, question_id: int):
+        with self._lock:
+            if question_id in self._keys:
+                self._remove(question_id)
+
+    def get(self, question_id: int) -> tuple[str, str] | None:
+        """Return the (category, difficulty) of an indexed question."""
+        return self._keys.get(question_id)
+
+    def random_id(self,
+        category: CategoryChoices | str | None = None,
+        difficulty: DifficultyChoices | str | None = None
+    ) -> int | None:
+        """Pick a uniformly random question_id from the bucket, or None if empty."""
+        key = self.bucket_key(category, difficulty)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if not bucket:
+                return None
+            return bucket[random.randrange(len(bucket))]
+
+    def count(self,
+        category: CategoryChoices | str | None = None,
+        difficulty: DifficultyChoices | str | None = None
+    ) -> int:
+        """Number of questions in the bucket, kept current by every add and discard."""
+        return len(self._buckets.get(self.bucket_key(category, difficulty), ()))
+
+    def counts(self) -> dict[BucketKey, int]:
+        """Size of every bucket, including the per-category, per-difficulty and overall totals."""
+        with self._lock:
+            return {key: len(bucket) for key, bucket in self._buckets.items()}
+
+    def sample(self,
+        category: CategoryChoices | str | None = None,
+        difficulty: DifficultyChoices | str | None = None,
+        k: int = 1,
+        exclude: Container[int] = frozenset()
+    ) -> list[int]:
+        """Up to ``k`` distinct random question_ids from the bucket, skipping ``exclude``.
+
+        Uses rejection sampling while the bucket is mostly unexcluded and
+        falls back to filtering the whole bucket once that gets expensive.
+        """
+        key = self.bucket_key(category, difficulty)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if not bucket or k <= 0:
+                return []
+
+            picked: list[int] = []
+            seen: set[int] = set()
+            for _ in range(4 * k + 8):
+                question_id = bucket[random.randrange(len(bucket))]
+                if question_id in exclude or question_id in seen:
+                    continue
+                picked.append(question_id)
+                seen.add(question_id)
+                if len(picked) == k:
+                    return picked
+
+            remaining = [i for i in bucket if i not in exclude and i not in seen]
+
+        picked.extend(random.sample(remaining, min(k - len(picked), len(remaining))))
+        return picked
+
+    def leaf_keys(self,
+        category: CategoryChoices | str | None = None,
+        difficulty: DifficultyChoices | str | None = None
+    ) -> list[BucketKey]:
+        """Non-empty (category, difficulty) buckets matching the filter."""
+        category, difficulty = self.bucket_key(category, difficulty)
+        with self._lock:
+            return [
+                key for key, bucket in self._buckets.items()
+                if bucket
+                and key[0] is not None and key[1] is not None
+                and category in (None, key[0])
+                and difficulty in (None, key[1])
+            ]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, question_id: int) -> bool:
+        return question_id in self._keys
@@ -0,0 +1,35 @@
+-- Secondary indexes. Kept separate from init.sql so bulk loads can create
+-- them after the data is in (see migrations.py and load.py).
+
+-- WHERE category = ? [AND difficulty = ?]
+CREATE INDEX IF NOT EXISTS idx_questions_category_difficulty
+    ON Questions(category, difficulty);
+
+-- WHERE difficulty = ?
+CREATE INDEX IF NOT EXISTS idx_questions_difficulty
+    ON Questions(difficulty);
+
+-- Correct-answer lookup: WHERE is_correct = 1 AND question_id = ?
+-- Partial and covering, so the lookup never touches the table.
+CREATE INDEX IF NOT EXISTS idx_trivia_answers_correct
+    ON TriviaAnswers(question_id, answer_text)
+    WHERE is_correct = 1;
+
+-- All answers for a question, and ON DELETE CASCADE from Questions
+CREATE INDEX IF NOT EXISTS idx_trivia_answers_question
+    ON TriviaAnswers(question_id);
+
+CREATE INDEX IF NOT EXISTS idx_rounds_user
+    ON Rounds(user_id);
+
+-- Current question of a round: WHERE round_id = ? AND ordinal = ?
+CREATE INDEX IF NOT EXISTS idx_round_questions_round_ordinal
+    ON RoundQuestions(round_id, ordinal);
+
+-- ON DELETE CASCADE from Questions
+CREATE INDEX IF NOT EXISTS idx_round_questions_question
+    ON RoundQuestions(question_id);
+
+-- Answers by user: WHERE user_id = ?
+CREATE INDEX IF NOT EXISTS idx_round_answers_user
+    ON RoundAnswers(user_id, question_id);
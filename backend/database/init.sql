@@ -1,5 +1,7 @@
 PRAGMA foreign_keys = ON;
 
+-- Secondary indexes live in indexes.sql and are applied by migrations.py.
+
 -- CREATE TABLE IF NOT EXISTS Categories (
 --     category_id INTEGER PRIMARY KEY AUTOINCREMENT,
 --     name TEXT NOT NULL UNIQUE
@@ -12,6 +14,7 @@ CREATE TABLE IF NOT EXISTS Users (
     username TEXT NOT NULL,
     hashed_mfa_code TEXT,
     hashed_mfa_code_expires_at DATETIME,
+    mfa_code_attempts INTEGER NOT NULL DEFAULT 0,  -- Failed logins with the current code
     session_id TEXT,
     session_refreshed_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
@@ -56,6 +59,8 @@ CREATE TABLE IF NOT EXISTS RoundQuestions (
     round_id INTEGER NOT NULL,
     question_id INTEGER NOT NULL,
     ordinal INTEGER NOT NULL,
+    -- NULL until answered. Kept per round, unlike RoundAnswers, so repeat answers all count in UserStats
+    answered_correctly INTEGER CHECK (answered_correctly IN (0, 1)),
     UNIQUE(round_id, question_id),
     FOREIGN KEY (round_id) REFERENCES Rounds(round_id)
         ON UPDATE CASCADE
@@ -82,6 +87,45 @@ CREATE TABLE IF NOT EXISTS RoundAnswers (
         ON DELETE CASCADE
 );
 
+-- Log of question writes, polled by other worker processes to keep their
+-- in-memory indexes and caches current. question_id NULL = reload everything.
+CREATE TABLE IF NOT EXISTS QuestionChanges (
+    change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    changed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    question_id INTEGER
+);
+
+-- Sessions logged out before their tokens expire. Every worker keeps the
+-- unexpired ones in memory and rejects their tokens without a lookup.
+CREATE TABLE IF NOT EXISTS RevokedSessions (
+    session_id TEXT PRIMARY KEY,
+    revoked_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL  -- Last token expiry; the row can go after this
+);
+
+CREATE TABLE IF NOT EXISTS UserStats (
+    user_id INTEGER PRIMARY KEY,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    answered INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    streak INTEGER NOT NULL DEFAULT 0,  -- Current run of correct answers
+    best_streak INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES Users(user_id)
+        ON UPDATE CASCADE
+        ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS UserCategoryStats (
+    user_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    answered INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, category),
+    FOREIGN KEY (user_id) REFERENCES Users(user_id)
+        ON UPDATE CASCADE
+        ON DELETE CASCADE
+);
+
 -- -- Triggers to auto-update updated_at timestamps (more efficient with WHEN clause)
 -- CREATE TRIGGER IF NOT EXISTS update_rounds_timestamp
 -- AFTER UPDATE ON Rounds
@@ -0,0 +1,150 @@
+import functools
+import logging
+import sqlite3
+import time
+from contextvars import ContextVar
+from backend.conf import Config
+from backend.metrics import REGISTRY
+
+
+logger = logging.getLogger(__name__)
+
+DB_OPERATION_SECONDS = REGISTRY.histogram(
+    "trivia_db_operation_seconds",
+    "TriviaDatabaseManager method latency, including pool wait, SQL and model construction.",
+    ("operation",)
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "trivia_db_query_seconds",
+    "Latency of individual SQL statements, by the manager method that issued them.",
+    ("operation",)
+)
+DB_POOL_WAIT_SECONDS = REGISTRY.histogram(
+    "trivia_db_pool_wait_seconds",
+    "Time spent waiting to check out a pooled connection."
+)
+
+_operation: ContextVar[str] = ContextVar("trivia_db_operation", default="unattributed")
+
+
+def instrumented(method):
+    """Time a TriviaDatabaseManager method and attribute the SQL it runs to its name."""
+    name = method.__name__
+    labels = (name,)
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        token = _operation.set(name)
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            DB_OPERATION_SECONDS.observe(time.perf_counter() - started, labels)
+            _operation.reset(token)
+
+    return wrapper
+
+
+def _log_slow_query(conn: sqlite3.Connection, operation: str, sql: str, parameters, seconds: float):
+    try:
+        cursor = sqlite3.Cursor(conn)  # Not instrumented: the plan lookup must not time or log itself
+        plan = " | ".join(row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters))
+    except sqlite3.Error as e:
+        plan = f"unavailable ({e})"
+    logger.warning(
+        "Slow query in %s: %.1f ms\n  sql: %s\n  parameters: %.200r\n  plan: %s",
+        operation, seconds * 1000, " ".join(sql.split()), parameters, plan
+    )
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times every statement and logs those slower than SLOW_QUERY_SECONDS.
+
+    SQLite does most of a SELECT's work while its rows are fetched, so a
+    statement's time is its ``execute`` plus every fetch of its rows. It is
+    recorded once the rows run out, or when the cursor runs another
+    statement, is closed or is collected.
+    """
+
+    _statement: list | None = None  # [operation, sql, parameters, seconds] of the statement being read
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        started = time.perf_counter()
+        result = super().execute(sql, parameters)
+        self._statement = [_operation.get(), sql, parameters, time.perf_counter() - started]
+        if self.description is None:  # No rows to fetch
+            self._finish()
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        started = time.perf_counter()
+        result = super().executemany(sql, seq_of_parameters)
+        self._observe(_operation.get(), sql, None, time.perf_counter() - started)
+        return result
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(started, len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started, True)
+            raise
+        self._fetched(started, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish(explain=False)  # The connection may be in use by another thread by now
+
+    def _fetched(self, started: float, exhausted: bool):
+        if self._statement is not None:
+            self._statement[3] += time.perf_counter() - started
+            if exhausted:
+                self._finish()
+
+    def _finish(self, explain: bool = True):
+        statement, self._statement = self._statement, None
+        if statement is not None:
+            operation, sql, parameters, seconds = statement
+            self._observe(operation, sql, parameters if explain else None, seconds)
+
+    def _observe(self, operation: str, sql: str, parameters, seconds: float):
+        DB_QUERY_SECONDS.observe(seconds, (operation,))
+        if seconds >= Config.SLOW_QUERY_SECONDS:
+            if parameters is None:  # executemany or no connection to ask: no single plan to show
+                logger.warning(
+                    "Slow statement in %s: %.1f ms\n  sql: %s", operation, seconds * 1000, " ".join(sql.split())
+                )
+            else:
+                _log_slow_query(self.connection, operation, sql, parameters, seconds)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors are InstrumentedCursors (``conn.cursor()``, not ``conn.execute``)."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
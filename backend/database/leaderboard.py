@@ -0,0 +1,209 @@
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from itertools import islice
+
+
+@dataclass(slots=True)
+class UserStatsRecord:
+    """Aggregates for one user, mirrored in the UserStats/UserCategoryStats tables."""
+    user_id: int
+    answered: int = 0
+    correct: int = 0
+    streak: int = 0
+    best_streak: int = 0
+    categories: dict[str, list[int]] = field(default_factory=dict)  # category -> [answered, correct]
+
+    def record(self, category: str | None, correct: bool):
+        self.answered += 1
+        if correct:
+            self.correct += 1
+            self.streak += 1
+            self.best_streak = max(self.best_streak, self.streak)
+        else:
+            self.streak = 0
+
+        if category is not None:
+            counts = self.categories.setdefault(category, [0, 0])
+            counts[0] += 1
+            counts[1] += int(correct)
+
+
+class ChunkedSortedList:
+    """A sorted list stored as sorted chunks of at most ``2 * load`` items.
+
+    Adding or removing bisects the chunk maxima and then edits one chunk, so
+    it costs O(log n + load) rather than the O(n) shift of one flat list. A
+    Fenwick tree over the chunk lengths answers ``index`` in O(log n); it is
+    rebuilt only after a chunk is split or dropped.
+    """
+
+    def __init__(self, items=(), load: int = 512):
+        self._load = load
+        items = sorted(items)
+        self._chunks = [items[i:i + load] for i in range(0, len(items), load)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._tree: list[int] | None = None
+        self._len = len(items)
+
+    def add(self, item):
+        if not self._chunks:
+            self._chunks.append([item])
+            self._maxes.append(item)
+            self._tree = None
+            self._len = 1
+            return
+
+        i = min(bisect_left(self._maxes, item), len(self._maxes) - 1)
+        chunk = self._chunks[i]
+        insort(chunk, item)
+        self._maxes[i] = chunk[-1]
+        self._len += 1
+        if len(chunk) > 2 * self._load:
+            self._chunks.insert(i + 1, chunk[self._load:])
+            del chunk[self._load:]
+            self._maxes.insert(i, chunk[-1])
+            self._tree = None
+        else:
+            self._update_tree(i, 1)
+
+    def remove(self, item):
+        """Remove one occurrence of ``item``; ValueError if there is none."""
+        i = bisect_left(self._maxes, item)
+        if i == len(self._maxes):
+            raise ValueError(f"{item!r} not in list")
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, item)
+        if chunk[j] != item:
+            raise ValueError(f"{item!r} not in list")
+
+        del chunk[j]
+        self._len -= 1
+        if chunk:
+            self._maxes[i] = chunk[-1]
+            self._update_tree(i, -1)
+        else:
+            del self._chunks[i]
+            del self._maxes[i]
+            self._tree = None
+
+    def index(self, item) -> int:
+        """Number of items less than ``item``, i.e. its bisect_left position."""
+        i = bisect_left(self._maxes, item)
+        if i == len(self._maxes):
+            return self._len
+        return self._prefix(i) + bisect_left(self._chunks[i], item)
+
+    def _update_tree(self, i: int, delta: int):
+        if self._tree is not None:
+            i += 1
+            while i < len(self._tree):
+                self._tree[i] += delta
+                i += i & -i
+
+    def _prefix(self, i: int) -> int:
+        """Total length of the first ``i`` chunks."""
+        if self._tree is None:
+            self._tree = [0] + [len(chunk) for chunk in self._chunks]
+            for j in range(1, len(self._tree)):
+                parent = j + (j & -j)
+                if parent < len(self._tree):
+                    self._tree[parent] += self._tree[j]
+        total = 0
+        while i:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __len__(self) -> int:
+        return self._len
+
+
+class Leaderboard:
+    """Per-user answer aggregates plus a ranking kept sorted on every update.
+
+    The ranking is a ChunkedSortedList of (-correct, user_id) keys, so an
+    update, a user's rank and the top N each take O(log n) plus the chunk
+    size or N, whatever the number of users. Updates are recorded
+    as answers arrive and the touched users are handed to the write-behind
+    flush through ``take_dirty``. ``load`` replaces everything, which is
+    how periodic reconciliation against the stored round answers is applied.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[int, UserStatsRecord] = {}
+        self._ranking = ChunkedSortedList()
+        self._dirty: set[int] = set()
+
+    @staticmethod
+    def _key(record: UserStatsRecord) -> tuple[int, int]:
+        return (-record.correct, record.user_id)
+
+    def load(self, records: list[UserStatsRecord]):
+        with self._lock:
+            self._stats = {record.user_id: record for record in records}
+            self._ranking = ChunkedSortedList(self._key(record) for record in records)
+            self._dirty = set()
+
+    def record_answer(self, user_id: int, category: str | None, correct: bool):
+        with self._lock:
+            record = self._stats.get(user_id)
+            if record is None:
+                record = self._stats[user_id] = UserStatsRecord(user_id)
+            else:
+                self._ranking.remove(self._key(record))
+
+            record.record(category, correct)
+            self._ranking.add(self._key(record))
+            self._dirty.add(user_id)
+
+    def take_dirty(self) -> list[UserStatsRecord]:
+        """Copies of the records changed since the last call, for persisting."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            return [
+                UserStatsRecord(
+                    user_id=record.user_id,
+                    answered=record.answered,
+                    correct=record.correct,
+                    streak=record.streak,
+                    best_streak=record.best_streak,
+                    categories={category: list(counts) for category, counts in record.categories.items()}
+                )
+                for record in map(self._stats.get, dirty)
+            ]
+
+    def mark_dirty(self, user_ids):
+        """Re-queue users whose records could not be persisted."""
+        with self._lock:
+            self._dirty.update(user_id for user_id in user_ids if user_id in self._stats)
+
+    def get(self, user_id: int) -> UserStatsRecord | None:
+        return self._stats.get(user_id)
+
+    def rank(self, user_id: int) -> int | None:
+        """1-based competition rank: users with the same correct count share a rank."""
+        with self._lock:
+            record = self._stats.get(user_id)
+            if record is None:
+                return None
+            return self._ranking.index((-record.correct,)) + 1
+
+    def top(self, n: int) -> list[tuple[int, UserStatsRecord]]:
+        """(rank, record) for the ``n`` best users."""
+        with self._lock:
+            entries = []
+            previous = None
+            for i, (negative_correct, user_id) in enumerate(islice(self._ranking, n)):
+                rank = entries[-1][0] if negative_correct == previous else i + 1
+                entries.append((rank, self._stats[user_id]))
+                previous = negative_correct
+            return entries
+
+    def __len__(self) -> int:
+        return len(self._stats)
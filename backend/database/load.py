@@ -0,0 +1,417 @@
+import argparse
+import csv
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+from backend.conf import Config
+from backend.schemas import CategoryChoices, DifficultyChoices
+from backend.database.migrations import (
+    create_indexes, create_search_index, drop_indexes, drop_search_triggers, migrate
+)
+
+
+CATEGORIES = {category.value for category in CategoryChoices}
+DIFFICULTIES = {difficulty.value for difficulty in DifficultyChoices}
+
+
+@dataclass
+class LoadStats:
+    table: str
+    read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.table}: read {self.read}, inserted {self.inserted}, "
+            f"duplicates {self.duplicates}, invalid {self.invalid} "
+            f"in {self.seconds:.2f}s ({self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+def detect_format(path: str | Path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    if suffix == '.csv':
+        return 'csv'
+    if suffix == '.json':
+        return 'json'
+    raise ValueError(f"Unsupported file type: {path}. Expected .csv, .ndjson, .jsonl or .json")
+
+
+def iter_records(f: IO[str], fmt: str) -> Iterator[dict]:
+    """Incrementally parse CSV (with header) or NDJSON records from a text stream.
+
+    A JSON array of records is also accepted, but is parsed all at once.
+    """
+    if fmt == 'csv':
+        yield from csv.DictReader(f)
+    elif fmt == 'ndjson':
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == 'json':
+        records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError("Expected a JSON array of records")
+        yield from records
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+@dataclass
+class QuestionRecord:
+    """One validated row of a bulk admin upload; None fields are left as they are."""
+    question_id: int | None = None
+    category: str | None = None
+    difficulty: str | None = None
+    question_text: str | None = None
+    answers: list[tuple[str, int]] | None = None  # (answer_text, is_correct), replacing existing answers
+
+
+def _parse_answers(record: dict) -> list[tuple[str, int]] | None:
+    """Answers given as an ``answers`` list of answer records, or a single correct ``answer_text`` (CSV)."""
+    if record.get('answers') is not None:
+        if not isinstance(record['answers'], list):
+            raise ValueError("answers must be a list of {answer_text, is_correct} records")
+        answers = []
+        for answer in record['answers']:
+            if not isinstance(answer, dict) or not str(answer.get('answer_text') or '').strip():
+                raise ValueError("every answer needs an answer_text")
+            is_correct = int(str(answer.get('is_correct')).strip().lower() in ('1', 'true'))
+            answers.append((str(answer['answer_text']).strip(), is_correct))
+        return answers
+
+    answer_text = str(record.get('answer_text') or '').strip()
+    return [(answer_text, 1)] if answer_text else None
+
+
+def parse_question_record(record: dict, update: bool = False) -> QuestionRecord:
+    """Validate a question record of a bulk admin upload, raising ValueError with the reason.
+
+    New questions need a category, difficulty and text; updates need a
+    question_id and at least one field to change.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Expected an object with question fields")
+
+    parsed = QuestionRecord(question_id=parse_question_id(record) if update else None)
+
+    category = str(record.get('category') or '').strip().lower()
+    difficulty = str(record.get('difficulty') or '').strip().lower()
+    question_text = str(record.get('question_text') or '').strip()
+    if category and category not in CATEGORIES:
+        raise ValueError(f"Unknown category: {category}")
+    if difficulty and difficulty not in DIFFICULTIES:
+        raise ValueError(f"Unknown difficulty: {difficulty}")
+    if not update and not (category and difficulty and question_text):
+        raise ValueError("category, difficulty and question_text are required")
+
+    parsed.category = category or None
+    parsed.difficulty = difficulty or None
+    parsed.question_text = question_text or None
+    parsed.answers = _parse_answers(record)
+    if update and parsed == QuestionRecord(question_id=parsed.question_id):
+        raise ValueError("No fields provided to update")
+    return parsed
+
+
+def parse_question_id(record: dict) -> int:
+    """The question_id of a bulk delete record, which may also be a bare id."""
+    question_id = record.get('question_id') if isinstance(record, dict) else record
+    if isinstance(question_id, bool):
+        raise ValueError("question_id must be an integer")
+    try:
+        return int(question_id)
+    except (TypeError, ValueError):
+        raise ValueError("question_id is required and must be an integer")
+
+
+def normalize_question_text(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def question_fingerprint(text: str) -> int:
+    """Compact 64-bit fingerprint of normalized question text for deduplication."""
+    digest = hashlib.blake2b(normalize_question_text(text).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def existing_fingerprints(conn: sqlite3.Connection) -> dict[int, int]:
+    """Fingerprint -> question_id for every question already in the database."""
+    cursor = conn.execute("SELECT question_id, question_text FROM Questions")
+    fingerprints = {}
+    while rows := cursor.fetchmany(Config.BULK_LOAD_BATCH_SIZE):
+        for question_id, question_text in rows:
+            fingerprints.setdefault(question_fingerprint(question_text), question_id)
+    return fingerprints
+
+
+def next_question_id(conn: sqlite3.Connection) -> int:
+    """First free question_id, never reusing ids of deleted questions (as AUTOINCREMENT would not).
+
+    Only stable inside a write transaction.
+    """
+    return conn.execute(
+        """
+        SELECT MAX(
+            COALESCE((SELECT MAX(question_id) FROM Questions), 0),
+            COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'Questions'), 0)
+        ) + 1
+        """
+    ).fetchone()[0]
+
+
+def load_questions(
+    conn: sqlite3.Connection,
+    records: Iterable[dict],
+    batch_size: int = Config.BULK_LOAD_BATCH_SIZE,
+    dedupe: bool = True,
+    id_map: dict | None = None
+) -> LoadStats:
+    """Insert question records with executemany batches inside the caller's transaction.
+
+    Question ids are assigned here. When a record carries its own question_id,
+    ``id_map`` records source id -> database id so answers can be linked;
+    duplicates map to the question that already exists.
+    """
+    stats = LoadStats('Questions')
+    started = time.perf_counter()
+    seen = existing_fingerprints(conn) if dedupe else {}
+    next_id = next_question_id(conn)
+
+    def rows():
+        nonlocal next_id
+        for record in records:
+            stats.read += 1
+            category = (record.get('category') or '').strip().lower()
+            difficulty = (record.get('difficulty') or '').strip().lower()
+            question_text = (record.get('question_text') or '').strip()
+            source_id = record.get('question_id')
+
+            if category not in CATEGORIES or difficulty not in DIFFICULTIES or not question_text:
+                stats.invalid += 1
+                if len(stats.errors) < 10:
+                    stats.errors.append(f"Questions row {stats.read}: invalid category, difficulty or text")
+                continue
+
+            if dedupe:
+                fingerprint = question_fingerprint(question_text)
+                existing_id = seen.get(fingerprint)
+                if existing_id is not None:
+                    stats.duplicates += 1
+                    if id_map is not None and source_id not in (None, ''):
+                        id_map[int(source_id)] = existing_id
+                    continue
+                seen[fingerprint] = next_id
+
+            if id_map is not None and source_id not in (None, ''):
+                id_map[int(source_id)] = next_id
+
+            yield (next_id, category, difficulty, question_text)
+            next_id += 1
+
+    for batch in _batches(rows(), batch_size):
+        conn.executemany(
+            """
+            INSERT INTO Questions (question_id, category, difficulty, question_text)
+            VALUES (?, ?, ?, ?)
+            """,
+            batch
+        )
+        stats.inserted += len(batch)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def load_answers(
+    conn: sqlite3.Connection,
+    records: Iterable[dict],
+    batch_size: int = Config.BULK_LOAD_BATCH_SIZE,
+    id_map: dict | None = None,
+    min_question_id: int | None = None
+) -> LoadStats:
+    """Insert answer records into TriviaAnswers, remapping question ids through ``id_map``."""
+    stats = LoadStats('TriviaAnswers')
+    started = time.perf_counter()
+
+    def rows():
+        for record in records:
+            stats.read += 1
+            try:
+                question_id = int(record['question_id'])
+                answer_text = str(record['answer_text']).strip()
+                is_correct = int(str(record.get('is_correct')).strip().lower() in ('1', 'true'))
+            except (KeyError, TypeError, ValueError):
+                stats.invalid += 1
+                continue
+
+            if id_map is not None:
+                if question_id not in id_map:
+                    stats.invalid += 1
+                    if len(stats.errors) < 10:
+                        stats.errors.append(f"TriviaAnswers row {stats.read}: unknown question_id {question_id}")
+                    continue
+                question_id = id_map[question_id]
+
+            if min_question_id is not None and question_id < min_question_id:
+                stats.duplicates += 1
+                continue
+
+            if not answer_text:
+                stats.invalid += 1
+                continue
+
+            yield (question_id, answer_text, is_correct)
+
+    for batch in _batches(rows(), batch_size):
+        conn.executemany(
+            """
+            INSERT INTO TriviaAnswers (question_id, answer_text, is_correct)
+            VALUES (?, ?, ?)
+            """,
+            batch
+        )
+        stats.inserted += len(batch)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def bulk_load_records(
+    db_path: str,
+    questions: Iterable[dict] | None = None,
+    answers: Iterable[dict] | None = None,
+    batch_size: int = Config.BULK_LOAD_BATCH_SIZE,
+    dedupe: bool = True,
+    link_answers: bool = True
+) -> list[LoadStats]:
+    """Load question and answer records into ``db_path`` in a single transaction.
+
+    Answers loaded together with questions are linked through the questions'
+    source ids; pass ``link_answers=False`` when they already carry the final
+    question_ids (it saves the id map on very large loads).
+
+    Secondary indexes and the full-text index triggers are dropped for the
+    load; both are rebuilt once it commits.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        migrate(conn)  # Creates the schema in a new database
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")  # With WAL: no fsync per commit, and no corruption on power loss
+        conn.execute(f"PRAGMA cache_size = -{Config.DB_CACHE_SIZE_KIB * 4}")
+
+        all_stats = []
+        conn.execute("BEGIN")
+        try:
+            drop_indexes(conn)
+            drop_search_triggers(conn)
+            id_map = {}
+            first_new_id = next_question_id(conn)
+
+            if questions is not None:
+                all_stats.append(load_questions(
+                    conn, questions, batch_size=batch_size, dedupe=dedupe,
+                    id_map=id_map if link_answers else None
+                ))
+
+            if answers is not None:
+                linked = questions is not None and link_answers
+                all_stats.append(load_answers(
+                    conn, answers,
+                    batch_size=batch_size,
+                    id_map=id_map if linked else None,
+                    # Duplicate questions keep the answers they already have
+                    min_question_id=first_new_id if linked and dedupe else None
+                ))
+
+            # Running servers reload everything once they see this
+            conn.execute("INSERT INTO QuestionChanges (question_id) VALUES (NULL)")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")  # Also restores the dropped indexes
+            raise
+
+        started = time.perf_counter()
+        create_indexes(conn)
+        create_search_index(conn)
+        all_stats.append(LoadStats('indexes', seconds=time.perf_counter() - started))
+        return all_stats
+    finally:
+        conn.close()
+
+
+def bulk_load(
+    db_path: str,
+    questions_path: str | Path | None = None,
+    answers_path: str | Path | None = None,
+    batch_size: int = Config.BULK_LOAD_BATCH_SIZE,
+    dedupe: bool = True
+) -> list[LoadStats]:
+    """Stream CSV/NDJSON question and answer files into ``db_path``, see bulk_load_records."""
+    with ExitStack() as stack:
+        def records(path):
+            if path is None:
+                return None
+            f = stack.enter_context(open(path, newline='', encoding='utf-8'))
+            return iter_records(f, detect_format(path))
+
+        return bulk_load_records(
+            db_path,
+            questions=records(questions_path),
+            answers=records(answers_path),
+            batch_size=batch_size,
+            dedupe=dedupe
+        )
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Stream CSV/NDJSON question and answer files into a trivia database."
+    )
+    parser.add_argument('--db', default=Config.DB_PATH, help="Database path (created if missing)")
+    parser.add_argument('--questions', help="Questions file: category, difficulty, question_text[, question_id]")
+    parser.add_argument('--answers', help="Answers file: question_id, answer_text, is_correct")
+    parser.add_argument('--batch-size', type=int, default=Config.BULK_LOAD_BATCH_SIZE)
+    parser.add_argument('--no-dedupe', action='store_true', help="Skip question text deduplication")
+    args = parser.parse_args(argv)
+
+    if args.questions is None and args.answers is None:
+        parser.error("Nothing to load, pass --questions and/or --answers")
+
+    for stats in bulk_load(
+        args.db,
+        questions_path=args.questions,
+        answers_path=args.answers,
+        batch_size=args.batch_size,
+        dedupe=not args.no_dedupe
+    ):
+        print(stats if stats.table != 'indexes' else f"indexes: rebuilt in {stats.seconds:.2f}s")
+        for error in stats.errors:
+            print(f"  {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import sqlite3
+from pathlib import Path
+
+
+DATABASE_DIR = Path(__file__).resolve().parent
+INIT_SQL_PATH = DATABASE_DIR / 'init.sql'
+INDEXES_SQL_PATH = DATABASE_DIR / 'indexes.sql'
+SEARCH_SQL_PATH = DATABASE_DIR / 'search.sql'
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table,)
+    ).fetchone()
+    return row is not None
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, definition: str):
+    if column not in _columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def align_legacy_schema(conn: sqlite3.Connection):
+    """Bring databases created from create_tables.sql / early init.sql up to init.sql."""
+    if _table_exists(conn, 'Answers') and not _table_exists(conn, 'TriviaAnswers'):
+        conn.execute("ALTER TABLE Answers RENAME TO TriviaAnswers")
+
+    if _table_exists(conn, 'UserAnswers') and not _table_exists(conn, 'RoundAnswers'):
+        conn.execute("ALTER TABLE UserAnswers RENAME TO RoundAnswers")
+
+    # Creates whatever tables are still missing
+    conn.executescript(INIT_SQL_PATH.read_text())
+
+    _add_column(conn, 'RoundAnswers', 'answer_text', "TEXT NOT NULL DEFAULT ''")
+    _add_column(conn, 'Rounds', 'round_status', "TEXT NOT NULL DEFAULT 'IN_PROGRESS'")
+    _add_column(conn, 'Rounds', 'current_index', "INTEGER NOT NULL DEFAULT 0")
+    _add_column(conn, 'RoundQuestions', 'ordinal', "INTEGER NOT NULL DEFAULT 0")
+
+
+def create_missing_tables(conn: sqlite3.Connection):
+    """Create tables added to init.sql since the database was created."""
+    conn.executescript(INIT_SQL_PATH.read_text())
+
+
+def add_mfa_code_attempts(conn: sqlite3.Connection):
+    _add_column(conn, 'Users', 'mfa_code_attempts', "INTEGER NOT NULL DEFAULT 0")
+
+
+def add_round_question_results(conn: sqlite3.Connection):
+    """Store each round's answers on RoundQuestions, backfilled from RoundAnswers.
+
+    RoundAnswers holds one row per user and question, so a question answered
+    in several rounds only has its latest result to copy into each of them.
+    """
+    _add_column(conn, 'RoundQuestions', 'answered_correctly', "INTEGER CHECK (answered_correctly IN (0, 1))")
+    conn.execute(
+        """
+        UPDATE RoundQuestions
+        SET answered_correctly = (
+            SELECT ra.answered_correctly
+            FROM Rounds r
+            JOIN RoundAnswers ra ON ra.user_id = r.user_id AND ra.question_id = RoundQuestions.question_id
+            WHERE r.round_id = RoundQuestions.round_id AND RoundQuestions.ordinal < r.current_index
+        )
+        WHERE answered_correctly IS NULL
+        """
+    )
+
+
+def drop_indexes(conn: sqlite3.Connection) -> list[str]:
+    """Drop the secondary indexes from indexes.sql, e.g. before a bulk load."""
+    names = [
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\'"
+        )
+    ]
+    for name in names:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    return names
+
+
+def create_indexes(conn: sqlite3.Connection):
+    conn.executescript(INDEXES_SQL_PATH.read_text())
+
+
+def drop_search_triggers(conn: sqlite3.Connection):
+    """Stop syncing QuestionsSearch row by row, e.g. before a bulk load."""
+    for name in ('insert', 'delete', 'update'):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_questions_search_{name}")
+
+
+def create_search_index(conn: sqlite3.Connection):
+    """Create the full-text index and its triggers, then rebuild it from Questions."""
+    conn.executescript(SEARCH_SQL_PATH.read_text())
+    conn.execute("INSERT INTO QuestionsSearch (QuestionsSearch) VALUES ('rebuild')")
+
+
+# Applied in order; PRAGMA user_version records how many have run.
+# Append new migrations, never reorder or edit released ones.
+MIGRATIONS = [
+    align_legacy_schema,
+    create_indexes,
+    create_missing_tables,  # UserStats, UserCategoryStats
+    create_search_index,
+    create_missing_tables,  # QuestionChanges
+    create_missing_tables,  # RevokedSessions
+    add_mfa_code_attempts,
+    add_round_question_results,
+]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations and return the resulting schema version."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        migration(conn)
+        conn.execute(f"PRAGMA user_version = {number}")
+        conn.commit()
+    return max(version, len(MIGRATIONS))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply schema migrations to a trivia database.")
+    parser.add_argument('db_path', nargs='?', default='./backend/database/test.db')
+    args = parser.parse_args()
+
+    with sqlite3.connect(args.db_path) as conn:
+        print(f"{args.db_path}: schema version {migrate(conn)}")
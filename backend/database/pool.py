@@ -0,0 +1,117 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from backend.conf import Config
+from backend.database.instrumentation import DB_POOL_WAIT_SECONDS, InstrumentedConnection
+
+
+class ConnectionPool:
+    """Fixed-size pool of long-lived SQLite connections.
+
+    Connections are checked out for the duration of a ``with`` block, so a
+    connection is only ever used by one thread at a time even though it may
+    be handed to different threads over its lifetime (FastAPI's sync
+    threadpool). Pragmas are applied once, when a connection is opened.
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 size: int = Config.DB_POOL_SIZE,
+                 timeout: float = Config.DB_POOL_TIMEOUT
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self._db_path = db_path
+        self._size = size
+        self._timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle: list[sqlite3.Connection] = []
+        self._generation = 0
+        self._conn_generation: dict[sqlite3.Connection, int] = {}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._db_path,
+            timeout=self._timeout,
+            check_same_thread=False,  # Pool guarantees one thread at a time
+            factory=InstrumentedConnection
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA synchronous = {Config.DB_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size = -{Config.DB_CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size = {Config.DB_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        started = time.perf_counter()
+        acquired = self._slots.acquire(timeout=self._timeout)
+        DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+        if not acquired:
+            raise TimeoutError(
+                f"Timed out after {self._timeout}s waiting for a database connection"
+            )
+
+        try:
+            with self._lock:
+                if self._idle:
+                    return self._idle.pop()
+                generation = self._generation
+
+            conn = self._connect()
+            with self._lock:
+                self._conn_generation[conn] = generation
+            return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: sqlite3.Connection):
+        try:
+            with self._lock:
+                if self._conn_generation.get(conn) == self._generation:
+                    self._idle.append(conn)
+                    return
+                self._conn_generation.pop(conn, None)
+            conn.close()  # Opened before the last close(), retire it
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection, committing on success and rolling back on error.
+
+        Mirrors the transaction semantics of ``with sqlite3.connect(...) as conn``.
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    def close(self):
+        """Close all idle connections; checked-out ones are closed when returned.
+
+        The pool stays usable afterwards and lazily opens fresh connections.
+        """
+        with self._lock:
+            self._generation += 1
+            idle, self._idle = self._idle, []
+            for conn in idle:
+                self._conn_generation.pop(conn, None)
+
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,34 @@
+import re
+
+
+_TOKEN = re.compile(r"\w+")
+
+
+def search_terms(text: str) -> list[str]:
+    """Word tokens of free text, lower-cased."""
+    return [token.casefold() for token in _TOKEN.findall(text)]
+
+
+def fts_query(text: str, match_any: bool = False, prefix: bool = True) -> str | None:
+    """Build an FTS5 MATCH expression from user input, or None if it has no words.
+
+    Every term is quoted, so FTS5 operators and punctuation in the input are
+    taken literally instead of raising syntax errors. Terms are ANDed unless
+    ``match_any``; with ``prefix`` the last term also matches as a prefix,
+    so partially typed words still find results.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    if prefix:
+        quoted[-1] += "*"
+    return (" OR " if match_any else " ").join(quoted)
+
+
+def text_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the word sets of two texts, 0.0 to 1.0."""
+    a_terms, b_terms = set(search_terms(a)), set(search_terms(b))
+    if not a_terms or not b_terms:
+        return 0.0
+    return len(a_terms & b_terms) / len(a_terms | b_terms)
@@ -0,0 +1,34 @@
+-- Full-text index over Questions.question_text (GET /questions/search).
+-- External content table: the text lives only in Questions, the triggers
+-- keep the index in step. Bulk loads drop the triggers and rebuild the
+-- index once afterwards (see migrations.py and load.py).
+
+CREATE VIRTUAL TABLE IF NOT EXISTS QuestionsSearch USING fts5(
+    question_text,
+    content = 'Questions',
+    content_rowid = 'question_id',
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_questions_search_insert
+AFTER INSERT ON Questions
+BEGIN
+    INSERT INTO QuestionsSearch (rowid, question_text)
+    VALUES (new.question_id, new.question_text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_questions_search_delete
+AFTER DELETE ON Questions
+BEGIN
+    INSERT INTO QuestionsSearch (QuestionsSearch, rowid, question_text)
+    VALUES ('delete', old.question_id, old.question_text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_questions_search_update
+AFTER UPDATE OF question_text ON Questions
+BEGIN
+    INSERT INTO QuestionsSearch (QuestionsSearch, rowid, question_text)
+    VALUES ('delete', old.question_id, old.question_text);
+    INSERT INTO QuestionsSearch (rowid, question_text)
+    VALUES (new.question_id, new.question_text);
+END;
@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable
+from backend.conf import Config
+
+
+class SeenBitmap:
+    """Set of question_ids stored as one bit per id.
+
+    Question ids are dense autoincrement integers, so a user who has seen
+    thousands of questions costs a few hundred bytes instead of a set of ints.
+    Supports ``in``, so it can be passed straight to ``QuestionIndex.sample``.
+    """
+
+    __slots__ = ('_bits', '_count')
+
+    def __init__(self, question_ids: Iterable[int] = ()):
+        self._bits = bytearray()
+        self._count = 0
+        for question_id in question_ids:
+            self.add(question_id)
+
+    def add(self, question_id: int):
+        byte, bit = divmod(question_id, 8)
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte - len(self._bits) + 1))
+        if not self._bits[byte] & (1 << bit):
+            self._bits[byte] |= 1 << bit
+            self._count += 1
+
+    def discard(self, question_id: int):
+        byte, bit = divmod(question_id, 8)
+        if byte < len(self._bits) and self._bits[byte] & (1 << bit):
+            self._bits[byte] &= ~(1 << bit) & 0xFF
+            self._count -= 1
+
+    def copy(self) -> "SeenBitmap":
+        bitmap = SeenBitmap()
+        bitmap._bits = bytearray(self._bits)
+        bitmap._count = self._count
+        return bitmap
+
+    def __or__(self, question_ids: Iterable[int]) -> "SeenBitmap":
+        bitmap = self.copy()
+        for question_id in question_ids:
+            bitmap.add(question_id)
+        return bitmap
+
+    def __contains__(self, question_id: int) -> bool:
+        byte, bit = divmod(question_id, 8)
+        return 0 <= byte < len(self._bits) and bool(self._bits[byte] & (1 << bit))
+
+    def __iter__(self):
+        for byte, value in enumerate(self._bits):
+            if value:
+                for bit in range(8):
+                    if value & (1 << bit):
+                        yield byte * 8 + bit
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class SeenQuestions:
+    """Per-user SeenBitmaps, loaded lazily and kept for the ``maxsize`` most recent users.
+
+    ``loader`` returns the question_ids a user has already answered; it runs
+    once per user until the bitmap is evicted. Answers recorded while the
+    bitmap is loaded are added with ``mark``.
+    """
+
+    def __init__(self, loader: Callable[[int], Iterable[int]], maxsize: int = Config.SEEN_QUESTIONS_CACHE_SIZE):
+        self._loader = loader
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._users: OrderedDict[int, SeenBitmap] = OrderedDict()
+
+    def get(self, user_id: int) -> SeenBitmap:
+        with self._lock:
+            bitmap = self._users.get(user_id)
+            if bitmap is not None:
+                self._users.move_to_end(user_id)
+                return bitmap
+
+        bitmap = SeenBitmap(self._loader(user_id))
+        with self._lock:
+            # Keep whichever bitmap was stored first, it may already have marks
+            bitmap = self._users.setdefault(user_id, bitmap)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self._maxsize:
+                self._users.popitem(last=False)
+            return bitmap
+
+    def mark(self, user_id: int, question_id: int):
+        bitmap = self.get(user_id)
+        with self._lock:
+            bitmap.add(question_id)
+
+    def discard_question(self, question_id: int):
+        """Forget a deleted question for every loaded user."""
+        with self._lock:
+            for bitmap in self._users.values():
+                bitmap.discard(question_id)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._users
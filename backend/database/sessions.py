@@ -0,0 +1,291 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from backend.conf import Config
+from backend.database.db import TriviaDatabaseManager
+from backend.database.leaderboard import Leaderboard
+from backend.schemas import Question, QuestionResponse, RoundAnswerResult, RoundInfo, RoundStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RoundSession:
+    """In-memory state of a live round."""
+    round_id: int
+    user_id: int
+    question_ids: list[int]
+    current_index: int
+    round_status: RoundStatus
+    last_access: float = field(default_factory=time.monotonic)
+    # (round_id, question_id, user_id, answer_text, answered_correctly) rows not yet written
+    pending_answers: list[tuple[int, int, int, str, bool]] = field(default_factory=list)
+    dirty: bool = False
+
+    def info(self) -> RoundInfo:
+        return RoundInfo(
+            round_id=self.round_id,
+            user_id=self.user_id,
+            round_status=self.round_status,
+            current_index=self.current_index,
+            question_count=len(self.question_ids)
+        )
+
+
+class RoundSessionStore:
+    """Serves live rounds from memory and persists their answers write-behind.
+
+    Sessions are loaded from SQLite on first access. Answers are buffered
+    and written in batched transactions by a background flusher, every
+    ``flush_interval`` seconds or once ``flush_batch_size`` answers are
+    pending. A round is flushed synchronously when it completes (or, if that
+    write fails, kept for the flusher to retry) and every session is flushed
+    on ``close()``, so finished rounds are always durable.
+    Sessions idle for longer than ``idle_timeout`` are flushed and evicted.
+
+    When given a ``leaderboard``, each answer also updates the user's
+    aggregates in memory. Those aggregates are persisted in the same flush
+    transaction and reconciled against the stored round answers every
+    ``reconcile_interval`` seconds.
+
+    With ``write_through`` (several worker processes share the database)
+    nothing is held in memory: every call goes to the database, and answers
+    use the optimistic ``answer_round_question`` so a round answered from
+    two workers cannot advance twice. The leaderboard then only picks up
+    other workers' answers at reconciliation, and its aggregates are not
+    written on flush, because one worker's partial view would overwrite
+    another's.
+    """
+
+    def __init__(self,
+                 db: TriviaDatabaseManager,
+                 flush_interval: float = Config.ROUND_FLUSH_INTERVAL,
+                 flush_batch_size: int = Config.ROUND_FLUSH_BATCH_SIZE,
+                 idle_timeout: float = Config.ROUND_SESSION_IDLE_TIMEOUT,
+                 leaderboard: Leaderboard | None = None,
+                 reconcile_interval: float = Config.LEADERBOARD_RECONCILE_INTERVAL,
+                 write_through: bool = False
+    ):
+        self._db = db
+        self._write_through = write_through
+        self._leaderboard = leaderboard
+        self._reconcile_interval = reconcile_interval
+        self._last_reconcile = time.monotonic()
+        self._flush_interval = flush_interval
+        self._flush_batch_size = flush_batch_size
+        self._idle_timeout = idle_timeout
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()  # One flush transaction at a time
+        self._sessions: dict[int, RoundSession] = {}
+        self._pending = 0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def start(self):
+        """Start the background flusher thread."""
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        self._stopped.clear()
+        self._flusher = threading.Thread(target=self._run, name="round-session-flusher", daemon=True)
+        self._flusher.start()
+
+    def close(self):
+        """Stop the flusher and flush every session."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                self.evict_idle()
+                if time.monotonic() - self._last_reconcile >= self._reconcile_interval:
+                    self.reconcile()
+            except Exception:
+                logger.exception("Round session flush failed, will retry")
+
+    def get(self, round_id: int) -> RoundSession:
+        """The session for a round, loading it from the database on first access."""
+        with self._lock:
+            session = self._sessions.get(round_id)
+            if session is not None:
+                session.last_access = time.monotonic()
+                return session
+
+        round_info, question_ids = self._db.load_round(round_id)  # ValueError if missing
+        with self._lock:
+            # Another thread may have loaded it meanwhile; keep the first one
+            session = self._sessions.setdefault(round_id, RoundSession(
+                round_id=round_info.round_id,
+                user_id=round_info.user_id,
+                question_ids=question_ids,
+                current_index=round_info.current_index,
+                round_status=round_info.round_status or RoundStatus.IN_PROGRESS
+            ))
+            session.last_access = time.monotonic()
+            return session
+
+    def get_round(self, round_id: int) -> RoundInfo:
+        if self._write_through:
+            return self._db.get_round_by_id(round_id)
+        return self.get(round_id).info()
+
+    def current_question(self, round_id: int) -> Question | None:
+        """The round's current question, or None once the round is complete."""
+        if self._write_through:
+            self._db.get_round_by_id(round_id)  # ValueError if missing
+            return self._db.get_round_current_unanswered_question(round_id)
+
+        session = self.get(round_id)
+        with self._lock:
+            if session.current_index >= len(session.question_ids):
+                return None
+            question_id = session.question_ids[session.current_index]
+
+        questions = self._db.get_question_by_id(question_id)
+        return questions[0] if questions else None
+
+    def answer(self, round_id: int, response: QuestionResponse) -> RoundAnswerResult:
+        """Grade and buffer the answer to the current question, advancing the round."""
+        if self._write_through:
+            return self._answer_write_through(round_id, response)
+
+        session = self.get(round_id)
+        answered_correctly, correct_answer = self._db.grade_answer(response.question_id, response.text)
+
+        with self._lock:
+            if session.current_index >= len(session.question_ids):
+                raise ValueError(f"Round {round_id} is already complete")
+            if session.question_ids[session.current_index] != response.question_id:
+                raise ValueError(
+                    f"Question {response.question_id} is not the current question of round {round_id}"
+                )
+
+            session.pending_answers.append(
+                (round_id, response.question_id, session.user_id, response.text, answered_correctly)
+            )
+            session.current_index += 1
+            if session.current_index >= len(session.question_ids):
+                session.round_status = RoundStatus.COMPLETED
+            session.dirty = True
+            self._pending += 1
+            if self._leaderboard is not None:
+                bucket = self._db.get_question_bucket(response.question_id)
+                self._leaderboard.record_answer(
+                    session.user_id, bucket[0] if bucket else None, answered_correctly
+                )
+            completed = session.round_status == RoundStatus.COMPLETED
+            result = RoundAnswerResult(
+                round_id=round_id,
+                question_id=response.question_id,
+                answered_correctly=answered_correctly,
+                correct_answer=correct_answer,
+                current_index=session.current_index,
+                round_status=session.round_status
+            )
+
+        self._db.mark_question_seen(session.user_id, response.question_id)
+        if completed:
+            try:
+                self.flush([round_id])
+            except Exception:
+                # The answer stands in memory; the flusher retries the write and evicts the round later
+                logger.exception("Flushing completed round %s failed, will retry", round_id)
+                self._wakeup.set()
+            else:
+                with self._lock:
+                    self._sessions.pop(round_id, None)
+        elif self._pending >= self._flush_batch_size:
+            self._wakeup.set()
+
+        return result
+
+    def _answer_write_through(self, round_id: int, response: QuestionResponse) -> RoundAnswerResult:
+        result = self._db.answer_round_question(round_id, response)
+        if self._leaderboard is not None:
+            user_id = self._db.get_round_by_id(round_id).user_id
+            bucket = self._db.get_question_bucket(response.question_id)
+            self._leaderboard.record_answer(user_id, bucket[0] if bucket else None, result.answered_correctly)
+        return result
+
+    def flush(self, round_ids: list[int] | None = None):
+        """Write pending answers and round progress in one transaction."""
+        with self._flush_lock:
+            with self._lock:
+                sessions = (
+                    [self._sessions[i] for i in round_ids if i in self._sessions]
+                    if round_ids is not None else list(self._sessions.values())
+                )
+                taken = []
+                rounds = []
+                for session in sessions:
+                    if session.dirty:
+                        taken.append((session, session.pending_answers))
+                        rounds.append((session.round_id, session.current_index, session.round_status))
+                        session.pending_answers = []
+                        session.dirty = False
+
+            if not taken:
+                return
+
+            answers = [answer for _, session_answers in taken for answer in session_answers]
+            user_stats = (
+                self._leaderboard.take_dirty()
+                if self._leaderboard is not None and not self._write_through else []
+            )
+            try:
+                self._db.save_round_progress(answers, rounds, user_stats)
+            except BaseException:
+                with self._lock:  # Put the rows back so the next flush retries them
+                    for session, session_answers in taken:
+                        session.pending_answers = session_answers + session.pending_answers
+                        session.dirty = True
+                if self._leaderboard is not None:
+                    self._leaderboard.mark_dirty(record.user_id for record in user_stats)
+                raise
+
+            with self._lock:
+                self._pending -= len(answers)
+
+    def reconcile(self):
+        """Rebuild leaderboard aggregates from the answers stored with each round.
+
+        Answers that arrive while this runs are corrected by the next run.
+        """
+        if self._leaderboard is None:
+            return
+        try:
+            self.flush()
+            self._leaderboard.load(self._db.reconcile_user_stats())
+        finally:
+            self._last_reconcile = time.monotonic()  # A failed run waits a full interval too
+
+    def evict_idle(self):
+        """Flush and drop sessions that have not been touched for ``idle_timeout`` seconds."""
+        cutoff = time.monotonic() - self._idle_timeout
+        with self._lock:
+            idle = [i for i, session in self._sessions.items() if session.last_access < cutoff]
+        if not idle:
+            return
+
+        self.flush(idle)
+        with self._lock:
+            for round_id in idle:
+                session = self._sessions.get(round_id)
+                if session is not None and not session.dirty and session.last_access < cutoff:
+                    del self._sessions[round_id]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, round_id: int) -> bool:
+        return round_id in self._sessions
@@ -0,0 +1,217 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable
+from backend.database.index import BucketKey, QuestionIndex
+from backend.schemas import CategoryChoices, DifficultyChoices, Question
+from backend.serialization import question_from_row
+
+
+# Codes stored in the snapshot are positions in these tuples; bump FORMAT_VERSION if the enums change
+CATEGORIES = tuple(category.value for category in CategoryChoices)
+DIFFICULTIES = tuple(difficulty.value for difficulty in DifficultyChoices)
+_CATEGORY_CODES = {value: code for code, value in enumerate(CATEGORIES)}
+_DIFFICULTY_CODES = {value: code for code, value in enumerate(DIFFICULTIES)}
+
+MAGIC = b"TRIVSNAP"
+FORMAT_VERSION = 2
+# magic, format version, schema version (PRAGMA user_version), source database, change_id,
+# questions, text bytes, answer bytes
+_HEADER = struct.Struct("=8sII16sqqqq")
+
+
+def source_id(db_path: str) -> bytes:
+    """Identity of a database file: its path and inode, so a different or replaced file never matches."""
+    stat = os.stat(db_path)
+    identity = f"{os.path.realpath(db_path)}:{stat.st_dev}:{stat.st_ino}"
+    return hashlib.blake2b(identity.encode(), digest_size=16).digest()
+
+
+def _expected_size(count: int, text_size: int, answer_size: int) -> int:
+    return _HEADER.size + 8 * count + 2 * 8 * (count + 1) + 2 * count + text_size + answer_size
+
+
+class QuestionSnapshot:
+    """Read-only columnar copy of the Questions table and its correct answers.
+
+    Rows are stored in question_id order as parallel columns over a single
+    buffer: ids and text/answer offsets (int64), category and difficulty
+    codes (one byte each), then the UTF-8 texts back to back. The buffer is
+    either built in memory or a memory-mapped file written by ``save``, in
+    which case every worker process shares the same pages.
+
+    Lookups by id are a binary search over ``ids``; filtered listings use
+    per-bucket position arrays built when the snapshot is opened. A snapshot
+    never changes, so readers need no lock: writers build a new one and swap
+    the reference.
+    """
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError("Truncated question snapshot")
+        (
+            magic, format_version, self.schema_version, self.source,
+            self.change_id, count, text_size, answer_size
+        ) = _HEADER.unpack_from(view)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError("Not a question snapshot, or written by an incompatible version")
+        if len(view) != _expected_size(count, text_size, answer_size):
+            raise ValueError("Truncated or corrupt question snapshot")
+
+        offset = _HEADER.size
+        columns = []
+        for fmt, length in (("q", count), ("q", count + 1), ("q", count + 1), ("B", count), ("B", count)):
+            size = length * struct.calcsize(fmt)
+            columns.append(view[offset:offset + size].cast(fmt))
+            offset += size
+        self._ids, self._text_offsets, self._answer_offsets, self._categories, self._difficulties = columns
+        self._text = view[offset:offset + text_size]
+        self._answers = view[offset + text_size:offset + text_size + answer_size]
+
+        self._buffer = buffer  # Keeps an mmap open for as long as the snapshot is in use
+        self._buckets = self._build_buckets()
+
+    def _build_buckets(self) -> dict[BucketKey, array]:
+        buckets: dict[BucketKey, array] = {}
+        for position, (category, difficulty) in enumerate(zip(self._categories, self._difficulties)):
+            for key in QuestionIndex.covering_keys(CATEGORIES[category], DIFFICULTIES[difficulty]):
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = array("I")
+                bucket.append(position)
+        return buckets
+
+    @classmethod
+    def from_rows(cls,
+        questions: Iterable[tuple[int, str, str, str]],
+        answers: Iterable[tuple[int, str]],
+        change_id: int = 0,
+        source: bytes = bytes(16),
+        schema_version: int = 0
+    ) -> "QuestionSnapshot":
+        """Build a snapshot from (question_id, category, difficulty, question_text) rows in id order
+        and (question_id, answer_text) rows of correct answers; the first answer per question is kept.
+
+        ``source`` (see ``source_id``) and ``schema_version`` identify the database the rows came from.
+        """
+        correct: dict[int, bytes] = {}
+        for question_id, answer_text in answers:
+            correct.setdefault(question_id, answer_text.encode())
+
+        ids, categories, difficulties = array("q"), array("B"), array("B")
+        text_offsets, answer_offsets = array("q", [0]), array("q", [0])
+        text, answer_text = bytearray(), bytearray()
+        for question_id, category, difficulty, question_text in questions:
+            ids.append(question_id)
+            categories.append(_CATEGORY_CODES[category])
+            difficulties.append(_DIFFICULTY_CODES[difficulty])
+            text += question_text.encode()
+            text_offsets.append(len(text))
+            answer_text += correct.get(question_id, b"")
+            answer_offsets.append(len(answer_text))
+
+        buffer = bytearray(_HEADER.pack(
+            MAGIC, FORMAT_VERSION, schema_version, source, change_id, len(ids), len(text), len(answer_text)
+        ))
+        for column in (ids, text_offsets, answer_offsets, categories, difficulties):
+            buffer += column.tobytes()
+        buffer += text
+        buffer += answer_text
+        return cls(bytes(buffer))
+
+    @classmethod
+    def open(cls,
+        path: str,
+        source: bytes | None = None,
+        schema_version: int | None = None
+    ) -> "QuestionSnapshot":
+        """Memory-map a snapshot written by ``save``.
+
+        Raises ValueError unless the header and file size agree and, when
+        given, the snapshot was built from ``source`` at ``schema_version``.
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError("Truncated question snapshot")
+            magic, format_version, file_schema_version, file_source, _, count, text_size, answer_size = (
+                _HEADER.unpack(header)
+            )
+            if magic != MAGIC or format_version != FORMAT_VERSION:
+                raise ValueError("Not a question snapshot, or written by an incompatible version")
+            if os.fstat(f.fileno()).st_size != _expected_size(count, text_size, answer_size):
+                raise ValueError("Truncated or corrupt question snapshot")
+            if source is not None and file_source != source:
+                raise ValueError("Question snapshot was built from a different database")
+            if schema_version is not None and file_schema_version != schema_version:
+                raise ValueError("Question snapshot was built for a different schema version")
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def save(self, path: str):
+        """Write the snapshot to ``path`` atomically, so concurrent ``open`` calls never see half a file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(memoryview(self._buffer))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _position(self, question_id: int) -> int | None:
+        position = bisect_left(self._ids, question_id)
+        if position < len(self._ids) and self._ids[position] == question_id:
+            return position
+        return None
+
+    def _question(self, position: int) -> Question:
+        start, end = self._text_offsets[position], self._text_offsets[position + 1]
+        return question_from_row((
+            self._ids[position],
+            DIFFICULTIES[self._difficulties[position]],
+            CATEGORIES[self._categories[position]],
+            str(self._text[start:end], "utf-8"),
+        ))
+
+    def get(self, question_id: int) -> Question | None:
+        position = self._position(question_id)
+        return self._question(position) if position is not None else None
+
+    def answer(self, question_id: int) -> str | None:
+        """The stored correct answer, or None for unknown questions and questions without one."""
+        position = self._position(question_id)
+        if position is None:
+            return None
+        start, end = self._answer_offsets[position], self._answer_offsets[position + 1]
+        return str(self._answers[start:end], "utf-8") if end > start else None
+
+    def select(self,
+        category: CategoryChoices | None = None,
+        difficulty: DifficultyChoices | None = None
+    ) -> list[Question]:
+        """Every question matching the filter, in question_id order."""
+        bucket = self._buckets.get(QuestionIndex.bucket_key(category, difficulty), ())
+        return [self._question(position) for position in bucket]
+
+    def page(self,
+        category: CategoryChoices | None = None,
+        difficulty: DifficultyChoices | None = None,
+        after: int | None = None,
+        limit: int = 100
+    ) -> list[Question]:
+        """Up to ``limit`` matching questions with question_id > ``after``, as get_questions_page."""
+        bucket = self._buckets.get(QuestionIndex.bucket_key(category, difficulty), ())
+        start = bisect_right(bucket, after, key=self._ids.__getitem__) if after is not None else 0
+        return [self._question(position) for position in bucket[start:start + limit]]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, question_id: int) -> bool:
+        return self._position(question_id) is not None
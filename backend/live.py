@@ -0,0 +1,303 @@
+import asyncio
+import itertools
+import json
+import logging
+from dataclasses import dataclass, field
+from backend.conf import Config
+from backend.database.async_db import AsyncTriviaDatabaseManager
+from backend.database.sessions import RoundSessionStore
+from backend.schemas import (
+    CategoryChoices, DifficultyChoices, LiveGameInfo, LiveGameStatus, LivePlayer, QuestionResponse,
+    RoundAnswerResult
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Event:
+    """A message for subscribers, encoded once however many connections it goes to."""
+    name: str
+    data: str  # JSON
+
+    @classmethod
+    def of(cls, name: str, **data) -> "Event":
+        return cls(name, json.dumps({"event": name, **data}))
+
+
+class Subscription:
+    """One connection's queue of pending events; ``None`` in the queue means the stream is over."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue[Event | None] = asyncio.Queue(maxsize)
+
+    def push(self, event: Event) -> bool:
+        """Queue ``event``; False (and the stream closed) if the connection is too far behind."""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.close()
+            return False
+
+    def close(self):
+        """End the stream after the events already queued, or right away if it is too far behind."""
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def __aiter__(self):
+        while (event := await self.queue.get()) is not None:
+            yield event
+
+
+@dataclass
+class LiveGame:
+    game_id: int
+    host_user_id: int
+    question_ids: list[int]
+    status: LiveGameStatus = LiveGameStatus.LOBBY
+    current_index: int = -1
+    players: dict[int, int] = field(default_factory=dict)  # user_id -> round_id
+    scores: dict[int, int] = field(default_factory=dict)  # user_id -> correct answers
+    answers: dict[int, bool] = field(default_factory=dict)  # user_id -> correct, for the open question
+    subscriptions: set[Subscription] = field(default_factory=set)
+    question: dict | None = None  # The open question as pushed to players
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # Serializes opening and closing questions
+
+    def info(self) -> LiveGameInfo:
+        return LiveGameInfo(
+            game_id=self.game_id,
+            host_user_id=self.host_user_id,
+            status=self.status,
+            current_index=self.current_index,
+            question_count=len(self.question_ids),
+            players=len(self.players)
+        )
+
+    def standings(self) -> list[dict]:
+        return [
+            {"user_id": user_id, "correct": correct}
+            for user_id, correct in sorted(self.scores.items(), key=lambda item: (-item[1], item[0]))
+        ]
+
+
+class LiveGameHub:
+    """In-process broadcast hub for host-driven games played by many players at once.
+
+    The host opens each question and the hub pushes it, and later its
+    results, to every subscribed connection: one encoded event per question
+    instead of every player polling. Each player gets an ordinary round over
+    the game's questions, so answers go through the RoundSessionStore and
+    are written in its batched flushes, and count towards the leaderboard.
+    A question closes when every player has answered or the host moves on;
+    players who did not answer are recorded with an empty (wrong) answer.
+
+    Games live in the memory of the worker that created them, so with
+    several workers clients of one game must reach the same worker.
+    All methods run on the event loop.
+    """
+
+    def __init__(self,
+                 db: AsyncTriviaDatabaseManager,
+                 sessions: RoundSessionStore,
+                 max_players: int = Config.LIVE_GAME_MAX_PLAYERS,
+                 queue_size: int = Config.LIVE_EVENT_QUEUE_SIZE
+    ):
+        self._db = db
+        self._sessions = sessions
+        self._max_players = max_players
+        self._queue_size = queue_size
+        self._games: dict[int, LiveGame] = {}
+        self._ids = itertools.count(1)
+
+    def get(self, game_id: int) -> LiveGame:
+        game = self._games.get(game_id)
+        if game is None:
+            raise ValueError(f"No live game found with id: {game_id}")
+        return game
+
+    async def create(self,
+        host_user_id: int,
+        size: int = Config.ROUND_SIZE,
+        category: CategoryChoices | None = None,
+        difficulty: DifficultyChoices | None = None
+    ) -> LiveGameInfo:
+        question_ids = await self._db.pick_questions(size, category, difficulty)
+        if not question_ids:
+            raise ValueError("No questions match the given filters")
+
+        game = LiveGame(game_id=next(self._ids), host_user_id=host_user_id, question_ids=question_ids)
+        self._games[game.game_id] = game
+        return game.info()
+
+    async def join(self, game_id: int, user_id: int) -> LivePlayer:
+        """Add a player, creating their round; joining again returns the same round.
+
+        Questions already asked are recorded as missed, so the player's round
+        lines up with the game.
+        """
+        game = self.get(game_id)
+        if user_id not in game.players:
+            if game.status == LiveGameStatus.FINISHED:
+                raise ValueError(f"Live game {game_id} is finished")
+            if len(game.players) >= self._max_players:
+                raise ValueError(f"Live game {game_id} is full")
+
+            round_info = await self._db.create_round(user_id, question_ids=game.question_ids)  # ValueError: no user
+            if user_id not in game.players:  # Not joined concurrently while the round was created
+                game.players[user_id] = round_info.round_id
+                game.scores[user_id] = 0
+                closed = game.current_index + (game.status == LiveGameStatus.RESULTS)
+                closed = max(closed, 0)  # Questions closed before this player arrived
+                await self._db.run(self._record_missed, [round_info.round_id], game.question_ids[:closed])
+                self._publish(game, Event.of("player_joined", user_id=user_id, players=len(game.players)))
+
+        return LivePlayer(game_id=game_id, user_id=user_id, round_id=game.players[user_id])
+
+    def subscribe(self, game_id: int) -> Subscription:
+        """Stream of the game's events, starting with its current state and open question."""
+        game = self.get(game_id)
+        subscription = Subscription(self._queue_size)
+        subscription.push(Event.of("state", game=game.info().model_dump(mode="json"), standings=game.standings()))
+        if game.question is not None:
+            subscription.push(Event.of("question", **game.question))
+        game.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, game_id: int, subscription: Subscription):
+        game = self._games.get(game_id)
+        if game is not None:
+            game.subscriptions.discard(subscription)
+
+    async def advance(self, game_id: int, host_user_id: int) -> LiveGameInfo:
+        """Host action: close the open question, or else open the next one."""
+        game = self.get(game_id)
+        if host_user_id != game.host_user_id:
+            raise PermissionError(f"Only the host can advance live game {game_id}")
+        async with game.lock:
+            if game.status == LiveGameStatus.FINISHED:
+                raise ValueError(f"Live game {game_id} is finished")
+
+            if game.status == LiveGameStatus.QUESTION:
+                await self._close_question(game)  # Finishes the game after the last question
+            else:
+                await self._open_question(game)
+            return game.info()
+
+    async def answer(self,
+        game_id: int,
+        user_id: int,
+        text: str,
+        reply_to: Subscription | None = None
+    ) -> RoundAnswerResult:
+        """Grade a player's answer to the open question.
+
+        ``reply_to`` (the player's own stream) gets the graded result ahead
+        of any results event the answer triggers.
+        """
+        game = self.get(game_id)
+        round_id = game.players.get(user_id)
+        if round_id is None:
+            raise ValueError(f"User {user_id} has not joined live game {game_id}")
+        if game.status != LiveGameStatus.QUESTION:
+            raise ValueError(f"No question is open in live game {game_id}")
+        if user_id in game.answers:
+            raise ValueError(f"User {user_id} already answered this question")
+
+        index = game.current_index
+        game.answers[user_id] = False  # Claimed before awaiting, so a second answer is rejected
+        response = QuestionResponse(question_id=game.question_ids[index], text=text)
+        try:
+            result = await self._db.run(self._sessions.answer, round_id, response)
+        except Exception:
+            del game.answers[user_id]
+            raise
+
+        game.answers[user_id] = result.answered_correctly
+        game.scores[user_id] += result.answered_correctly
+        if reply_to is not None:
+            reply_to.push(Event.of("answer_result", **result.model_dump(mode="json")))
+        async with game.lock:
+            # The host may have closed this question, or moved on, while the answer was graded
+            if (
+                game.status == LiveGameStatus.QUESTION
+                and game.current_index == index
+                and len(game.answers) == len(game.players)
+            ):
+                await self._close_question(game)
+        return result
+
+    async def _open_question(self, game: LiveGame):
+        """Callers hold ``game.lock``."""
+        game.current_index += 1
+        game.status = LiveGameStatus.QUESTION
+        game.answers = {}
+        question_id = game.question_ids[game.current_index]
+        questions = await self._db.get_question_by_id(question_id)
+        game.question = {
+            "game_id": game.game_id,
+            "index": game.current_index,
+            "question_count": len(game.question_ids),
+            # Deleted since the game was created; players can still answer it
+            "question": questions[0].model_dump() if questions else {"question_id": question_id},
+        }
+        self._publish(game, Event.of("question", **game.question))
+
+    async def _close_question(self, game: LiveGame):
+        """Score the open question; a no-op once it is closed. Callers hold ``game.lock``."""
+        if game.status != LiveGameStatus.QUESTION:
+            return
+        question_id = game.question_ids[game.current_index]
+        game.status = LiveGameStatus.RESULTS
+        game.question = None
+        missed = [round_id for user_id, round_id in game.players.items() if user_id not in game.answers]
+        await self._db.run(self._record_missed, missed, [question_id])
+
+        _, correct_answer = self._db.sync.grade_answer(question_id, "")
+        self._publish(game, Event.of(
+            "results",
+            game_id=game.game_id,
+            index=game.current_index,
+            question_id=question_id,
+            correct_answer=correct_answer,
+            answered=len(game.answers),
+            correct=sum(game.answers.values()),
+            standings=game.standings()
+        ))
+        if game.current_index + 1 == len(game.question_ids):
+            self._finish(game)
+
+    def _finish(self, game: LiveGame):
+        game.status = LiveGameStatus.FINISHED
+        self._publish(game, Event.of("finished", game_id=game.game_id, standings=game.standings()))
+        for subscription in game.subscriptions:
+            subscription.close()
+        game.subscriptions.clear()
+        self._games.pop(game.game_id, None)
+
+    def _record_missed(self, round_ids: list[int], question_ids: list[int]):
+        """Answer for players who didn't. One player's broken round mustn't hold up the game."""
+        for round_id in round_ids:
+            try:
+                for question_id in question_ids:
+                    self._sessions.answer(round_id, QuestionResponse(question_id=question_id, text=""))
+            except Exception:
+                logger.exception("Recording missed questions %s for round %s failed", question_ids, round_id)
+
+    def _publish(self, game: LiveGame, event: Event):
+        for subscription in list(game.subscriptions):
+            if not subscription.push(event):
+                game.subscriptions.discard(subscription)
+
+    def close(self):
+        """End every stream, e.g. on shutdown."""
+        for game in self._games.values():
+            for subscription in game.subscriptions:
+                subscription.close()
+            game.subscriptions.clear()
+
+    def __len__(self) -> int:
+        return len(self._games)
@@ -1,22 +1,304 @@
+import argparse
+import asyncio
+import csv
+import io
+import math
+import os
+import time
 import uvicorn
-from fastapi import FastAPI, Request, Query, HTTPException, status, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, Query, HTTPException, status, Form, WebSocket, WebSocketDisconnect, Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse, PlainTextResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import EmailStr
+from itertools import islice
 from typing import Annotated
 from backend.conf import Config
-from backend.schemas import CategoryChoices, DifficultyChoices, Question, QuestionResponse, RoundInfo
-from backend.database.db import TriviaDatabaseManager
-
-app = FastAPI()
+from backend.schemas import CategoryChoices, DifficultyChoices, Question, QuestionResponse, AnswerResult, DuplicateQuestion, QuestionBatchRequest, QuestionBatch, AnswerCheckBatchRequest, AnswerCheckBatch, RoundInfo, RoundAnswerResult, LeaderboardEntry, CategoryStats, UserStats, LiveGameInfo, LivePlayer, LiveAnswer, AuthLogin, AuthToken, BulkResult, QuestionStats
+from backend.auth import AuthBusyError, AuthenticationError, Authenticator, TokenClaims
+from backend.database.async_db import AsyncTriviaDatabaseManager
+from backend.database.changes import ChangeWatcher
+from backend.database.leaderboard import Leaderboard
+from backend.database.load import iter_records
+from backend.database.sessions import RoundSessionStore
+from backend.live import Event, LiveGame, LiveGameHub
+from backend.metrics import REGISTRY
+from backend.ratelimit import ConcurrencyLimiter, TokenBuckets
+from backend.serialization import encode_questions
+from starlette.routing import Match
+
+db = AsyncTriviaDatabaseManager()
+leaderboard = Leaderboard()
+leaderboard.load(db.sync.load_user_stats())
+# Worker processes cannot see each other's buffered round state
+round_sessions = RoundSessionStore(db.sync, leaderboard=leaderboard, write_through=Config.WORKERS > 1)
+authenticator = Authenticator(db)
+change_watcher = ChangeWatcher(db.sync, db.sync.db_path, listeners=[authenticator.sync_revocations])
+live_games = LiveGameHub(db, round_sessions)
+ip_rate_limits = TokenBuckets(Config.RATE_LIMIT_IP_RATE, Config.RATE_LIMIT_IP_BURST, Config.RATE_LIMIT_MAX_CLIENTS)
+user_rate_limits = TokenBuckets(Config.RATE_LIMIT_USER_RATE, Config.RATE_LIMIT_USER_BURST, Config.RATE_LIMIT_MAX_CLIENTS)
+admission = ConcurrencyLimiter(
+    Config.MAX_CONCURRENT_REQUESTS, Config.ADMISSION_QUEUE_SIZE, Config.ADMISSION_QUEUE_TIMEOUT
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await db.warm_up()
+    await db.sync_changes()  # Writes made by other workers while this one was starting
+    await db.run(authenticator.sync_revocations)
+    change_watcher.start()
+    round_sessions.start()
+    yield
+    live_games.close()
+    round_sessions.close()  # Flush buffered answers before the pool goes away
+    change_watcher.close()
+    authenticator.close()
+    db.close()
+
+
+app = FastAPI(lifespan=lifespan)
 templates = Jinja2Templates(directory='backend/templates') # TODO update path
 url = "https://trivial.pub"
 
-db = TriviaDatabaseManager()
+# GET routes whose responses only change when the question bank does
+CACHEABLE_PREFIXES = ("/questions", "/answers/")
+UNCACHEABLE_PATHS = {"/questions/random"}
+
+
+def is_cacheable(request: Request) -> bool:
+    path = request.url.path
+    return (
+        request.method in ("GET", "HEAD")
+        and path.startswith(CACHEABLE_PREFIXES)
+        and path not in UNCACHEABLE_PATHS
+    )
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or etag.removeprefix("W/") in tags
+
+
+def current_etag() -> str:
+    return f'W/"{db.question_bank_version}"'
+
+
+def is_revalidated(request: Request, etag: str) -> bool:
+    """Whether the client's cached copy is current, so conditional_get answers with a 304."""
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and etag_matches(if_none_match, etag)
+
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """ETag/Cache-Control for question reads, with 304s that skip the database.
+
+    The ETag is the question bank version, read before the handler runs,
+    so a write that lands mid-request only costs the client a refetch.
+    """
+    if not is_cacheable(request):
+        return await call_next(request)
+
+    etag = current_etag()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={Config.HTTP_CACHE_MAX_AGE}, must-revalidate"
+    }
+    if is_revalidated(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response = await call_next(request)
+    if response.status_code == status.HTTP_200_OK:
+        response.headers.update(headers)
+    return response
+
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "trivia_http_request_seconds",
+    "HTTP request latency by route template, method and status code.",
+    ("method", "route", "status")
+)
+
+
+def match_route(request: Request) -> tuple[str, dict]:
+    """(path template, path params) of the route a request goes to, before or after routing."""
+    route = request.scope.get("route")
+    if route is not None:
+        return route.path, request.scope.get("path_params", {})
+    for route in app.router.routes:  # Answered by middleware before routing, e.g. a 304
+        match, child_scope = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path, child_scope.get("path_params", {})
+    return "unmatched", {}
+
+
+def route_template(request: Request) -> str:
+    """The matched route's path template, so /questions/1 and /questions/2 share a series."""
+    return match_route(request)[0]
+
+
+def rejection(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+def request_cost(request: Request, template: str) -> float:
+    """Tokens a request spends: its route's cost, less for pages of paged routes and for revalidations ending in a 304."""
+    cost = Config.RATE_LIMIT_ROUTE_COSTS.get(template, 1)
+    if is_cacheable(request) and is_revalidated(request, current_etag()):
+        return min(cost, Config.RATE_LIMIT_REVALIDATION_COST)
+
+    params = request.query_params
+    if template in Config.RATE_LIMIT_PAGED_ROUTES and ("limit" in params or "after" in params):
+        try:
+            limit = int(params.get("limit") or Config.QUESTION_PAGE_SIZE)
+        except ValueError:
+            limit = Config.QUESTION_PAGE_SIZE  # Rejected with a 422 later on
+        pages = max(limit, 1) / Config.QUESTION_PAGE_SIZE
+        return min(cost, max(1.0, Config.RATE_LIMIT_PAGE_COST * pages))
+    return cost
+
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Token buckets per client IP and per user_id, then a cap on requests in flight.
+
+    Each request spends its ``request_cost`` in tokens, so a full table
+    dump drains a bucket faster than a page or a lookup by id. Requests over a
+    client's rate get a 429 and those over the concurrency cap a 503, both
+    with Retry-After, rather than queueing behind the database. The client
+    IP is the connecting address; run uvicorn with --proxy-headers behind a
+    proxy. user_id is the caller-supplied query or path parameter.
+    """
+    if not Config.RATE_LIMIT_ENABLED or request.url.path in Config.RATE_LIMIT_EXEMPT_PATHS:
+        return await call_next(request)
+
+    template, path_params = match_route(request)
+    cost = request_cost(request, template)
+    client = request.client.host if request.client is not None else "unknown"
+    retry_after = ip_rate_limits.acquire(client, cost)
+    user_id = request.query_params.get("user_id") or path_params.get("user_id")
+    if not retry_after and user_id is not None:
+        retry_after = user_rate_limits.acquire(str(user_id), cost)
+    if retry_after:
+        return rejection(
+            status.HTTP_429_TOO_MANY_REQUESTS, "429: Too Many Requests. Slow down and retry later.", retry_after
+        )
+
+    if not await admission.acquire():
+        return rejection(
+            status.HTTP_503_SERVICE_UNAVAILABLE, "503: Service Unavailable. Server is busy, retry shortly.",
+            Config.ADMISSION_RETRY_AFTER
+        )
+    try:
+        return await call_next(request)
+    finally:
+        admission.release()
+
+
+@app.middleware("http")
+async def record_request_timing(request: Request, call_next):
+    """Per-route latency histogram. Added last, so it runs outermost and times the other middleware too."""
+    started = time.perf_counter()
+    response = await call_next(request)
+    HTTP_REQUEST_SECONDS.observe(
+        time.perf_counter() - started,
+        (request.method, route_template(request), str(response.status_code))
+    )
+    return response
+
+
+def collect_app_metrics():
+    cache = db.sync.cache_stats()
+    yield "trivia_question_cache_requests_total", "counter", "Question cache lookups by result.", [
+        ({"result": "hit"}, cache["hits"]),
+        ({"result": "miss"}, cache["misses"]),
+    ]
+    yield "trivia_question_cache_evictions_total", "counter", "Question cache evictions.", [({}, cache["evictions"])]
+    yield "trivia_question_cache_entries", "gauge", "Entries in the question cache.", [({}, cache["size"])]
+    yield "trivia_db_pool_size", "gauge", "Pooled SQLite connections.", [({}, db.sync.pool_size)]
+    yield "trivia_round_sessions", "gauge", "Live rounds held in memory.", [({}, len(round_sessions))]
+    yield "trivia_leaderboard_users", "gauge", "Users on the leaderboard.", [({}, len(leaderboard))]
+    yield "trivia_live_games", "gauge", "Live games in progress.", [({}, len(live_games))]
+    yield "trivia_requests_in_flight", "gauge", "Requests holding an admission slot.", [({}, admission.in_flight)]
+    yield "trivia_requests_rejected_total", "counter", "Requests turned away by admission control.", [
+        ({"reason": "ip_rate_limit"}, ip_rate_limits.rejected),
+        ({"reason": "user_rate_limit"}, user_rate_limits.rejected),
+        ({"reason": "overloaded"}, admission.rejected),
+    ]
+
+
+REGISTRY.register_collector(collect_app_metrics)
+
+
+PageLimit = Annotated[int | None, Query(ge=1, le=Config.QUESTION_MAX_PAGE_SIZE)]
+PageAfter = Annotated[int | None, Query(ge=0, description="Return questions with question_id greater than this")]
+
+
+bearer = HTTPBearer(auto_error=False)
+
+
+async def current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer)]
+) -> TokenClaims:
+    """Claims of the request's bearer token, verified without touching the database."""
+    try:
+        if credentials is None:
+            raise AuthenticationError("Missing bearer token")
+        return authenticator.verify(credentials.credentials)
+    except AuthenticationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"401: Unauthorized. {e}",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+async def require_admin(claims: Annotated[TokenClaims, Depends(current_user)]) -> TokenClaims:
+    if not claims.admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="403: Forbidden. Admins only.")
+    return claims
+
+
+def questions_json(questions: list[Question], headers: dict[str, str] | None = None) -> Response:
+    """Encode trusted questions straight to JSON bytes.
+
+    Returning a Response skips FastAPI's re-validation of the ``list[Question]``
+    return annotation, which stays in place for the OpenAPI schema.
+    """
+    return Response(encode_questions(questions), media_type="application/json", headers=headers)
+
+
+def require_questions(category: CategoryChoices | None, difficulty: DifficultyChoices | None):
+    """404 for filters no question matches, answered from the in-memory counts without a DB call."""
+    if db.sync.count_questions(category, difficulty) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="404: Not Found. No questions match the given filters."
+        )
+
+
+async def paginate_questions(
+    category: CategoryChoices | None,
+    difficulty: DifficultyChoices | None,
+    after: int | None,
+    limit: int | None
+) -> Response:
+    limit = limit or Config.QUESTION_PAGE_SIZE
+    require_questions(category, difficulty)
+    questions = await db.get_questions_page(category, difficulty, after=after, limit=limit)
+    # Cursor for the next page; absent on the last page
+    headers = {"X-Next-After": str(questions[-1].question_id)} if len(questions) == limit else None
+    return questions_json(questions, headers)
 
 
 @app.get("/")
-def read_root(request: Request):
+async def read_root(request: Request):
     return {
         "api_name": "trivial.pub API",
         "version": "1.0",
@@ -29,132 +311,252 @@ def read_root(request: Request):
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/questions/random")
-def questions_get_random_question(
+async def questions_get_random_question(
     category: CategoryChoices | None = None, 
     difficulty: DifficultyChoices | None = None
 ) -> Question:
-    return db.get_random_question(category=category, difficulty=difficulty)
+    require_questions(category, difficulty)
+    try:
+        return await db.get_random_question(category=category, difficulty=difficulty)
+    except IndexError as e:  # Emptied since the check
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"404: Not Found. {e}")
+
+
+@app.get("/questions/stats")
+async def questions_stats() -> QuestionStats:
+    """Question counts per category and difficulty, including empty combinations."""
+    return db.sync.question_stats()
+
+
+@app.get("/questions/export")
+async def questions_export(
+    category: CategoryChoices | None = None, 
+    difficulty: DifficultyChoices | None = None
+) -> StreamingResponse:
+    """Stream every matching question as NDJSON, one question per line."""
+    async def generate():
+        async for question in db.iter_questions(category=category, difficulty=difficulty):
+            yield question.model_dump_json() + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@app.get("/questions/search")
+async def questions_search(
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    category: CategoryChoices | None = None,
+    difficulty: DifficultyChoices | None = None,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: PageLimit = None
+) -> list[Question]:
+    """Full-text search over question text, best match first."""
+    limit = limit or Config.QUESTION_PAGE_SIZE
+    questions = await db.search_questions(q, category, difficulty, offset=offset, limit=limit)
+    headers = {"X-Next-Offset": str(offset + limit)} if len(questions) == limit else None
+    return questions_json(questions, headers)
+
+
+@app.get("/questions/duplicates")
+async def questions_duplicates(
+    question_text: Annotated[str, Query(min_length=1, max_length=500)]
+) -> list[DuplicateQuestion]:
+    """Existing questions that look like duplicates of ``question_text``, for checking new content."""
+    return [
+        DuplicateQuestion(question=question, similarity=round(similarity, 4))
+        for question, similarity in await db.find_duplicate_questions(question_text)
+    ]
 
 
 @app.get("/questions/category")
-def questions_by_category_query(category: CategoryChoices | None = None) -> list[Question]:
+async def questions_by_category_query(
+    category: CategoryChoices | None = None,
+    after: PageAfter = None,
+    limit: PageLimit = None
+) -> list[Question]:
     if category is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="400: Bad Request. User request must contain a category."
         )
     
-    return db.get_question_by_category(category)
+    if after is not None or limit is not None:
+        return await paginate_questions(category=category, difficulty=None, after=after, limit=limit)
+
+    require_questions(category, None)
+    return questions_json(await db.get_question_by_category(category))
 
 
 @app.get("/questions/category/{category}")
-def questions_by_category_path(category: CategoryChoices | None = None) -> list[Question]:  
+async def questions_by_category_path(
+    category: CategoryChoices | None = None,
+    after: PageAfter = None,
+    limit: PageLimit = None
+) -> list[Question]:  
     if category is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="400: Bad Request. User request must contain a category."
         )
     
-    return db.get_question_by_category(category)
+    if after is not None or limit is not None:
+        return await paginate_questions(category=category, difficulty=None, after=after, limit=limit)
+
+    require_questions(category, None)
+    return questions_json(await db.get_question_by_category(category))
 
 
 @app.get("/questions/difficulty")
-def questions_by_difficulty_query(difficulty: DifficultyChoices | None = None) -> list[Question]:
+async def questions_by_difficulty_query(
+    difficulty: DifficultyChoices | None = None,
+    after: PageAfter = None,
+    limit: PageLimit = None
+) -> list[Question]:
     if difficulty is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="400: Bad Request. Request must contain a difficulty."
         )
     
-    return db.get_question_by_difficulty(difficulty)
+    if after is not None or limit is not None:
+        return await paginate_questions(category=None, difficulty=difficulty, after=after, limit=limit)
+
+    require_questions(None, difficulty)
+    return questions_json(await db.get_question_by_difficulty(difficulty))
 
 
 @app.get("/questions/difficulty/{difficulty}")
-def questions_by_difficulty_path(difficulty: DifficultyChoices | None = None) -> list[Question]:  
+async def questions_by_difficulty_path(
+    difficulty: DifficultyChoices | None = None,
+    after: PageAfter = None,
+    limit: PageLimit = None
+) -> list[Question]:  
     if difficulty is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="400: Bad Request. Request must contain a difficulty."
         )
     
-    return db.get_question_by_difficulty(difficulty)
+    if after is not None or limit is not None:
+        return await paginate_questions(category=None, difficulty=difficulty, after=after, limit=limit)
+
+    require_questions(None, difficulty)
+    return questions_json(await db.get_question_by_difficulty(difficulty))
 
 
 @app.post("/questions/responses/")
-def question_response(question_response: QuestionResponseFormData
-):
+async def question_response(question_response: QuestionResponse) -> AnswerResult:
     if question_response is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="400: Bad Request. Question resonse is required."
         )
     
-    correct_answer = db.get_correct_answer_by_question_id(question_response.question_id)
+    # Graded against the in-memory answer map, no DB round trip
+    answered_correctly, correct_answer = db.sync.grade_answer(
+        question_response.question_id, question_response.text
+    )
+    if correct_answer is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"404: Not Found. No answer for question {question_response.question_id}."
+        )
 
-    if question_response.text == correct_answer:
-        # update user stats (round score, lifetime stats, leaderboard, etc.)
-        # return response
-        pass
-    else:
-        # update user stats
-        # return response (including correct answer)
-        pass
+    # Anonymous practice answer: only round answers, which belong to a user, count towards stats
+    return AnswerResult(
+        question_id=question_response.question_id,
+        answered_correctly=answered_correctly,
+        correct_answer=correct_answer
+    )
 
 
+@app.post("/questions/batch")
+async def questions_batch(request: QuestionBatchRequest) -> QuestionBatch:
+    """Several questions in one call, in request order, with the ids that do not exist."""
+    questions, missing = await db.get_questions_by_ids(request.question_ids)
+    return QuestionBatch(questions=questions, missing=missing)
+
 
 @app.get("/questions/{question_id}")
-def question_by_id(question_id: int):
-    return db.get_question_by_id(question_id)
+async def question_by_id(question_id: int) -> list[Question]:
+    return questions_json(await db.get_question_by_id(question_id))
 
 
 @app.get("/questions")
-def questions_by_query(
+async def questions_by_query(
     category: CategoryChoices | None = None, 
-    difficulty: DifficultyChoices | None = None
+    difficulty: DifficultyChoices | None = None,
+    after: PageAfter = None,
+    limit: PageLimit = None
 ) -> list[Question]:
+    if after is not None or limit is not None:
+        return await paginate_questions(category, difficulty, after=after, limit=limit)
+
+    require_questions(category, difficulty)
     questions = []
     if category and difficulty:
-        questions = db.get_questions_by_category_and_difficulty(category, difficulty)
+        questions = await db.get_questions_by_category_and_difficulty(category, difficulty)
     elif category and difficulty is None:
-        questions = db.get_question_by_category(category)
+        questions = await db.get_question_by_category(category)
     elif difficulty and category is None:
-        questions = db.get_question_by_difficulty(difficulty)
+        questions = await db.get_question_by_difficulty(difficulty)
     else:  # Not category and not difficulty
-        questions = db.get_all_questions()
+        questions = await db.get_all_questions()
 
-    return questions
+    return questions_json(questions)
 
 
 @app.get("/answers/{question_id}")
-def answer_by_question_id(question_id: int):
-    return db.get_correct_answer_by_question_id(question_id)
-
-
-
-# Add auth so the following routes are not publicly accessible.
-
-@app.post("/questions/add/")
-def add_question(
+async def answer_by_question_id(question_id: int):
+    return await db.get_correct_answer_by_question_id(question_id)
+
+
+
+@app.post("/answers/check/batch")
+async def answers_check_batch(request: AnswerCheckBatchRequest) -> AnswerCheckBatch:
+    """Grade several responses in one pass over the in-memory answer map."""
+    results = []
+    missing = []
+    graded = db.sync.grade_answers(request.responses)
+    for response, (answered_correctly, correct_answer) in zip(request.responses, graded):
+        if correct_answer is None:
+            missing.append(response.question_id)
+            continue
+        results.append(AnswerResult(
+            question_id=response.question_id,
+            answered_correctly=answered_correctly,
+            correct_answer=correct_answer
+        ))
+    return AnswerCheckBatch(results=results, missing=missing)
+
+
+@app.post("/questions/add/", dependencies=[Depends(require_admin)])
+async def add_question(
     category: CategoryChoices | None = None,
     difficulty: DifficultyChoices | None = None,
     question_text: str | None = None
 ) -> Question:  # TODO check if this needs to return list[Question] instead
-    return db.add_question(
+    return await db.add_question(
         category=category, 
         difficulty=difficulty, 
         question_text=question_text
     )
 
 
-@app.put("/questions/update/")  # add auth so that only you can update questions
-def update_question(
+@app.put("/questions/update/", dependencies=[Depends(require_admin)])
+async def update_question(
     question_id,
     category: CategoryChoices | None = None,
     difficulty: DifficultyChoices | None = None,
     question_text: str | None = None
 ) -> list[Question]:  # Returns updated question object
-    return db.update_question(
+    return await db.update_question(
         question_id, 
         category=category, 
         difficulty=difficulty, 
@@ -162,13 +564,63 @@ def update_question(
     )
 
 
-@app.delete("/questions/delete/")  # add auth so that only you can update questions
-def delete_question(question_id: int):
-    return db.delete_question(question_id)
+@app.delete("/questions/delete/", dependencies=[Depends(require_admin)])
+async def delete_question(question_id: int):
+    return await db.delete_question(question_id)
+
+
+BULK_FORMATS = {"application/json": "json", "application/x-ndjson": "ndjson", "text/csv": "csv"}
+
+
+async def bulk_records(request: Request) -> list:
+    """Records of a JSON array, NDJSON or CSV upload, chosen by Content-Type."""
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip().lower()
+    fmt = BULK_FORMATS.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"415: Unsupported Media Type. Send one of: {', '.join(BULK_FORMATS)}."
+        )
+
+    try:
+        body = io.StringIO((await request.body()).decode("utf-8"), newline="")
+        records = list(islice(iter_records(body, fmt), Config.BULK_ADMIN_MAX_ROWS + 1))
+    except (UnicodeDecodeError, ValueError, csv.Error) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"400: Bad Request. Unreadable upload: {e}")
+
+    if len(records) > Config.BULK_ADMIN_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"413: Request Entity Too Large. At most {Config.BULK_ADMIN_MAX_ROWS} rows per upload."
+        )
+    return records
+
+
+@app.post("/questions/add/bulk", dependencies=[Depends(require_admin)])
+async def add_questions_bulk(records: Annotated[list, Depends(bulk_records)]) -> BulkResult:
+    """Create questions with their answers from an upload, in one transaction.
+
+    Rows need category, difficulty and question_text, plus either an
+    ``answers`` list of {answer_text, is_correct} or a correct ``answer_text``.
+    Invalid rows are skipped and listed in ``errors``.
+    """
+    return await db.import_questions(records)
+
+
+@app.put("/questions/update/bulk", dependencies=[Depends(require_admin)])
+async def update_questions_bulk(records: Annotated[list, Depends(bulk_records)]) -> BulkResult:
+    """Update questions from an upload of rows with a question_id and the fields to change."""
+    return await db.update_questions(records)
+
+
+@app.delete("/questions/delete/bulk", dependencies=[Depends(require_admin)])
+async def delete_questions_bulk(records: Annotated[list, Depends(bulk_records)]) -> BulkResult:
+    """Delete the questions named by an upload of question_ids (or rows with one)."""
+    return await db.delete_questions(records)
 
 
 @app.post("/users/create")
-def create_user(email: EmailStr | None = None, username: str | None = None):
+async def create_user(email: EmailStr | None = None, username: str | None = None):
     # Validate email
     if email is None:
         raise HTTPException(
@@ -182,28 +634,267 @@ def create_user(email: EmailStr | None = None, username: str | None = None):
         else:
             username = email[0]
             
-    user_created = db.create_user(email, username)
+    user_created = await db.create_user(email, username)
     
     return user_created
 
 
+@app.post("/auth/code", status_code=status.HTTP_202_ACCEPTED)
+async def request_login_code(email: EmailStr):
+    """Email a one-time login code. Answers the same whether or not the email is registered."""
+    try:
+        await authenticator.request_code(email)
+    except AuthBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"503: Service Unavailable. {e}",
+            headers={"Retry-After": str(Config.ADMISSION_RETRY_AFTER)}
+        )
+    return {"detail": "If the email is registered, a login code is on its way."}
+
+@app.post("/auth/login")
+async def login(credentials: AuthLogin) -> AuthToken:
+    try:
+        token = await authenticator.login(credentials.email, credentials.code)
+    except AuthenticationError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"401: Unauthorized. {e}")
+    except AuthBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"503: Service Unavailable. {e}",
+            headers={"Retry-After": str(Config.ADMISSION_RETRY_AFTER)}
+        )
+    return AuthToken(access_token=token, expires_in=authenticator.token_ttl)
+
+@app.post("/auth/refresh")
+async def refresh_token(claims: Annotated[TokenClaims, Depends(current_user)]) -> AuthToken:
+    try:
+        token = await authenticator.refresh(claims)
+    except AuthenticationError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"401: Unauthorized. {e}")
+    return AuthToken(access_token=token, expires_in=authenticator.token_ttl)
+
+@app.post("/auth/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(claims: Annotated[TokenClaims, Depends(current_user)]):
+    await authenticator.logout(claims)
+
+
+@app.get("/users/{user_id}/questions/next")
+async def get_next_question(
+    user_id: int,
+    category: CategoryChoices | None = None,
+    difficulty: DifficultyChoices | None = None
+) -> Question:
+    """A random question the user has not answered yet, or a repeat once they have seen them all."""
+    try:
+        return await db.get_next_question(user_id, category=category, difficulty=difficulty)
+    except IndexError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="404: Not Found. No questions match the given filters."
+        )
+
+
 @app.post("/rounds/create")
-def create_round(user_id: int) -> RoundInfo:
-    return db.create_round(user_id)
+async def create_round(
+    user_id: int,
+    size: Annotated[int, Query(ge=1, le=Config.MAX_ROUND_SIZE)] = Config.ROUND_SIZE,
+    category: CategoryChoices | None = None,
+    difficulty: DifficultyChoices | None = None
+) -> RoundInfo:
+    try:
+        return await db.create_round(user_id, size=size, category=category, difficulty=difficulty)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"404: Not Found. {e}")
 
 @app.get("/rounds/{round_id}/questions/current")
-def get_round_current_unanswered_question(round_id: int) -> Question:
-    return db.get_round_current_unanswered_question(round_id)
+async def get_round_current_unanswered_question(round_id: int) -> Question:
+    try:
+        question = await db.run(round_sessions.current_question, round_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"404: Not Found. {e}")
+
+    if question is None:
+        round_info = await get_round_by_id(round_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"404: Not Found. Round {round_info.round_id} is complete."
+        )
+    return question
 
 @app.post("/rounds/{round_id}/answers")
-def post_round_current_question_answer(round_id: int, res: QuestionResponse):
-    pass
+async def post_round_current_question_answer(round_id: int, res: QuestionResponse) -> RoundAnswerResult:
+    try:
+        return await db.run(round_sessions.answer, round_id, res)
+    except ValueError as e:
+        await get_round_by_id(round_id)  # 404 if the round doesn't exist
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"409: Conflict. {e}")
 
 @app.get("/rounds/{round_id}")
-def get_round_by_id(round_id: int):
-    return db.get_round_by_id(round_id)
+async def get_round_by_id(round_id: int) -> RoundInfo:
+    try:
+        return await db.run(round_sessions.get_round, round_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"404: Not Found. {e}")
+
+
+def get_live_game(game_id: int) -> LiveGame:
+    try:
+        return live_games.get(game_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"404: Not Found. {e}")
+
+
+@app.post("/games/create")
+async def create_live_game(
+    host_user_id: int,
+    size: Annotated[int, Query(ge=1, le=Config.MAX_ROUND_SIZE)] = Config.ROUND_SIZE,
+    category: CategoryChoices | None = None,
+    difficulty: DifficultyChoices | None = None
+) -> LiveGameInfo:
+    """Open a live game; players join it, then the host steps through the questions with /next."""
+    try:
+        return await live_games.create(host_user_id, size=size, category=category, difficulty=difficulty)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"404: Not Found. {e}")
+
+@app.get("/games/{game_id}")
+async def get_live_game_info(game_id: int) -> LiveGameInfo:
+    return get_live_game(game_id).info()
+
+@app.post("/games/{game_id}/join")
+async def join_live_game(game_id: int, user_id: int) -> LivePlayer:
+    get_live_game(game_id)
+    try:
+        return await live_games.join(game_id, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"409: Conflict. {e}")
+
+@app.post("/games/{game_id}/next")
+async def advance_live_game(game_id: int, host_user_id: int) -> LiveGameInfo:
+    """Close the open question and push its results, or push the next question."""
+    get_live_game(game_id)
+    try:
+        return await live_games.advance(game_id, host_user_id)
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"403: Forbidden. {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"409: Conflict. {e}")
+
+@app.post("/games/{game_id}/answers")
+async def answer_live_game(game_id: int, res: LiveAnswer) -> RoundAnswerResult:
+    """Answer the open question; for SSE clients, which cannot answer over their stream."""
+    get_live_game(game_id)
+    try:
+        return await live_games.answer(game_id, res.user_id, res.text)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"409: Conflict. {e}")
+
+@app.get("/games/{game_id}/events")
+async def live_game_events(game_id: int) -> StreamingResponse:
+    """Server-Sent Events stream of the game: state, questions, results and the final standings."""
+    get_live_game(game_id)
+    subscription = live_games.subscribe(game_id)
+
+    async def generate():
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), Config.LIVE_KEEPALIVE_INTERVAL)
+                except TimeoutError:
+                    yield ": keep-alive\n\n"  # Stops proxies from closing an idle stream
+                    continue
+                if event is None:
+                    break
+                yield f"event: {event.name}\ndata: {event.data}\n\n"
+        finally:
+            live_games.unsubscribe(game_id, subscription)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/games/{game_id}/ws")
+async def live_game_socket(websocket: WebSocket, game_id: int, user_id: int | None = None):
+    """Game events as JSON messages; with ``user_id`` the player joins and answers with ``{"text": ...}``."""
+    try:
+        live_games.get(game_id)
+        if user_id is not None:
+            await live_games.join(game_id, user_id)
+    except ValueError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+
+    await websocket.accept()
+    subscription = live_games.subscribe(game_id)
+
+    async def send_events():
+        async for event in subscription:
+            await websocket.send_text(event.data)
+        await websocket.close()
+
+    sender = asyncio.create_task(send_events())
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+                text = message.get("text") if isinstance(message, dict) else None
+                if user_id is None or not isinstance(text, str):
+                    raise ValueError("Join with ?user_id= and send {\"text\": \"<answer>\"}")
+                await live_games.answer(game_id, user_id, text, reply_to=subscription)
+            except ValueError as e:  # Also malformed JSON
+                subscription.push(Event.of("error", detail=str(e)))
+    except (WebSocketDisconnect, RuntimeError):  # RuntimeError: receiving after the game closed the socket
+        pass
+    finally:
+        sender.cancel()
+        live_games.unsubscribe(game_id, subscription)
+
+
+def accuracy(answered: int, correct: int) -> float:
+    return round(correct / answered, 4) if answered else 0.0
+
+
+@app.get("/leaderboard")
+async def get_leaderboard(
+    limit: Annotated[int, Query(ge=1, le=Config.LEADERBOARD_MAX_SIZE)] = Config.LEADERBOARD_SIZE
+) -> list[LeaderboardEntry]:
+    return [
+        LeaderboardEntry(
+            rank=rank,
+            user_id=record.user_id,
+            answered=record.answered,
+            correct=record.correct,
+            accuracy=accuracy(record.answered, record.correct)
+        )
+        for rank, record in leaderboard.top(limit)
+    ]
 
 
+@app.get("/users/{user_id}/stats")
+async def get_user_stats(user_id: int) -> UserStats:
+    record = leaderboard.get(user_id)
+    rank = leaderboard.rank(user_id)
+    if record is None or rank is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"404: No stats for user {user_id}."
+        )
+    return UserStats(
+        user_id=user_id,
+        rank=rank,
+        answered=record.answered,
+        correct=record.correct,
+        accuracy=accuracy(record.answered, record.correct),
+        streak=record.streak,
+        best_streak=record.best_streak,
+        categories={
+            category: CategoryStats(answered=answered, correct=correct, accuracy=accuracy(answered, correct))
+            for category, (answered, correct) in record.categories.items()
+        }
+    )
 
 
 # @app.get("/round")
@@ -212,11 +903,26 @@ def get_round_by_id(round_id: int):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the trivial.pub API.")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=Config.WORKERS,
+                        help="Worker processes; use the number of cores in production")
+    parser.add_argument('--reload', action='store_true', help="Restart on code changes (development, one worker)")
+    args = parser.parse_args()
+
+    if args.reload and args.workers > 1:
+        parser.error("--reload runs a single worker")
+
+    # Read by Config in each worker process
+    os.environ["TRIVIA_WORKERS"] = str(args.workers)
+    os.environ.setdefault("TRIVIA_AUTH_SECRET_KEY", Config.AUTH_SECRET_KEY)  # Tokens valid on every worker
     uvicorn.run(
         "backend.main:app",  # TODO update path
-        host="127.0.0.1",
-        port=8000,
-        reload=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=args.reload,
         log_level="info"
     )
 
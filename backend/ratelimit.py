@@ -0,0 +1,92 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+class TokenBuckets:
+    """Token bucket per key (client IP, user), refilled lazily when the key is next seen.
+
+    Each key may spend ``burst`` tokens at once and earns ``rate`` tokens
+    per second back. Only the ``max_keys`` most recently seen keys are
+    kept; a forgotten key starts again with a full bucket. Used from the
+    event loop only, so there is no lock.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int):
+        if rate <= 0 or burst <= 0:
+            raise ValueError("rate and burst must be > 0")
+
+        self.rate = rate
+        self.burst = burst
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[Hashable, list[float]] = OrderedDict()  # key -> [tokens, updated]
+        self.rejected = 0
+
+    def acquire(self, key: Hashable, cost: float = 1.0, now: float | None = None) -> float:
+        """Spend ``cost`` tokens; returns 0.0 if allowed, else seconds until the tokens are there."""
+        now = time.monotonic() if now is None else now
+        cost = min(cost, self.burst)  # An expensive route must still be reachable
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = self.burst
+            bucket = self._buckets[key] = [tokens, now]
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return 0.0
+
+        bucket[0] = tokens
+        self.rejected += 1
+        return (cost - tokens) / self.rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    """Caps requests in flight, shedding the excess instead of queueing it without bound.
+
+    Up to ``limit`` requests run at once. Up to ``max_waiting`` more wait
+    at most ``timeout`` seconds for a slot; everything beyond that is
+    rejected at once, so latency stays bounded under overload.
+    """
+
+    def __init__(self, limit: int, max_waiting: int, timeout: float):
+        self._semaphore = asyncio.Semaphore(limit)
+        self._max_waiting = max_waiting
+        self._timeout = timeout
+        self.waiting = 0
+        self.in_flight = 0
+        self.rejected = 0
+
+    async def acquire(self) -> bool:
+        """Take a slot; False if the request should be shed."""
+        if self._semaphore.locked():
+            if self.waiting >= self._max_waiting:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self._timeout)
+            except TimeoutError:
+                self.rejected += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()  # Free slot, returns without suspending
+
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
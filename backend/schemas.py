@@ -1,5 +1,6 @@
 from enum import Enum
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from backend.conf import Config
 
 
 class CategoryChoices(Enum):
@@ -30,6 +31,12 @@ class RoundStatus(Enum):
     COMPLETED = "COMPLETED"
     ERROR = "ERROR"
 
+class LiveGameStatus(Enum):
+    LOBBY = "LOBBY"  # Players joining, no question asked yet
+    QUESTION = "QUESTION"  # A question is open for answers
+    RESULTS = "RESULTS"  # The last question is closed and scored
+    FINISHED = "FINISHED"
+
 class Question(BaseModel):
     question_id: int | None
     difficulty: str | None
@@ -40,12 +47,101 @@ class QuestionResponse(BaseModel):
     question_id: int
     text: str
 
+class QuestionBatchRequest(BaseModel):
+    question_ids: list[int] = Field(min_length=1, max_length=Config.MAX_BATCH_SIZE)
+
+class QuestionBatch(BaseModel):
+    questions: list[Question]
+    missing: list[int]  # Requested ids with no question
+
+class QuestionStats(BaseModel):
+    total: int
+    version: str  # Question bank version the counts are for
+    categories: dict[str, int]  # category -> questions, 0 for empty categories
+    difficulties: dict[str, int]
+    buckets: dict[str, dict[str, int]]  # category -> difficulty -> questions
+
+class BulkRowError(BaseModel):
+    row: int  # 1-based position in the upload
+    error: str
+
+class BulkResult(BaseModel):
+    applied: int
+    question_ids: list[int]  # Questions created, updated or deleted, in upload order
+    errors: list[BulkRowError]  # Rows that were skipped
+
+class DuplicateQuestion(BaseModel):
+    question: Question
+    similarity: float
+
+class AnswerResult(BaseModel):
+    question_id: int
+    answered_correctly: bool
+    correct_answer: str | None
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    answered: int
+    correct: int
+    accuracy: float
+
+class CategoryStats(BaseModel):
+    answered: int
+    correct: int
+    accuracy: float
+
+class UserStats(BaseModel):
+    user_id: int
+    rank: int
+    answered: int
+    correct: int
+    accuracy: float
+    streak: int
+    best_streak: int
+    categories: dict[str, CategoryStats] = {}
+
+class AnswerCheckBatchRequest(BaseModel):
+    responses: list[QuestionResponse] = Field(min_length=1, max_length=Config.MAX_BATCH_SIZE)
+
+class AnswerCheckBatch(BaseModel):
+    results: list[AnswerResult]
+    missing: list[int]  # Question ids with no correct answer on record
+
 class TriviaRound(BaseModel):
     pass
 
 class RoundInfo(BaseModel):
     round_id: int
     user_id: int
+    round_status: RoundStatus | None = None
+    current_index: int = 0
+    question_count: int = 0
+
+class RoundAnswerResult(BaseModel):
+    round_id: int
+    question_id: int
+    answered_correctly: bool
+    correct_answer: str | None
+    current_index: int
+    round_status: RoundStatus
+
+class LiveGameInfo(BaseModel):
+    game_id: int
+    host_user_id: int
+    status: LiveGameStatus
+    current_index: int  # Index of the open or last closed question, -1 in the lobby
+    question_count: int
+    players: int
+
+class LivePlayer(BaseModel):
+    game_id: int
+    user_id: int
+    round_id: int  # The player's own round, holding their answers
+
+class LiveAnswer(BaseModel):
+    user_id: int
+    text: str
 
 class RoundQuestion(BaseModel):
     status: RoundQuestionStatus
@@ -63,3 +159,11 @@ class User(BaseModel):
     name: str
     email: EmailStr
 
+class AuthLogin(BaseModel):
+    email: EmailStr
+    code: str
+
+class AuthToken(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int  # seconds
@@ -0,0 +1,46 @@
+from pydantic import TypeAdapter
+from backend.schemas import Question
+
+try:
+    import orjson
+except ImportError:  # Optional; pydantic's serializer is the fallback
+    orjson = None
+
+
+QUESTION_LIST_JSON = TypeAdapter(list[Question])
+_QUESTION_FIELDS = frozenset(Question.model_fields)
+_new = object.__new__
+_set = object.__setattr__
+
+
+def question_from_row(row) -> Question:
+    """Question from a trusted (question_id, difficulty, category, question_text) row.
+
+    Skips validation: the schema's NOT NULL/CHECK constraints already
+    guarantee the types. This fills in the same attributes as
+    ``Question.model_construct`` without its per-call field introspection,
+    which makes it slower than validating; test_serialization checks that
+    the result is equal to a validated Question.
+    """
+    question = _new(Question)
+    _set(question, '__dict__', {
+        'question_id': row[0],
+        'difficulty': row[1],
+        'category': row[2],
+        'question_text': row[3],
+    })
+    _set(question, '__pydantic_fields_set__', set(_QUESTION_FIELDS))  # Per instance: pydantic adds to it
+    _set(question, '__pydantic_extra__', None)
+    _set(question, '__pydantic_private__', None)
+    return question
+
+
+def encode_questions(questions: list[Question]) -> bytes:
+    """JSON array of questions, byte-for-byte what FastAPI would return for ``list[Question]``.
+
+    Question fields are plain ints and strings, so orjson can encode the
+    instance dicts directly.
+    """
+    if orjson is not None:
+        return orjson.dumps([question.__dict__ for question in questions])
+    return QUESTION_LIST_JSON.dump_json(questions)
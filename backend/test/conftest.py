@@ -0,0 +1,57 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+import pytest
+
+# Run the app against a scratch copy of test.db so test runs never modify the
+# checked-in database (WAL mode, inserted rows, etc.). Must happen before
+# backend.conf is imported.
+_DB_SOURCE = Path(__file__).resolve().parents[1] / "database" / "test.db"
+_DB_DIR = tempfile.mkdtemp(prefix="trivia-test-")
+_DB_COPY = os.path.join(_DB_DIR, "test.db")
+shutil.copyfile(_DB_SOURCE, _DB_COPY)
+os.environ.setdefault("TRIVIA_DB_PATH", _DB_COPY)
+# The whole suite is one client; tests of admission control switch it on
+os.environ.setdefault("TRIVIA_RATE_LIMIT_ENABLED", "0")
+
+from backend.schemas import CategoryChoices, DifficultyChoices  # noqa: E402
+
+
+INIT_SQL_PATH = Path(__file__).resolve().parents[1] / "database" / "init.sql"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fresh database built from init.sql with one question per category/difficulty."""
+    path = str(tmp_path / "trivia.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(INIT_SQL_PATH.read_text())
+        for category in CategoryChoices:
+            for difficulty in DifficultyChoices:
+                conn.execute(
+                    """
+                    INSERT INTO Questions (category, difficulty, question_text)
+                    VALUES (?, ?, ?)
+                    """,
+                    (category.value, difficulty.value, f"A {difficulty.value} {category.value} question?")
+                )
+        conn.execute(
+            """
+            INSERT INTO TriviaAnswers (question_id, answer_text, is_correct)
+            SELECT question_id, 'Answer ' || question_id, 1 FROM Questions
+            UNION ALL
+            SELECT question_id, 'Wrong ' || question_id, 0 FROM Questions
+            """
+        )
+        conn.execute("INSERT INTO Users (email, username) VALUES ('player@trivial.pub', 'player')")
+    return path
+
+
+@pytest.fixture
+def db_manager(db_path):
+    from backend.database.db import TriviaDatabaseManager
+    manager = TriviaDatabaseManager(db_path=db_path, pool_size=2)
+    yield manager
+    manager.close()
@@ -0,0 +1,55 @@
+import pytest
+from backend.database.answers import AnswerChecker, bounded_edit_distance, normalize_answer
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Ottawa", "ottawa"),
+    ("  The   Beatles! ", "beatles"),
+    ("Brasília", "brasilia"),
+    ("an apple a day", "apple day"),
+    ("A", "a"),
+    ("Washington, D.C.", "washington d c"),
+])
+def test_normalize_answer(text, expected):
+    assert normalize_answer(text) == expected
+
+@pytest.mark.parametrize("a, b, bound, expected", [
+    ("canberra", "canberra", 1, 0),
+    ("canberra", "canbera", 1, 1),
+    ("canberra", "canbrera", 2, 2),
+    ("canberra", "sydney", 2, None),
+    ("ab", "abcd", 1, None),
+])
+def test_bounded_edit_distance(a, b, bound, expected):
+    assert bounded_edit_distance(a, b, bound) == expected
+
+def make_checker(**kwargs):
+    checker = AnswerChecker(**kwargs)
+    checker.load([
+        (1, "Ottawa"),
+        (2, "The Beatles"),
+        (2, "Beatles, The"),
+        (3, "1945"),
+        (4, "Canberra"),
+    ])
+    return checker
+
+def test_checker_accepts_normalized_and_alternate_answers():
+    checker = make_checker()
+    assert checker.check(1, " ottawa ") == (True, "Ottawa")
+    assert checker.check(2, "beatles") == (True, "The Beatles")
+    assert checker.check(1, "Toronto") == (False, "Ottawa")
+    assert checker.check(99, "anything") == (False, None)
+
+def test_checker_fuzzy_matching_is_bounded():
+    checker = make_checker()
+    assert checker.check(4, "Canbera")[0]
+    assert not checker.check(4, "Cnbra")[0]
+    assert not checker.check(3, "1946")[0]  # Numbers must match exactly
+    assert not make_checker(fuzzy=False).check(4, "Canbera")[0]
+
+def test_manager_grades_without_the_database(db_manager):
+    with db_manager._pool.connection():  # Exhaust the pool: any query would block
+        with db_manager._pool.connection():
+            assert db_manager.grade_answer(1, "answer 1") == (True, "Answer 1")
+            assert db_manager.grade_answer(1, "wrong 1") == (False, "Answer 1")
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+from backend.database.async_db import AsyncTriviaDatabaseManager
+from backend.schemas import CategoryChoices, DifficultyChoices
+
+
+def test_async_manager_mirrors_sync_methods(db_manager):
+    async_db = AsyncTriviaDatabaseManager(db_manager)
+
+    async def run():
+        question = await async_db.get_random_question(category=CategoryChoices.ART)
+        assert question.category == "art"
+        assert await async_db.get_question_by_id(question.question_id) == [question]
+        assert await async_db.get_all_questions() == db_manager.get_all_questions()
+
+    asyncio.run(run())
+    async_db.close()
+
+def test_async_manager_runs_off_the_event_loop(db_manager):
+    async_db = AsyncTriviaDatabaseManager(db_manager)
+
+    async def run():
+        return await async_db.run(lambda: threading.current_thread().name)
+
+    assert asyncio.run(run()).startswith("trivia-db")
+    async_db.close()
+
+def test_async_manager_iter_questions(db_manager):
+    async_db = AsyncTriviaDatabaseManager(db_manager)
+
+    async def run():
+        return [
+            question async for question in
+            async_db.iter_questions(difficulty=DifficultyChoices.EASY, batch_size=3)
+        ]
+
+    assert asyncio.run(run()) == list(db_manager.iter_questions(difficulty=DifficultyChoices.EASY))
+    async_db.close()
@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+from backend.auth import AuthBusyError, AuthenticationError, Authenticator
+from backend.database.async_db import AsyncTriviaDatabaseManager
+
+EMAIL = "player@trivial.pub"
+SECRET = "test-secret-key-of-a-reasonable-length"
+
+
+def authenticator(db_manager, **kwargs) -> tuple[Authenticator, dict[str, str]]:
+    codes = {}
+    auth = Authenticator(
+        AsyncTriviaDatabaseManager(db_manager),
+        secret_key=SECRET,
+        send_code=lambda email, code: codes.update({email: code}),
+        **kwargs
+    )
+    return auth, codes
+
+def login(auth, codes, email=EMAIL) -> str:
+    async def run():
+        await auth.request_code(email)
+        return await auth.login(email, codes[email])
+    return asyncio.run(run())
+
+
+def test_token_claims(db_manager):
+    auth, codes = authenticator(db_manager, admin_emails=frozenset({EMAIL}))
+    claims = auth.verify(login(auth, codes))
+    assert claims.user_id == 1
+    assert claims.admin
+
+    with pytest.raises(AuthenticationError):
+        auth.verify("not.a.token")
+    other, _ = authenticator(db_manager)
+    other._secret_key = "another-secret-key-of-a-reasonable-length"
+    with pytest.raises(AuthenticationError):
+        other.verify(auth.issue_token(1, "session"))
+    expired, _ = authenticator(db_manager, token_ttl=-1)
+    with pytest.raises(AuthenticationError):
+        expired.verify(expired.issue_token(1, "session"))
+
+def test_logout_reaches_other_workers(db_manager):
+    auth, codes = authenticator(db_manager)
+    other_worker, _ = authenticator(db_manager)
+    token = login(auth, codes)
+    claims = other_worker.verify(token)
+
+    asyncio.run(auth.logout(claims))
+    with pytest.raises(AuthenticationError):
+        auth.verify(token)
+    other_worker.verify(token)  # Until it syncs
+    other_worker.sync_revocations()
+    with pytest.raises(AuthenticationError):
+        other_worker.verify(token)
+    with pytest.raises(AuthenticationError):
+        asyncio.run(auth.refresh(claims))
+
+def test_new_login_revokes_previous_session(db_manager):
+    auth, codes = authenticator(db_manager)
+    first = login(auth, codes)
+    second = login(auth, codes)
+    auth.sync_revocations()
+    with pytest.raises(AuthenticationError):
+        auth.verify(first)
+    assert auth.verify(second).user_id == 1
+
+def test_hashing_is_bounded(db_manager):
+    auth, codes = authenticator(db_manager, hash_workers=1, max_pending_hashes=0, hash_queue_timeout=0)
+
+    async def run():
+        return await asyncio.gather(*(auth.request_code(EMAIL) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert results[0] is None
+    assert all(isinstance(result, AuthBusyError) for result in results[1:])
+    auth.close()
+
+def test_login_code_is_discarded_after_failed_attempts(db_manager):
+    auth, codes = authenticator(db_manager, max_code_attempts=3)
+
+    async def run():
+        await auth.request_code(EMAIL)
+        wrong = f"{(int(codes[EMAIL]) + 1) % 10 ** 6:06d}"
+        for _ in range(3):
+            with pytest.raises(AuthenticationError):
+                await auth.login(EMAIL, wrong)
+        with pytest.raises(AuthenticationError):
+            await auth.login(EMAIL, codes[EMAIL])
+
+        # A new code starts with a fresh count
+        await auth.request_code(EMAIL)
+        for _ in range(2):
+            with pytest.raises(AuthenticationError):
+                await auth.login(EMAIL, f"{(int(codes[EMAIL]) + 1) % 10 ** 6:06d}")
+        return await auth.login(EMAIL, codes[EMAIL])
+
+    assert auth.verify(asyncio.run(run())).user_id == 1
+
+def test_refresh_rechecks_admin_status(db_manager):
+    auth, codes = authenticator(db_manager, admin_emails=frozenset({EMAIL}))
+    claims = auth.verify(login(auth, codes))
+    assert claims.admin
+
+    auth._admin_emails = frozenset()
+    assert not auth.verify(asyncio.run(auth.refresh(claims))).admin
+
+def test_login_code_is_consumed_once(db_manager):
+    auth, codes = authenticator(db_manager, max_code_attempts=2)
+
+    async def run():
+        await auth.request_code(EMAIL)
+        results = await asyncio.gather(*(auth.login(EMAIL, codes[EMAIL]) for _ in range(2)), return_exceptions=True)
+        assert sorted(isinstance(result, AuthenticationError) for result in results) == [False, True]
+
+        # A correct guess still verifying when wrong ones discard the code
+        await auth.request_code(EMAIL)
+        stale = await auth._db.get_mfa_code(EMAIL)
+        wrong = f"{(int(codes[EMAIL]) + 1) % 10 ** 6:06d}"
+        for _ in range(2):
+            with pytest.raises(AuthenticationError):
+                await auth.login(EMAIL, wrong)
+
+        async def get_stale_code(email):
+            return stale
+        auth._db.get_mfa_code = get_stale_code
+        with pytest.raises(AuthenticationError):
+            await auth.login(EMAIL, codes[EMAIL])
+
+    asyncio.run(run())
@@ -0,0 +1,39 @@
+import sqlite3
+from backend.bench.run import compare, percentile, summarize
+from backend.bench.synthetic import correct_answer, generate_question_bank
+from backend.database.db import TriviaDatabaseManager
+
+
+def test_generate_question_bank(tmp_path):
+    db_path = str(tmp_path / "bench.db")
+    generate_question_bank(db_path, questions=500, users=3, batch_size=128)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*), MIN(question_id), MAX(question_id) FROM Questions").fetchone() == (500, 1, 500)
+        assert conn.execute("SELECT COUNT(*) FROM Users").fetchone() == (3,)
+
+    manager = TriviaDatabaseManager(db_path, pool_size=1)
+    try:
+        assert manager.grade_answer(42, correct_answer(42)) == (True, correct_answer(42))
+        assert manager.search_questions("synthetic 42") != []
+    finally:
+        manager.close()
+
+def test_percentile_and_summary():
+    values = [float(i) for i in range(1, 101)]
+    assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (50.0, 95.0, 99.0)
+    assert percentile([], 50) == 0.0
+
+    stats = summarize([0.001, 0.002, 0.003, 0.004], errors=1, seconds=2.0)
+    assert (stats.requests, stats.errors, stats.rps, stats.p50, stats.max) == (4, 1, 2.0, 2.0, 4.0)
+
+def test_compare_flags_regressions():
+    def report(rps, p95):
+        return {'results': {'random': {'rps': rps, 'p50': 1.0, 'p95': p95, 'p99': 3.0}}}
+
+    _, regressions = compare(report(100.0, 2.0), report(98.0, 2.1), threshold=10.0)
+    assert regressions == []
+
+    lines, regressions = compare(report(100.0, 2.0), report(80.0, 3.0), threshold=10.0)
+    assert regressions == ["random rps -20.0%", "random p95 +50.0%"]
+    assert lines[0].startswith("random: rps 100.00 -> 80.00")
@@ -0,0 +1,74 @@
+import time
+from backend.database.cache import LRUCache
+from backend.schemas import CategoryChoices, DifficultyChoices
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(maxsize=2, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+def test_question_reads_are_cached(db_manager):
+    db_manager.get_question_by_category(CategoryChoices.ART)
+    db_manager.get_question_by_category(CategoryChoices.ART)
+    db_manager.get_question_by_id(1)
+    db_manager.get_question_by_id(1)
+    stats = db_manager.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+def test_writes_invalidate_cached_reads(db_manager):
+    art = db_manager.get_question_by_category(CategoryChoices.ART)
+    everything = db_manager.get_all_questions()
+    history_easy = db_manager.get_questions_by_category_and_difficulty(
+        CategoryChoices.HISTORY, DifficultyChoices.EASY
+    )
+
+    added = db_manager.add_question(CategoryChoices.ART, DifficultyChoices.EASY, "New art question?")
+    assert len(db_manager.get_question_by_category(CategoryChoices.ART)) == len(art) + 1
+    assert len(db_manager.get_all_questions()) == len(everything) + 1
+    # Unrelated buckets stay cached
+    hits = db_manager.cache_stats()["hits"]
+    db_manager.get_questions_by_category_and_difficulty(CategoryChoices.HISTORY, DifficultyChoices.EASY)
+    assert db_manager.cache_stats()["hits"] == hits + 1
+
+    db_manager.update_question(added.question_id, category=CategoryChoices.HISTORY, question_text="Moved?")
+    assert db_manager.get_question_by_id(added.question_id)[0].question_text == "Moved?"
+    assert len(db_manager.get_question_by_category(CategoryChoices.ART)) == len(art)
+    assert len(db_manager.get_questions_by_category_and_difficulty(
+        CategoryChoices.HISTORY, DifficultyChoices.EASY
+    )) == len(history_easy) + 1
+
+    db_manager.delete_question(added.question_id)
+    assert db_manager.get_question_by_id(added.question_id) == []
+    assert len(db_manager.get_all_questions()) == len(everything)
+
+def test_lru_cache_drops_reads_that_raced_an_invalidation():
+    cache = LRUCache(maxsize=4)
+    generation = cache.generation
+    cache.invalidate("a")  # A write lands while the read is in flight
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+
+    generation = cache.generation
+    cache.set("a", "fresh", generation)
+    assert cache.get("a") == "fresh"
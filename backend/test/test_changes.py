@@ -0,0 +1,78 @@
+import sqlite3
+import time
+import pytest
+from backend.database.changes import ChangeWatcher
+from backend.database.db import TriviaDatabaseManager
+from backend.schemas import CategoryChoices, DifficultyChoices
+
+
+@pytest.fixture
+def other_worker(db_path):
+    """A second manager on the same database, as another worker process would have."""
+    manager = TriviaDatabaseManager(db_path=db_path, pool_size=2)
+    yield manager
+    manager.close()
+
+
+def test_writes_reach_other_workers(db_manager, other_worker):
+    assert other_worker.get_question_by_id(1)[0].question_text == "A easy geography question?"
+    version = other_worker.question_bank_version
+
+    added = db_manager.add_question(CategoryChoices.FOOD, DifficultyChoices.HARD, "Which cheese is blue?")
+    db_manager.update_question(1, question_text="Updated elsewhere?")
+    assert other_worker.sync_changes() == 2
+
+    assert other_worker.question_bank_version == db_manager.question_bank_version != version
+    assert other_worker.get_question_by_id(1)[0].question_text == "Updated elsewhere?"  # Cached copy replaced
+    assert other_worker.get_question_by_id(added.question_id) == [added]
+    assert added.question_id in {
+        other_worker.get_random_question(CategoryChoices.FOOD, DifficultyChoices.HARD).question_id
+        for _ in range(50)
+    }
+
+    db_manager.delete_question(added.question_id)
+    other_worker.sync_changes()
+    assert other_worker.get_question_by_id(added.question_id) == []
+    assert other_worker.sync_changes() == 0
+
+def test_answers_reach_other_workers(db_manager, other_worker):
+    question = db_manager.add_question(CategoryChoices.FOOD, DifficultyChoices.HARD, "Which nut is a seed?")
+    with db_manager._pool.connection() as conn:
+        conn.execute(
+            "INSERT INTO TriviaAnswers (question_id, answer_text, is_correct) VALUES (?, 'Almond', 1)",
+            (question.question_id,)
+        )
+        conn.execute("INSERT INTO QuestionChanges (question_id) VALUES (?)", (question.question_id,))
+        conn.commit()
+
+    other_worker.sync_changes()
+    assert other_worker.grade_answer(question.question_id, "almond")[0]
+
+def test_bulk_change_reloads_everything(db_path, db_manager, other_worker):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO Questions (category, difficulty, question_text) VALUES ('food', 'hard', 'Bulk?')"
+        )
+        conn.execute("INSERT INTO QuestionChanges (question_id) VALUES (NULL)")
+
+    other_worker.sync_changes()
+    assert "Bulk?" in {
+        other_worker.get_random_question(CategoryChoices.FOOD, DifficultyChoices.HARD).question_text
+        for _ in range(50)
+    }
+
+def test_change_watcher_syncs_in_background(db_path, db_manager, other_worker):
+    watcher = ChangeWatcher(other_worker, db_path, interval=0.01)
+    watcher.start()
+    try:
+        db_manager.update_question(1, question_text="Seen by the watcher?")
+        deadline = time.monotonic() + 2
+        while other_worker.question_bank_version != db_manager.question_bank_version and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        watcher.close()
+    assert other_worker.get_question_by_id(1)[0].question_text == "Seen by the watcher?"
+
+def test_warm_up_touches_every_connection(db_manager):
+    db_manager.warm_up()
+    assert db_manager.get_question_by_id(1)
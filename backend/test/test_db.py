@@ -0,0 +1,185 @@
+import pytest
+from backend.schemas import CategoryChoices, DifficultyChoices, QuestionResponse
+
+
+def test_random_question_uses_index(db_manager):
+    question = db_manager.get_random_question(CategoryChoices.ART, DifficultyChoices.HARD)
+    assert question.category == "art"
+    assert question.difficulty == "hard"
+
+def test_random_question_tracks_writes(db_manager):
+    original = db_manager.get_random_question(CategoryChoices.ART, DifficultyChoices.HARD)
+    added = db_manager.add_question(CategoryChoices.ART, DifficultyChoices.HARD, "Who painted it?")
+    db_manager.delete_question(original.question_id)
+    for _ in range(10):
+        assert db_manager.get_random_question(CategoryChoices.ART, DifficultyChoices.HARD) == added
+
+    db_manager.update_question(added.question_id, category=CategoryChoices.MUSIC)
+    with pytest.raises(IndexError):
+        db_manager.get_random_question(CategoryChoices.ART, DifficultyChoices.HARD)
+    assert added.question_id in {
+        db_manager.get_random_question(CategoryChoices.MUSIC, DifficultyChoices.HARD).question_id
+        for _ in range(50)
+    }
+
+def test_random_question_empty_bucket(db_manager):
+    for difficulty in DifficultyChoices:
+        question = db_manager.get_random_question(CategoryChoices.FOOD, difficulty)
+        db_manager.delete_question(question.question_id)
+
+    with pytest.raises(IndexError):
+        db_manager.get_random_question(CategoryChoices.FOOD)
+
+def test_question_bank_version_changes_on_writes(db_manager):
+    versions = [db_manager.question_bank_version]
+    db_manager.get_question_by_id(1)
+    assert db_manager.question_bank_version == versions[-1]
+
+    added = db_manager.add_question(CategoryChoices.ART, DifficultyChoices.EASY, "Versioned?")
+    versions.append(db_manager.question_bank_version)
+    db_manager.update_question(added.question_id, question_text="Versioned again?")
+    versions.append(db_manager.question_bank_version)
+    db_manager.delete_question(added.question_id)
+    versions.append(db_manager.question_bank_version)
+    assert len(set(versions)) == 4
+
+def test_get_questions_by_ids_preserves_order(db_manager):
+    questions, missing = db_manager.get_questions_by_ids([5, 999, 2, 5])
+    assert [q.question_id for q in questions] == [5, 2, 5]
+    assert missing == [999]
+
+    # Second call is served from the cache, including the miss
+    stats = db_manager.cache_stats()
+    assert db_manager.get_questions_by_ids([2, 999]) == ([questions[1]], [999])
+    assert db_manager.cache_stats()["hits"] == stats["hits"] + 2
+
+def test_get_questions_by_ids_chunks_large_requests(db_manager, monkeypatch):
+    from backend.conf import Config
+    monkeypatch.setattr(Config, "SQLITE_MAX_IN_PARAMETERS", 4)
+    questions, missing = db_manager.get_questions_by_ids(list(range(1, 11)))
+    assert [q.question_id for q in questions] == list(range(1, 11))
+    assert missing == []
+
+def test_grade_answers(db_manager):
+    graded = db_manager.grade_answers([
+        QuestionResponse(question_id=1, text="answer 1"),
+        QuestionResponse(question_id=2, text="Wrong 2"),
+        QuestionResponse(question_id=999, text="?"),
+    ])
+    assert graded == [(True, "Answer 1"), (False, "Answer 2"), (False, None)]
+
+def test_import_questions_in_one_batch(db_manager):
+    version = db_manager.question_bank_version
+    db_manager.delete_question(30)  # Highest id; its id must not be handed out again
+    result = db_manager.import_questions([
+        {"category": "art", "difficulty": "hard", "question_text": "Who painted Guernica?",
+         "answers": [{"answer_text": "Picasso", "is_correct": True}, {"answer_text": "Dali", "is_correct": False}]},
+        {"category": "art", "difficulty": "impossible", "question_text": "?"},
+        {"category": "Music", "difficulty": "EASY", "question_text": "Who wrote Rhapsody in Blue?",
+         "answer_text": "Gershwin"},
+        {"question_text": "No category"},
+    ])
+    assert result.applied == 2
+    assert [error.row for error in result.errors] == [2, 4]
+    assert "difficulty" in result.errors[0].error
+
+    art_id, music_id = result.question_ids
+    assert art_id == 31 and music_id == 32
+    assert db_manager.get_question_by_id(music_id)[0].category == "music"
+    assert db_manager.grade_answers([
+        QuestionResponse(question_id=art_id, text="picasso"),
+        QuestionResponse(question_id=music_id, text="Gershwin"),
+    ]) == [(True, "Picasso"), (True, "Gershwin")]
+    assert art_id in {q.question_id for q in db_manager.get_questions_by_category_and_difficulty(
+        CategoryChoices.ART, DifficultyChoices.HARD
+    )}
+    assert db_manager.question_bank_version != version
+
+def test_update_questions_in_one_batch(db_manager):
+    db_manager.get_question_by_category(CategoryChoices.FOOD)  # Cached listing must be invalidated
+    result = db_manager.update_questions([
+        {"question_id": 1, "category": "food"},
+        {"question_id": 2, "answers": [{"answer_text": "Replaced", "is_correct": 1}]},
+        {"question_id": 999, "question_text": "Nowhere?"},
+        {"question_id": 1, "question_text": "Again?"},
+        {"question_id": 3},
+    ])
+    assert result.question_ids == [1, 2]
+    assert [(error.row, error.error) for error in result.errors] == [
+        (3, "No question found with id: 999"),
+        (4, "Duplicate question_id in upload: 1"),
+        (5, "No fields provided to update"),
+    ]
+    question = db_manager.get_question_by_id(1)[0]
+    assert (question.category, question.question_text) == ("food", "A easy geography question?")
+    assert 1 in {q.question_id for q in db_manager.get_question_by_category(CategoryChoices.FOOD)}
+    assert db_manager.grade_answers([QuestionResponse(question_id=2, text="replaced")]) == [(True, "Replaced")]
+    assert db_manager.get_correct_answer_by_question_id(2) == "Replaced"
+
+def test_delete_questions_in_one_batch(db_manager):
+    result = db_manager.delete_questions([4, {"question_id": 5}, 999, "x", 4])
+    assert result.question_ids == [4, 5]
+    assert [error.row for error in result.errors] == [3, 4]
+    assert db_manager.get_questions_by_ids([4, 5, 6]) == ([db_manager.get_question_by_id(6)[0]], [4, 5])
+    assert db_manager.grade_answers([QuestionResponse(question_id=4, text="Answer 4")]) == [(False, None)]
+
+def test_bulk_writes_reach_other_workers(db_manager, db_path, monkeypatch):
+    from backend.conf import Config
+    from backend.database.db import TriviaDatabaseManager
+    other = TriviaDatabaseManager(db_path=db_path, pool_size=1)
+    try:
+        other.get_question_by_id(7)
+        # A batch past the threshold is logged as a single reload
+        monkeypatch.setattr(Config, "SYNC_FULL_RELOAD_THRESHOLD", 1)
+        db_manager.update_questions([{"question_id": 7, "question_text": "Seven?"}, {"question_id": 8, "difficulty": "hard"}])
+        assert other.sync_changes() == 1
+        assert other.get_question_by_id(7)[0].question_text == "Seven?"
+    finally:
+        other.close()
+
+def test_question_stats_follow_writes(db_manager):
+    stats = db_manager.question_stats()
+    assert stats.total == 30
+    assert stats.categories["art"] == 3
+    assert stats.difficulties["easy"] == 10
+    assert stats.buckets["food"] == {"easy": 1, "medium": 1, "hard": 1}
+
+    db_manager.delete_questions([
+        q.question_id for q in db_manager.get_question_by_category(CategoryChoices.FOOD)
+    ])
+    db_manager.add_question(CategoryChoices.ART, DifficultyChoices.HARD, "Who sculpted David?")
+    stats = db_manager.question_stats()
+    assert stats.total == 28
+    assert stats.categories["food"] == 0
+    assert stats.buckets["food"] == {"easy": 0, "medium": 0, "hard": 0}
+    assert stats.buckets["art"]["hard"] == 2
+    assert stats.version == db_manager.question_bank_version
+    assert db_manager.count_questions(CategoryChoices.FOOD, DifficultyChoices.EASY) == 0
+
+def test_read_through_cache_skips_rows_read_before_a_write(db_manager, monkeypatch):
+    from backend.database import db as db_module
+    original = db_manager.get_question_by_id(1)[0]
+    db_manager._cache.clear()
+
+    # The update commits and invalidates while this read is between its query and the cache fill
+    question_from_row = db_module.question_from_row
+    def racing_row(row):
+        monkeypatch.setattr(db_module, "question_from_row", question_from_row)
+        db_manager.update_question(1, question_text="Updated mid-read?")
+        return question_from_row(row)
+
+    monkeypatch.setattr(db_module, "question_from_row", racing_row)
+    assert db_manager.get_question_by_id(1)[0].question_text == original.question_text  # Read before the write
+    assert db_manager.get_question_by_id(1)[0].question_text == "Updated mid-read?"
+
+def test_iter_questions_does_not_hold_a_connection(db_path):
+    from backend.database.db import TriviaDatabaseManager
+    manager = TriviaDatabaseManager(db_path=db_path, pool_size=1)
+    try:
+        manager._pool._timeout = 0.1
+        questions = manager.iter_questions(batch_size=4)
+        first = [next(questions) for _ in range(5)]  # Paused mid-stream, like an export to a slow client
+        assert manager.get_questions_page(limit=1)[0] == first[0]  # Would time out if the stream held the pool
+        assert [q.question_id for q in first + list(questions)] == list(range(1, 31))
+    finally:
+        manager.close()
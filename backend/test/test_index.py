@@ -0,0 +1,58 @@
+from backend.database.index import QuestionIndex
+from backend.schemas import CategoryChoices, DifficultyChoices
+
+
+def make_index():
+    index = QuestionIndex()
+    index.load([
+        (1, "history", "easy"),
+        (2, "history", "hard"),
+        (3, "science", "easy"),
+    ])
+    return index
+
+def test_index_random_id_respects_filters():
+    index = make_index()
+    for _ in range(20):
+        assert index.random_id(CategoryChoices.HISTORY, DifficultyChoices.EASY) == 1
+        assert index.random_id(CategoryChoices.HISTORY) in {1, 2}
+        assert index.random_id(difficulty=DifficultyChoices.EASY) in {1, 3}
+        assert index.random_id() in {1, 2, 3}
+
+def test_index_random_id_empty_bucket():
+    index = make_index()
+    assert index.random_id(CategoryChoices.MUSIC) is None
+
+def test_index_discard_keeps_buckets_consistent():
+    index = make_index()
+    index.discard(1)
+    assert 1 not in index
+    assert len(index) == 2
+    for _ in range(20):
+        assert index.random_id(CategoryChoices.HISTORY) == 2
+        assert index.random_id() in {2, 3}
+    assert index.random_id(CategoryChoices.HISTORY, DifficultyChoices.EASY) is None
+
+def test_index_add_moves_question_between_buckets():
+    index = make_index()
+    index.add(1, "science", "hard")
+    assert index.get(1) == ("science", "hard")
+    assert index.random_id(CategoryChoices.HISTORY, DifficultyChoices.EASY) is None
+    assert index.random_id(CategoryChoices.SCIENCE, DifficultyChoices.HARD) == 1
+
+def test_index_counts_track_writes():
+    index = make_index()
+    assert index.count() == 3
+    assert index.count(CategoryChoices.HISTORY) == 2
+    assert index.count(difficulty=DifficultyChoices.EASY) == 2
+    assert index.count(CategoryChoices.ART, DifficultyChoices.EASY) == 0
+
+    index.add(4, "art", "easy")
+    index.add(2, "history", "easy")  # Moved between buckets
+    index.discard(3)
+    counts = index.counts()
+    assert counts[("art", "easy")] == 1
+    assert counts[("history", "easy")] == 2
+    assert counts[("history", "hard")] == 0
+    assert counts[(None, "easy")] == 3
+    assert counts[(None, None)] == 3
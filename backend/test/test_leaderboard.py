@@ -0,0 +1,126 @@
+import random
+from bisect import bisect_left, insort
+import pytest
+from backend.database.leaderboard import ChunkedSortedList, Leaderboard, UserStatsRecord
+from backend.database.sessions import RoundSessionStore
+from backend.schemas import QuestionResponse
+
+USER_ID = 1
+
+
+def test_rank_and_ties():
+    board = Leaderboard()
+    board.load([
+        UserStatsRecord(1, answered=5, correct=3),
+        UserStatsRecord(2, answered=5, correct=5),
+        UserStatsRecord(3, answered=4, correct=3),
+    ])
+    assert board.rank(2) == 1
+    assert board.rank(1) == board.rank(3) == 2
+    assert [(rank, record.user_id) for rank, record in board.top(3)] == [(1, 2), (2, 1), (2, 3)]
+    assert board.rank(99) is None
+
+def test_chunked_sorted_list_matches_a_sorted_list():
+    rng = random.Random(7)
+    expected = sorted(rng.randrange(100) for _ in range(50))
+    chunked = ChunkedSortedList(expected, load=4)  # Small chunks, so they split and empty often
+    for _ in range(2000):
+        if expected and rng.random() < 0.5:
+            item = rng.choice(expected)
+            expected.remove(item)
+            chunked.remove(item)
+        else:
+            item = rng.randrange(100)
+            insort(expected, item)
+            chunked.add(item)
+        probe = rng.randrange(101)
+        assert chunked.index(probe) == bisect_left(expected, probe)
+    assert list(chunked) == expected and len(chunked) == len(expected)
+    with pytest.raises(ValueError):
+        chunked.remove(100)
+
+def test_record_answer_updates_ranking_and_streaks():
+    board = Leaderboard()
+    board.record_answer(1, "history", True)
+    board.record_answer(2, "science", True)
+    board.record_answer(2, "science", True)
+    board.record_answer(2, "science", False)
+
+    assert board.rank(2) == 1 and board.rank(1) == 2
+    record = board.get(2)
+    assert (record.answered, record.correct, record.streak, record.best_streak) == (3, 2, 0, 2)
+    assert record.categories == {"science": [3, 2]}
+
+def test_take_dirty_returns_copies_once():
+    board = Leaderboard()
+    board.record_answer(1, "history", True)
+    dirty = board.take_dirty()
+    assert [record.user_id for record in dirty] == [1]
+    assert board.take_dirty() == []
+
+    dirty[0].categories["history"][0] = 100
+    assert board.get(1).categories["history"] == [1, 1]
+
+    board.mark_dirty([1, 42])
+    assert [record.user_id for record in board.take_dirty()] == [1]
+
+def test_stats_persist_with_round_flush(db_manager):
+    board = Leaderboard()
+    store = RoundSessionStore(db_manager, flush_interval=60, leaderboard=board)
+    round_id = db_manager.create_round(USER_ID, size=3).round_id
+    for _ in range(3):
+        question = store.current_question(round_id)
+        store.answer(round_id, QuestionResponse(
+            question_id=question.question_id, text=f"Answer {question.question_id}"
+        ))
+    store.close()
+
+    assert board.get(USER_ID).correct == 3
+    persisted = {record.user_id: record for record in db_manager.load_user_stats()}
+    assert persisted[USER_ID].correct == 3
+    assert persisted[USER_ID].best_streak == 3
+    assert sum(answered for answered, _ in persisted[USER_ID].categories.values()) == 3
+
+def test_reconcile_rebuilds_from_round_answers(db_manager):
+    board = Leaderboard()
+    store = RoundSessionStore(db_manager, flush_interval=60, leaderboard=board)
+    round_id = db_manager.create_round(USER_ID, size=2).round_id
+    for _ in range(2):
+        question = store.current_question(round_id)
+        store.answer(round_id, QuestionResponse(question_id=question.question_id, text="nope"))
+
+    board.record_answer(USER_ID, None, True)  # Drift that was never stored
+    store.reconcile()
+    store.close()
+
+    record = board.get(USER_ID)
+    assert (record.answered, record.correct) == (2, 0)
+    assert [r.answered for r in db_manager.load_user_stats()] == [2]
+
+@pytest.mark.parametrize("write_through", [False, True])
+def test_reconcile_counts_repeat_answers(db_manager, write_through):
+    board = Leaderboard()
+    store = RoundSessionStore(db_manager, flush_interval=60, leaderboard=board, write_through=write_through)
+    for _ in range(3):  # The same question in every round, as in a live game
+        round_id = db_manager.create_round(USER_ID, question_ids=[1]).round_id
+        store.answer(round_id, QuestionResponse(question_id=1, text="Answer 1"))
+    before = board.get(USER_ID)
+    before = (before.answered, before.correct, before.streak)
+
+    store.reconcile()
+    store.close()
+
+    record = board.get(USER_ID)
+    assert (record.answered, record.correct, record.streak) == before == (3, 3, 3)
+
+def test_failed_reconcile_waits_for_the_next_interval(db_manager, monkeypatch):
+    store = RoundSessionStore(db_manager, flush_interval=60, leaderboard=Leaderboard())
+    def failing_reconcile():
+        raise RuntimeError("no such column")
+
+    monkeypatch.setattr(db_manager, "reconcile_user_stats", failing_reconcile)
+    before = store._last_reconcile
+    with pytest.raises(RuntimeError):
+        store.reconcile()
+    assert store._last_reconcile > before  # Not retried on every flusher tick
+    store.close()
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import pytest
+from backend.database.async_db import AsyncTriviaDatabaseManager
+from backend.database.sessions import RoundSessionStore
+from backend.live import LiveGameHub
+from backend.schemas import LiveGameStatus, QuestionResponse, RoundStatus
+
+HOST_ID = 1
+
+
+@pytest.fixture
+def hub(db_manager):
+    store = RoundSessionStore(db_manager, flush_interval=60)
+    hub = LiveGameHub(AsyncTriviaDatabaseManager(db_manager), store, queue_size=12)
+    yield hub
+    store.close()
+
+
+def players(db_manager, count):
+    return [db_manager.create_user(f"live{i}@trivial.pub", f"live{i}") for i in range(count)]
+
+def drain(subscription) -> list[dict]:
+    events = []
+    while not subscription.queue.empty():
+        event = subscription.queue.get_nowait()
+        events.append(None if event is None else json.loads(event.data))
+    return events
+
+def stored_answers(db_manager):
+    with db_manager._pool.connection() as conn:
+        return conn.execute("SELECT user_id, answer_text, answered_correctly FROM RoundAnswers").fetchall()
+
+
+def test_game_pushes_questions_and_results(db_manager, hub):
+    first, second = players(db_manager, 2)
+
+    async def run():
+        game = await hub.create(HOST_ID, size=2)
+        subscription = hub.subscribe(game.game_id)
+        await hub.join(game.game_id, first)
+        await hub.join(game.game_id, second)
+
+        await hub.advance(game.game_id, HOST_ID)
+        question_id = hub.get(game.game_id).question_ids[0]
+        await hub.answer(game.game_id, first, f"Answer {question_id}")
+        await hub.answer(game.game_id, second, "no idea")  # Everyone answered, closes the question
+        assert hub.get(game.game_id).status == LiveGameStatus.RESULTS
+
+        await hub.advance(game.game_id, HOST_ID)
+        await hub.answer(game.game_id, first, "no idea")
+        info = await hub.advance(game.game_id, HOST_ID)  # Second player misses the last question
+        return info, drain(subscription)
+
+    info, events = asyncio.run(run())
+    assert info.status == LiveGameStatus.FINISHED
+    assert [event and event["event"] for event in events] == [
+        "state", "player_joined", "player_joined",
+        "question", "results", "question", "results", "finished", None
+    ]
+    results = events[4]
+    assert (results["answered"], results["correct"]) == (2, 1)
+    assert results["correct_answer"] == f"Answer {results['question_id']}"
+    assert events[6]["answered"] == 1
+    assert events[7]["standings"] == [{"user_id": first, "correct": 1}, {"user_id": second, "correct": 0}]
+
+    # Answers were buffered in the round store; completed rounds are flushed
+    answers = stored_answers(db_manager)
+    assert len(answers) == 4
+    assert sum(answer["answered_correctly"] for answer in answers) == 1
+    assert ("", 0) in [(answer["answer_text"], answer["answered_correctly"]) for answer in answers]
+    assert len(hub) == 0
+
+def test_late_player_catches_up(db_manager, hub):
+    early, late = players(db_manager, 2)
+
+    async def run():
+        game = await hub.create(HOST_ID, size=3)
+        await hub.join(game.game_id, early)
+        await hub.advance(game.game_id, HOST_ID)
+        await hub.advance(game.game_id, HOST_ID)  # Closes question 0 unanswered
+        await hub.advance(game.game_id, HOST_ID)
+        player = await hub.join(game.game_id, late)
+        assert await hub.join(game.game_id, late) == player
+        result = await hub.answer(game.game_id, late, "guess")
+        return player, result
+
+    player, result = asyncio.run(run())
+    assert result.current_index == 2
+    assert hub._sessions.get_round(player.round_id).round_status == RoundStatus.IN_PROGRESS
+
+def test_rejected_actions(db_manager, hub):
+    (player,) = players(db_manager, 1)
+
+    async def run():
+        game = await hub.create(HOST_ID, size=2)
+        with pytest.raises(PermissionError):
+            await hub.advance(game.game_id, player)
+        await hub.join(game.game_id, player)
+        with pytest.raises(ValueError):
+            await hub.answer(game.game_id, player, "too early")
+        await hub.advance(game.game_id, HOST_ID)
+        with pytest.raises(ValueError):
+            await hub.answer(game.game_id, HOST_ID, "not joined")
+        with pytest.raises(ValueError):
+            await hub.join(game.game_id, 999999)
+        with pytest.raises(ValueError):
+            hub.get(999)
+
+    asyncio.run(run())
+
+def test_slow_subscriber_is_dropped(db_manager, hub):
+    async def run():
+        game = await hub.create(HOST_ID, size=10)
+        subscription = hub.subscribe(game.game_id)
+        for _ in range(14):  # More events than the queue holds
+            await hub.advance(game.game_id, HOST_ID)
+        return hub.get(game.game_id), drain(subscription)
+
+    game, events = asyncio.run(run())
+    assert events == [None]
+    assert not game.subscriptions
+
+def test_host_closing_during_an_answer_closes_once(db_manager, hub, monkeypatch):
+    player, = players(db_manager, 1)
+
+    async def run():
+        game = await hub.create(HOST_ID, size=2)
+        subscription = hub.subscribe(game.game_id)
+        await hub.join(game.game_id, player)
+        await hub.advance(game.game_id, HOST_ID)
+
+        graded = asyncio.Event()
+        host_done = asyncio.Event()
+        run_db = hub._db.run
+        async def slow_run(fn, *args):
+            result = await run_db(fn, *args)
+            if fn == hub._sessions.answer:
+                graded.set()
+                await host_done.wait()  # The host closes the question while the answer is in flight
+            return result
+
+        monkeypatch.setattr(hub._db, "run", slow_run)
+        answer = asyncio.create_task(hub.answer(game.game_id, player, "no idea"))
+        await graded.wait()
+        info = await hub.advance(game.game_id, HOST_ID)
+        host_done.set()
+        await answer
+        return info, drain(subscription)
+
+    info, events = asyncio.run(run())
+    assert info.status == LiveGameStatus.RESULTS
+    assert [event and event["event"] for event in events] == ["state", "player_joined", "question", "results"]
+    hub._sessions.flush()
+    assert len(stored_answers(db_manager)) == 1  # Answered, not also recorded as missed
+
+def test_closing_survives_a_round_out_of_step(db_manager, hub):
+    first, second = players(db_manager, 2)
+
+    async def run():
+        game = await hub.create(HOST_ID, size=2)
+        subscription = hub.subscribe(game.game_id)
+        await hub.join(game.game_id, first)
+        await hub.join(game.game_id, second)
+        await hub.advance(game.game_id, HOST_ID)
+
+        # The first player's round moves on without the game knowing
+        question_id = hub.get(game.game_id).question_ids[0]
+        hub._sessions.answer(hub.get(game.game_id).players[first], QuestionResponse(question_id=question_id, text=""))
+
+        info = await hub.advance(game.game_id, HOST_ID)
+        return info, drain(subscription)
+
+    info, events = asyncio.run(run())
+    assert info.status == LiveGameStatus.RESULTS
+    assert events[-1]["event"] == "results"
+    hub._sessions.flush()
+    assert len(stored_answers(db_manager)) == 2  # Missed by the second player too
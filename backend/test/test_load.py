@@ -0,0 +1,111 @@
+import io
+import json
+import sqlite3
+import pytest
+from backend.database.load import bulk_load, iter_records, main, parse_question_record
+
+
+QUESTIONS_CSV = """question_id,category,difficulty,question_text
+1,geography,easy,What is the capital of Canada?
+2,geography,medium,What is the capital of Australia?
+3,geography,easy,what is the capital  of canada?
+4,geography,impossible,What is the capital of Mars?
+"""
+
+ANSWERS_CSV = """question_id,answer_text,is_correct
+1,Ottawa,1
+1,Toronto,0
+2,Canberra,1
+3,Ottawa,True
+"""
+
+
+def write(path, text):
+    path.write_text(text)
+    return path
+
+def test_bulk_load_csv(tmp_path):
+    db_path = str(tmp_path / "load.db")
+    questions = write(tmp_path / "questions.csv", QUESTIONS_CSV)
+    answers = write(tmp_path / "answers.csv", ANSWERS_CSV)
+
+    question_stats, answer_stats, _ = bulk_load(db_path, questions, answers, batch_size=2)
+
+    assert (question_stats.read, question_stats.inserted) == (4, 2)
+    assert (question_stats.duplicates, question_stats.invalid) == (1, 1)
+    # Answers of the duplicate question link to the question that was kept
+    assert answer_stats.inserted == 4
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT question_id, answer_text FROM TriviaAnswers WHERE is_correct = 1 ORDER BY answer_id"
+        ).fetchall()
+        assert rows == [(1, "Ottawa"), (2, "Canberra"), (1, "Ottawa")]
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_questions_category_difficulty" in indexes
+        # Full-text index rebuilt and its triggers restored after the load
+        assert conn.execute(
+            "SELECT rowid FROM QuestionsSearch WHERE QuestionsSearch MATCH 'australia'"
+        ).fetchall() == [(2,)]
+        triggers = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        assert "trg_questions_search_insert" in triggers
+
+def test_bulk_load_dedupes_against_existing_rows(tmp_path):
+    db_path = str(tmp_path / "load.db")
+    questions = write(tmp_path / "questions.csv", QUESTIONS_CSV)
+    answers = write(tmp_path / "answers.csv", ANSWERS_CSV)
+    bulk_load(db_path, questions, answers)
+
+    question_stats, answer_stats, _ = bulk_load(db_path, questions, answers)
+    assert question_stats.inserted == 0
+    assert answer_stats.inserted == 0  # Existing questions keep their answers
+
+def test_bulk_load_does_not_reuse_deleted_ids(tmp_path):
+    db_path = str(tmp_path / "load.db")
+    bulk_load(db_path, write(tmp_path / "questions.csv", QUESTIONS_CSV))
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM Questions WHERE question_id = 2")
+        conn.execute(
+            "INSERT INTO Questions (category, difficulty, question_text) VALUES ('art', 'easy', 'Who?')"
+        )  # Id 3, so sqlite_sequence records it
+        conn.execute("DELETE FROM Questions WHERE question_id = 3")
+
+    more = write(tmp_path / "more.csv", "category,difficulty,question_text\nart,hard,Who else?\n")
+    bulk_load(db_path, more)
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT question_id FROM Questions ORDER BY question_id").fetchall() == [(1,), (4,)]
+
+def test_bulk_load_ndjson_and_cli(tmp_path, capsys):
+    db_path = str(tmp_path / "load.db")
+    questions = tmp_path / "questions.ndjson"
+    questions.write_text("\n".join(json.dumps({
+        "category": "science", "difficulty": "hard", "question_text": f"Science question {i}?"
+    }) for i in range(25)))
+
+    main(["--db", db_path, "--questions", str(questions), "--batch-size", "10"])
+
+    assert "Questions: read 25, inserted 25" in capsys.readouterr().out
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM Questions").fetchone()[0] == 25
+
+
+def test_parse_question_record():
+    record = parse_question_record({"category": " Art ", "difficulty": "easy", "question_text": "Who?", "answer_text": "Me"})
+    assert (record.category, record.difficulty, record.question_text, record.answers) == ("art", "easy", "Who?", [("Me", 1)])
+    assert parse_question_record({"question_id": "3", "difficulty": "hard"}, update=True).question_id == 3
+
+    for record, update in [
+        ({"category": "art", "difficulty": "easy"}, False),
+        ({"category": "cooking", "difficulty": "easy", "question_text": "?"}, False),
+        ({"category": "art", "difficulty": "easy", "question_text": "?", "answers": [{"is_correct": 1}]}, False),
+        ({"question_text": "No id"}, True),
+        ({"question_id": 3}, True),
+        (["not", "a", "record"], False),
+    ]:
+        with pytest.raises(ValueError):
+            parse_question_record(record, update=update)
+
+
+def test_iter_records_json():
+    assert list(iter_records(io.StringIO('[{"question_id": 1}, 2]'), 'json')) == [{"question_id": 1}, 2]
+    with pytest.raises(ValueError):
+        list(iter_records(io.StringIO('{"question_id": 1}'), 'json'))
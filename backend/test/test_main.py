@@ -1,9 +1,19 @@
+import asyncio
+import json
+import pytest
 from fastapi.testclient import TestClient
-from backend.main import app
+from backend.database.index import QuestionIndex
+from backend.main import app, authenticator, db
 from backend.schemas import CategoryChoices, DifficultyChoices
 
 client = TestClient(app)
 
+
+@pytest.fixture
+def admin_headers():
+    token = authenticator.issue_token(1, "test-admin-session", admin=True)
+    return {"Authorization": f"Bearer {token}"}
+
 def test_get_root_response():
     response = client.get("/")
     url = "https://trivial.pub"
@@ -50,3 +60,343 @@ def test_get_questions_random_args_category_and_difficulty():
             assert response.json()["category"] == query_params["category"]
             assert response.json()["difficulty"] == query_params["difficulty"]
 
+
+def test_get_questions_paginated():
+    seen = []
+    after = None
+    while True:
+        params = {"limit": 7}
+        if after is not None:
+            params["after"] = after
+        response = client.get("/questions", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 7
+        seen.extend(question["question_id"] for question in page)
+        after = response.headers.get("X-Next-After")
+        if after is None:
+            break
+
+    assert seen == sorted(seen)
+    assert seen == [question["question_id"] for question in client.get("/questions").json()]
+
+def test_get_questions_by_category_paginated():
+    for category in CategoryChoices:
+        response = client.get(f"/questions/category/{category.value}", params={"limit": 2})
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        assert all(question["category"] == category.value for question in response.json())
+
+def test_get_questions_export_ndjson():
+    response = client.get("/questions/export", params={"difficulty": "hard"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == client.get("/questions/difficulty/hard").json()
+
+def test_round_lifecycle():
+    user_id = client.post("/users/create", params={"email": "round-player@trivial.pub"}).json()
+    round_info = client.post("/rounds/create", params={"user_id": user_id, "size": 3}).json()
+    assert round_info["question_count"] == 3
+    round_id = round_info["round_id"]
+
+    for index in range(3):
+        question = client.get(f"/rounds/{round_id}/questions/current")
+        assert question.status_code == 200
+        answer = {"question_id": question.json()["question_id"], "text": "Not it"}
+        result = client.post(f"/rounds/{round_id}/answers", json=answer)
+        assert result.status_code == 200
+        assert result.json()["current_index"] == index + 1
+
+        # The same question can't be answered twice
+        assert client.post(f"/rounds/{round_id}/answers", json=answer).status_code == 409
+
+    assert result.json()["round_status"] == "COMPLETED"
+    assert client.get(f"/rounds/{round_id}/questions/current").status_code == 404
+    assert client.get(f"/rounds/{round_id}").json()["round_status"] == "COMPLETED"
+
+def test_leaderboard_and_user_stats():
+    user_id = client.post("/users/create", params={"email": "ranked-player@trivial.pub"}).json()
+    round_id = client.post("/rounds/create", params={"user_id": user_id, "size": 2}).json()["round_id"]
+    for _ in range(2):
+        question = client.get(f"/rounds/{round_id}/questions/current").json()
+        client.post(f"/rounds/{round_id}/answers", json={"question_id": question["question_id"], "text": "?"})
+
+    stats = client.get(f"/users/{user_id}/stats").json()
+    assert stats["answered"] == 2
+    assert stats["rank"] >= 1
+    board = client.get("/leaderboard", params={"limit": 100}).json()
+    assert user_id in [entry["user_id"] for entry in board]
+    assert client.get("/users/999999/stats").status_code == 404
+
+def test_next_question_for_user():
+    user_id = client.post("/users/create", params={"email": "next-player@trivial.pub"}).json()
+    response = client.get(f"/users/{user_id}/questions/next", params={"category": "art"})
+    assert response.status_code == 200
+    assert response.json()["category"] == "art"
+
+def test_question_reads_are_conditional(admin_headers):
+    response = client.get("/questions/1")
+    etag = response.headers["etag"]
+    assert "max-age" in response.headers["cache-control"]
+
+    not_modified = client.get("/questions/1", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert client.get("/questions/category/art", headers={"If-None-Match": etag}).status_code == 304
+
+    assert "etag" not in client.get("/questions/random").headers
+
+    client.put(
+        "/questions/update/", params={"question_id": 1, "question_text": "Still a question?"}, headers=admin_headers
+    )
+    refreshed = client.get("/questions/1", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+def test_search_questions(admin_headers):
+    client.post("/questions/add/", params={"category": "art", "difficulty": "easy", "question_text": "Which composer wrote the Zylophonic Etudes?"}, headers=admin_headers)
+    response = client.get("/questions/search", params={"q": "zylophonic"})
+    assert response.status_code == 200
+    assert [q["question_text"] for q in response.json()] == ["Which composer wrote the Zylophonic Etudes?"]
+    assert client.get("/questions/search", params={"q": "zylophonic", "category": "music"}).json() == []
+    assert client.get("/questions/search").status_code == 422
+
+    duplicates = client.get("/questions/duplicates", params={"question_text": "which composer wrote zylophonic etudes"}).json()
+    assert duplicates[0]["question"]["question_text"] == "Which composer wrote the Zylophonic Etudes?"
+
+def test_batch_endpoints():
+    response = client.post("/questions/batch", json={"question_ids": [3, 999999, 1]})
+    assert response.status_code == 200
+    assert [q["question_id"] for q in response.json()["questions"]] == [3, 1]
+    assert response.json()["missing"] == [999999]
+    assert client.post("/questions/batch", json={"question_ids": []}).status_code == 422
+
+    correct_answer = client.get("/answers/3").json()
+    response = client.post("/answers/check/batch", json={"responses": [
+        {"question_id": 3, "text": correct_answer},
+        {"question_id": 999999, "text": "?"},
+    ]})
+    assert response.json() == {
+        "results": [{"question_id": 3, "answered_correctly": True, "correct_answer": correct_answer}],
+        "missing": [999999]
+    }
+
+def test_metrics_endpoint():
+    client.get("/questions/2")
+    body = client.get("/metrics").text
+    assert 'trivia_http_request_seconds_count{method="GET",route="/questions/{question_id}",status="200"}' in body
+    assert 'trivia_db_operation_seconds_count{operation="get_question_by_id"}' in body
+    assert "trivia_question_cache_requests_total" in body
+
+def test_round_not_found():
+    assert client.get("/rounds/999999").status_code == 404
+    assert client.get("/rounds/999999/questions/current").status_code == 404
+    assert client.post("/rounds/create", params={"user_id": 999999}).status_code == 404
+
+def test_question_response_is_graded():
+    question_id = client.get("/questions/random").json()["question_id"]
+    correct_answer = client.get(f"/answers/{question_id}").json()
+
+    response = client.post("/questions/responses/", json={"question_id": question_id, "text": correct_answer.upper()})
+    assert response.status_code == 200
+    assert response.json() == {"question_id": question_id, "answered_correctly": True, "correct_answer": correct_answer}
+
+    response = client.post("/questions/responses/", json={"question_id": question_id, "text": "definitely not it"})
+    assert response.json()["answered_correctly"] is False
+
+def test_live_game_over_websocket():
+    host = client.post("/users/create", params={"email": "live-host@trivial.pub"}).json()
+    player = client.post("/users/create", params={"email": "live-player@trivial.pub"}).json()
+    game = client.post("/games/create", params={"host_user_id": host, "size": 1}).json()
+    game_id = game["game_id"]
+    assert game["status"] == "LOBBY"
+
+    with client.websocket_connect(f"/games/{game_id}/ws?user_id={player}") as ws:
+        state = ws.receive_json()
+        assert state["event"] == "state" and state["game"]["players"] == 1
+
+        assert client.post(f"/games/{game_id}/next", params={"host_user_id": player}).status_code == 403
+        assert client.post(f"/games/{game_id}/next", params={"host_user_id": host}).json()["status"] == "QUESTION"
+        question = ws.receive_json()
+        assert question["event"] == "question" and question["index"] == 0
+
+        ws.send_json({"nope": 1})
+        assert ws.receive_json()["event"] == "error"
+        ws.send_json({"text": "guess"})
+        events = [ws.receive_json() for _ in range(3)]
+
+    assert [event["event"] for event in events] == ["answer_result", "results", "finished"]
+    assert events[0]["question_id"] == question["question"]["question_id"]
+    assert events[2]["standings"] == [{"user_id": player, "correct": int(events[0]["answered_correctly"])}]
+    assert client.get(f"/games/{game_id}").status_code == 404
+
+def test_live_game_events_stream():
+    from backend.main import live_game_events, live_games
+
+    async def run():
+        game = await live_games.create(1, size=1)
+        response = await live_game_events(game.game_id)
+        assert response.media_type == "text/event-stream"
+        chunks = [await anext(response.body_iterator)]
+        await live_games.advance(game.game_id, 1)
+        await live_games.advance(game.game_id, 1)
+        chunks += [chunk async for chunk in response.body_iterator]
+        return chunks
+
+    chunks = asyncio.run(run())
+    assert [chunk.split("\n")[0] for chunk in chunks] == [
+        "event: state", "event: question", "event: results", "event: finished"
+    ]
+    assert json.loads(chunks[1].split("data: ", 1)[1])["index"] == 0
+
+def test_rate_limits_by_route_cost(monkeypatch):
+    import backend.main as main
+    from backend.conf import Config
+    from backend.ratelimit import TokenBuckets
+    monkeypatch.setattr(Config, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(main, "ip_rate_limits", TokenBuckets(rate=0.1, burst=60, max_keys=10))
+    monkeypatch.setattr(main, "user_rate_limits", TokenBuckets(rate=0.1, burst=2, max_keys=10))
+
+    assert client.get("/questions").status_code == 200  # Costs 50 of 60
+    assert client.get("/questions/1").status_code == 200
+    response = client.get("/questions")
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert client.get("/metrics").status_code == 200  # Exempt
+
+    monkeypatch.setattr(main, "ip_rate_limits", TokenBuckets(rate=0.1, burst=60, max_keys=10))
+    assert client.get("/users/1/stats").status_code in (200, 404)
+    assert client.get("/users/1/questions/next").status_code == 200
+    assert client.get("/users/1/stats").status_code == 429  # Per-user bucket of 2
+    assert client.get("/users/2/stats").status_code != 429
+
+def test_rate_limits_charge_pages_and_revalidations_little(monkeypatch):
+    import backend.main as main
+    from backend.conf import Config
+    from backend.ratelimit import TokenBuckets
+    monkeypatch.setattr(Config, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(main, "ip_rate_limits", TokenBuckets(rate=0.1, burst=60, max_keys=10))
+
+    after, pages = 0, 0
+    while True:
+        response = client.get("/questions", params={"limit": 5, "after": after})
+        assert response.status_code == 200
+        pages += 1
+        if "x-next-after" not in response.headers:
+            break
+        after = response.headers["x-next-after"]
+    assert pages > 4
+
+    etag = client.get("/questions/category/art", params={"limit": 5}).headers["etag"]
+    for _ in range(10):
+        response = client.get("/questions", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    # Routes that don't paginate ignore limit, and so does their cost
+    monkeypatch.setattr(main, "ip_rate_limits", TokenBuckets(rate=0.1, burst=150, max_keys=10))
+    assert client.get("/questions/export", params={"limit": 1}).status_code == 200
+    assert client.get("/questions/export", params={"limit": 1}).status_code == 429
+
+def test_overload_is_shed_with_503(monkeypatch):
+    import backend.main as main
+    from backend.conf import Config
+    from backend.ratelimit import ConcurrencyLimiter
+    monkeypatch.setattr(Config, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(main, "admission", ConcurrencyLimiter(limit=0, max_waiting=0, timeout=0))
+
+    response = client.get("/questions/1")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(Config.ADMISSION_RETRY_AFTER)
+    assert "trivia_requests_rejected_total{reason=\"overloaded\"} 1" in client.get("/metrics").text
+
+def test_login_and_admin_routes(monkeypatch):
+    codes = {}
+    monkeypatch.setattr(authenticator, "_send_code", lambda email, code: codes.update({email: code}))
+    monkeypatch.setattr(authenticator, "_admin_emails", frozenset({"quizmaster@trivial.pub"}))
+    client.post("/users/create", params={"email": "quizmaster@trivial.pub"})
+    client.post("/users/create", params={"email": "punter@trivial.pub"})
+    add = {"category": "art", "difficulty": "easy", "question_text": "Who carved the Lion of Lucerne?"}
+
+    assert client.post("/questions/add/", params=add).status_code == 401
+    assert client.post("/auth/code", params={"email": "nobody@trivial.pub"}).status_code == 202
+    assert codes == {}
+
+    tokens = {}
+    for email in ("quizmaster@trivial.pub", "punter@trivial.pub"):
+        assert client.post("/auth/code", params={"email": email}).status_code == 202
+        wrong = "x" if codes[email] != "x" else "y"
+        assert client.post("/auth/login", json={"email": email, "code": wrong}).status_code == 401
+        response = client.post("/auth/login", json={"email": email, "code": codes[email]})
+        assert response.status_code == 200
+        tokens[email] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        # Codes are single use
+        assert client.post("/auth/login", json={"email": email, "code": codes[email]}).status_code == 401
+
+    assert client.post("/questions/add/", params=add, headers=tokens["punter@trivial.pub"]).status_code == 403
+    admin = tokens["quizmaster@trivial.pub"]
+    assert client.post("/questions/add/", params=add, headers=admin).status_code == 200
+
+    refreshed = client.post("/auth/refresh", headers=admin)
+    assert refreshed.status_code == 200
+    assert client.post("/auth/logout", headers=admin).status_code == 204
+    assert client.post("/questions/add/", params=add, headers=admin).status_code == 401
+    # Every token of the session is revoked, including refreshed ones
+    new_token = {"Authorization": f"Bearer {refreshed.json()['access_token']}"}
+    assert client.delete("/questions/delete/", params={"question_id": 1}, headers=new_token).status_code == 401
+
+
+
+def test_bulk_question_routes(admin_headers):
+    upload = (
+        "category,difficulty,question_text,answer_text\r\n"
+        "art,easy,Who painted the Mona Lisa?,Leonardo\r\n"
+        "art,trivial,Not a difficulty?,No\r\n"
+    )
+    assert client.post("/questions/add/bulk", content=upload, headers={"Content-Type": "text/csv"}).status_code == 401
+    response = client.post("/questions/add/bulk", content=upload, headers={**admin_headers, "Content-Type": "text/csv"})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["applied"] == 1
+    assert [error["row"] for error in result["errors"]] == [2]
+    question_id = result["question_ids"][0]
+    assert client.get(f"/answers/{question_id}").json() == "Leonardo"
+
+    updates = json.dumps({"question_id": question_id, "difficulty": "hard"}) + "\n"
+    response = client.put(
+        "/questions/update/bulk", content=updates, headers={**admin_headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.json()["question_ids"] == [question_id]
+    assert client.get(f"/questions/{question_id}").json()[0]["difficulty"] == "hard"
+
+    response = client.request("DELETE", "/questions/delete/bulk", json=[question_id], headers=admin_headers)
+    assert response.json() == {"applied": 1, "question_ids": [question_id], "errors": []}
+    assert client.get(f"/questions/{question_id}").json() == []
+
+    bad = client.post("/questions/add/bulk", content="x", headers={**admin_headers, "Content-Type": "text/plain"})
+    assert bad.status_code == 415
+    bad = client.post("/questions/add/bulk", content="[", headers={**admin_headers, "Content-Type": "application/json"})
+    assert bad.status_code == 400
+
+
+def test_question_stats_and_empty_buckets(monkeypatch):
+    response = client.get("/questions/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total"] == sum(stats["categories"].values()) == sum(stats["difficulties"].values())
+    assert stats["buckets"]["art"]["easy"] > 0
+
+    # Empty the art/easy bucket in memory only: the routes must answer without the DB
+    index = QuestionIndex()
+    index.load([
+        (question_id, category, difficulty)
+        for question_id, (category, difficulty) in db.sync._index._keys.items()
+        if (category, difficulty) != ("art", "easy")
+    ])
+    monkeypatch.setattr(db.sync, "_index", index)
+    assert client.get("/questions/stats").json()["buckets"]["art"]["easy"] == 0
+    empty = {"category": "art", "difficulty": "easy"}
+    assert client.get("/questions/random", params=empty).status_code == 404
+    assert client.get("/questions", params=empty).status_code == 404
+    assert client.get("/questions", params={**empty, "limit": 5}).status_code == 404
+    assert client.get("/questions/random", params={"category": "art"}).status_code == 200
@@ -0,0 +1,81 @@
+import logging
+import sqlite3
+import time
+from backend.conf import Config
+from backend.database.instrumentation import (
+    DB_OPERATION_SECONDS, DB_QUERY_SECONDS, InstrumentedConnection, _operation
+)
+from backend.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Test latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, ("/x",))
+
+    lines = list(histogram.render())
+    assert lines[:2] == ["# HELP latency_seconds Test latency.", "# TYPE latency_seconds histogram"]
+    assert lines[2:] == [
+        'latency_seconds_bucket{route="/x",le="0.1"} 1',
+        'latency_seconds_bucket{route="/x",le="1.0"} 3',
+        'latency_seconds_bucket{route="/x",le="+Inf"} 4',
+        'latency_seconds_sum{route="/x"} 6.05',
+        'latency_seconds_count{route="/x"} 4',
+    ]
+
+def test_registry_renders_collectors():
+    registry = MetricsRegistry()
+    assert registry.histogram("a_seconds", "A.") is registry.histogram("a_seconds", "A.")
+
+    def collector():
+        yield "items", "gauge", "Items held.", [({"kind": 'say "hi"'}, 3)]
+    registry.register_collector(collector)
+    assert 'items{kind="say \\"hi\\""} 3' in registry.render()
+
+    registry.unregister_collector(collector)
+    assert "items" not in registry.render()
+
+def test_queries_are_attributed_to_operations(db_manager):
+    def count(histogram, operation):
+        return histogram.snapshot().get((operation,), ([], 0.0, 0))[2]
+
+    operations = count(DB_OPERATION_SECONDS, "get_questions_page")
+    queries = count(DB_QUERY_SECONDS, "get_questions_page")
+    db_manager.get_questions_page(limit=5)
+    assert count(DB_OPERATION_SECONDS, "get_questions_page") == operations + 1
+    assert count(DB_QUERY_SECONDS, "get_questions_page") == queries + 1
+
+def test_slow_queries_are_logged_with_plan(db_manager, monkeypatch, caplog):
+    monkeypatch.setattr(Config, "SLOW_QUERY_SECONDS", 0.0)
+    with caplog.at_level(logging.WARNING, logger="backend.database.instrumentation"):
+        db_manager.get_question_by_id(7)
+
+    message = caplog.records[-1].getMessage()
+    assert "Slow query in get_question_by_id" in message
+    assert "parameters: (7,)" in message
+    assert "SEARCH Questions USING INTEGER PRIMARY KEY" in message
+
+def test_query_time_includes_fetching_rows(tmp_path, monkeypatch, caplog):
+    conn = sqlite3.connect(tmp_path / "slow.db", factory=InstrumentedConnection)
+    conn.create_function("slow", 1, lambda value: time.sleep(0.02) or value)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(5)])
+    monkeypatch.setattr(Config, "SLOW_QUERY_SECONDS", 0.09)
+
+    def total(operation):
+        return DB_QUERY_SECONDS.snapshot().get((operation,), ([], 0.0, 0))[1:]
+
+    token = _operation.set("fetch_probe")
+    try:
+        with caplog.at_level(logging.WARNING, logger="backend.database.instrumentation"):
+            cursor = conn.cursor()
+            cursor.execute("SELECT slow(x) FROM t")  # Only the first row is computed here
+            assert len(cursor.fetchall()) == 5
+    finally:
+        _operation.reset(token)
+        conn.close()
+
+    seconds, count = total("fetch_probe")
+    assert count == 1
+    assert seconds >= 0.1
+    assert "Slow query in fetch_probe" in caplog.text
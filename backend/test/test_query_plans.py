@@ -0,0 +1,152 @@
+import shutil
+import sqlite3
+from pathlib import Path
+import pytest
+from backend.database.db import TriviaDatabaseManager
+from backend.database.migrations import MIGRATIONS, migrate
+from backend.schemas import CategoryChoices, DifficultyChoices, QuestionResponse, RoundStatus
+
+LEGACY_DB_PATH = Path(__file__).resolve().parents[1] / "database" / "test.db"
+
+# Methods that read whole tables on purpose
+FULL_SCAN_ALLOWED = {
+    "load_question_index", "get_all_questions", "iter_questions", "load_user_stats", "reconcile_user_stats",
+    "warm_up", "reload",
+    # RevokedSessions only holds unexpired rows, a handful at most
+    "get_revoked_sessions", "start_session", "end_session",
+    # sqlite_sequence has one row per AUTOINCREMENT table
+    "import_questions"
+}
+
+
+def query_plan(conn: sqlite3.Connection, sql: str) -> list[str]:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+def scans(plan: list[str]) -> list[str]:
+    # Virtual table "scans" are FTS5 index lookups
+    return [step for step in plan if step.startswith("SCAN") and "VIRTUAL TABLE" not in step]
+
+
+@pytest.fixture
+def traced_manager(db_path):
+    """Manager with a single pooled connection whose statements are recorded."""
+    manager = TriviaDatabaseManager(db_path=db_path, pool_size=1, cache_size=0)
+    statements = []
+    with manager._pool.connection() as conn:
+        conn.set_trace_callback(statements.append)
+    yield manager, statements
+    manager.close()
+
+
+def exercise(manager: TriviaDatabaseManager):
+    """Call every query method once; yields (method name, callable)."""
+    user_id = 1
+    yield "get_question_by_id", lambda: manager.get_question_by_id(1)
+    yield "get_question_by_category", lambda: manager.get_question_by_category(CategoryChoices.ART)
+    yield "get_question_by_difficulty", lambda: manager.get_question_by_difficulty(DifficultyChoices.HARD)
+    yield "get_questions_by_category_and_difficulty", lambda: manager.get_questions_by_category_and_difficulty(
+        CategoryChoices.ART, DifficultyChoices.HARD
+    )
+    yield "get_all_questions", manager.get_all_questions
+    yield "get_questions_page", lambda: manager.get_questions_page(CategoryChoices.ART, after=1, limit=2)
+    yield "get_questions_page", lambda: manager.get_questions_page(difficulty=DifficultyChoices.EASY, limit=2)
+    yield "iter_questions", lambda: list(manager.iter_questions(category=CategoryChoices.ART))
+    yield "iter_questions", lambda: list(manager.iter_questions())
+    yield "get_random_question", lambda: manager.get_random_question(difficulty=DifficultyChoices.HARD)
+    yield "get_correct_answer_by_question_id", lambda: manager.get_correct_answer_by_question_id(1)
+    yield "get_questions_by_ids", lambda: manager.get_questions_by_ids([4, 1, 999])
+    yield "load_question_index", manager.load_question_index
+    yield "add_question", lambda: manager.add_question(CategoryChoices.ART, DifficultyChoices.EASY, "Plan?")
+    yield "update_question", lambda: manager.update_question(2, question_text="Plan updated?")
+    yield "delete_question", lambda: manager.delete_question(3)
+    yield "import_questions", lambda: manager.import_questions(
+        [{"category": "art", "difficulty": "easy", "question_text": "Bulk plan?", "answer_text": "Yes"}]
+    )
+    yield "update_questions", lambda: manager.update_questions(
+        [{"question_id": 2, "answers": [{"answer_text": "Planned", "is_correct": 1}]}]
+    )
+    yield "delete_questions", lambda: manager.delete_questions([4, 5])
+    yield "create_round", lambda: manager.create_round(user_id)
+    yield "get_round_by_id", lambda: manager.get_round_by_id(1)
+    yield "get_answered_question_ids", lambda: manager.get_answered_question_ids(user_id)
+    yield "get_next_question", lambda: manager.get_next_question(user_id, category=CategoryChoices.ART)
+    yield "get_round_current_unanswered_question", lambda: manager.get_round_current_unanswered_question(1)
+    yield "answer_round_question", lambda: manager.answer_round_question(
+        1, QuestionResponse(question_id=manager.get_round_current_unanswered_question(1).question_id, text="x")
+    )
+    yield "search_questions", lambda: manager.search_questions("question", category=CategoryChoices.ART)
+    yield "find_duplicate_questions", lambda: manager.find_duplicate_questions("A hard art question?")
+    yield "reconcile_user_stats", manager.reconcile_user_stats
+    yield "load_user_stats", manager.load_user_stats
+    stats = manager.load_user_stats()
+    yield "save_round_progress", lambda: manager.save_round_progress([], [], stats)
+    yield "sync_changes", manager.sync_changes
+    yield "warm_up", manager.warm_up
+    yield "set_mfa_code", lambda: manager.set_mfa_code("player@trivial.pub", "hashed", 60)
+    yield "get_mfa_code", lambda: manager.get_mfa_code("player@trivial.pub")
+    yield "fail_mfa_code", lambda: manager.fail_mfa_code(user_id, "hashed", 5)
+    yield "start_session", lambda: manager.start_session(user_id, "hashed", "session", 2_000_000_000)
+    yield "refresh_session", lambda: manager.refresh_session(user_id, "session")
+    yield "end_session", lambda: manager.end_session(user_id, "session", 2_000_000_000)
+    yield "get_revoked_sessions", manager.get_revoked_sessions
+
+
+def test_queries_do_not_scan(traced_manager):
+    manager, statements = traced_manager
+    failures = []
+    with sqlite3.connect(manager._db_path) as plan_conn:
+        for name, call in exercise(manager):
+            statements.clear()
+            call()
+            for sql in statements:
+                if not sql.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT")):
+                    continue
+                table_scans = scans(query_plan(plan_conn, sql))
+                if table_scans and name not in FULL_SCAN_ALLOWED:
+                    failures.append((name, " ".join(sql.split()), table_scans))
+
+    assert failures == []
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM Questions WHERE category = 'art' AND difficulty = 'easy'",
+    "SELECT * FROM Questions WHERE category = 'art'",
+    "SELECT * FROM Questions WHERE difficulty = 'easy'",
+    "SELECT answer_text FROM TriviaAnswers WHERE is_correct = 1 AND question_id = 1",
+    "SELECT * FROM TriviaAnswers WHERE question_id = 1",
+    "SELECT question_id FROM RoundQuestions WHERE round_id = 1 AND ordinal = 0",
+    "SELECT question_id FROM RoundAnswers WHERE user_id = 1",
+    "SELECT round_id FROM Rounds WHERE user_id = 1",
+])
+def test_access_patterns_use_indexes(db_path, sql):
+    with sqlite3.connect(db_path) as conn:
+        migrate(conn)
+        assert scans(query_plan(conn, sql)) == []
+
+def test_migrate_upgrades_legacy_database(tmp_path):
+    path = tmp_path / "legacy.db"
+    shutil.copyfile(LEGACY_DB_PATH, path)
+    with sqlite3.connect(path) as conn:
+        answers = conn.execute("SELECT COUNT(*) FROM Answers").fetchone()[0]
+
+        assert migrate(conn) == len(MIGRATIONS)
+        assert migrate(conn) == len(MIGRATIONS)  # idempotent
+
+        assert conn.execute("SELECT COUNT(*) FROM TriviaAnswers").fetchone()[0] == answers
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(Rounds)")}
+        assert {"round_status", "current_index"} <= columns
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(RoundQuestions)")}
+        assert "ordinal" in columns
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_trivia_answers_correct" in indexes
+        assert "idx_round_answers_user" in indexes
+
+    # Every round answer query must run on the legacy table layout too
+    manager = TriviaDatabaseManager(db_path=str(path), pool_size=1)
+    try:
+        user_id = manager.create_user("legacy@trivial.pub", "legacy")
+        round_id = manager.create_round(user_id, question_ids=[1]).round_id
+        manager.save_round_progress([(round_id, 1, user_id, "guess", True)], [(round_id, 1, RoundStatus.COMPLETED)], [])
+        records = {record.user_id: record for record in manager.reconcile_user_stats()}
+        assert (records[user_id].answered, records[user_id].correct) == (1, 1)
+    finally:
+        manager.close()
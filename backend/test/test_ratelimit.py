@@ -0,0 +1,45 @@
+import asyncio
+import pytest
+from backend.ratelimit import ConcurrencyLimiter, TokenBuckets
+
+
+def test_bucket_spends_and_refills():
+    buckets = TokenBuckets(rate=2.0, burst=10.0, max_keys=10)
+    assert buckets.acquire("a", cost=8, now=0.0) == 0.0
+    assert buckets.acquire("a", cost=4, now=0.0) == pytest.approx(1.0)  # 2 tokens short at 2/s
+    assert buckets.acquire("b", cost=4, now=0.0) == 0.0  # Keys are independent
+    assert buckets.acquire("a", cost=4, now=1.0) == 0.0
+    assert buckets.rejected == 1
+
+    # Refills stop at the burst size, and costs above it are capped
+    assert buckets.acquire("a", cost=100, now=1000.0) == 0.0
+    assert buckets.acquire("a", cost=1, now=1000.0) == pytest.approx(0.5)
+
+def test_least_recently_seen_keys_are_dropped():
+    buckets = TokenBuckets(rate=1.0, burst=1.0, max_keys=2)
+    for key in ("a", "b", "a", "c"):
+        buckets.acquire(key, now=0.0)
+    assert len(buckets) == 2
+    assert buckets.acquire("b", now=0.0) == 0.0  # Forgotten, so full again
+    assert buckets.acquire("a", now=0.0) == 0.0
+    assert buckets.acquire("a", now=0.0) > 0
+
+def test_concurrency_limiter_queues_then_sheds():
+    async def run():
+        limiter = ConcurrencyLimiter(limit=1, max_waiting=1, timeout=1.0)
+        assert await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        assert not await limiter.acquire()  # Queue full, shed at once
+
+        limiter.release()
+        assert await waiter
+        assert limiter.in_flight == 1
+
+        limiter = ConcurrencyLimiter(limit=1, max_waiting=1, timeout=0.01)
+        await limiter.acquire()
+        assert not await limiter.acquire()  # Timed out waiting
+        return limiter.rejected
+
+    assert asyncio.run(run()) == 1
@@ -0,0 +1,72 @@
+import pytest
+from backend.schemas import CategoryChoices, DifficultyChoices, QuestionResponse, RoundStatus
+
+USER_ID = 1  # Seeded by the db_path fixture
+
+
+def round_question_ids(db_manager, round_id):
+    with db_manager._pool.connection() as conn:
+        rows = conn.execute(
+            "SELECT ordinal, question_id FROM RoundQuestions WHERE round_id = ? ORDER BY ordinal",
+            (round_id,)
+        ).fetchall()
+    assert [row["ordinal"] for row in rows] == list(range(len(rows)))
+    return [row["question_id"] for row in rows]
+
+def play(db_manager, round_id, correct=True):
+    results = []
+    while (question := db_manager.get_round_current_unanswered_question(round_id)) is not None:
+        text = f"answer {question.question_id}" if correct else "nope"
+        results.append(db_manager.answer_round_question(
+            round_id, QuestionResponse(question_id=question.question_id, text=text)
+        ))
+    return results
+
+def test_create_round_materializes_questions(db_manager):
+    round_info = db_manager.create_round(USER_ID, size=6, difficulty=DifficultyChoices.HARD)
+    assert round_info.round_status == RoundStatus.IN_PROGRESS
+    assert (round_info.current_index, round_info.question_count) == (0, 6)
+
+    question_ids = round_question_ids(db_manager, round_info.round_id)
+    assert len(set(question_ids)) == 6
+    for question_id in question_ids:
+        assert db_manager.get_question_by_id(question_id)[0].difficulty == "hard"
+
+def test_create_round_mixes_buckets(db_manager):
+    round_info = db_manager.create_round(USER_ID, size=3, category=CategoryChoices.SCIENCE)
+    questions = [db_manager.get_question_by_id(i)[0] for i in round_question_ids(db_manager, round_info.round_id)]
+    assert {question.difficulty for question in questions} == {"easy", "medium", "hard"}
+
+def test_round_is_played_in_order(db_manager):
+    round_info = db_manager.create_round(USER_ID, size=4)
+    question_ids = round_question_ids(db_manager, round_info.round_id)
+
+    results = play(db_manager, round_info.round_id)
+
+    assert [result.question_id for result in results] == question_ids
+    assert all(result.answered_correctly for result in results)
+    assert results[-1].round_status == RoundStatus.COMPLETED
+    assert db_manager.get_round_by_id(round_info.round_id).round_status == RoundStatus.COMPLETED
+
+def test_create_round_skips_answered_questions(db_manager):
+    first = db_manager.create_round(USER_ID, size=3, category=CategoryChoices.ART)
+    play(db_manager, first.round_id, correct=False)
+
+    # Only the three art questions exist, so a second round has to reuse them
+    second = db_manager.create_round(USER_ID, size=3, category=CategoryChoices.ART)
+    assert set(round_question_ids(db_manager, second.round_id)) == db_manager.get_answered_question_ids(USER_ID)
+
+    history = db_manager.create_round(USER_ID, size=27)  # Everything not yet answered
+    assert not set(round_question_ids(db_manager, history.round_id)) & db_manager.get_answered_question_ids(USER_ID)
+
+def test_answer_must_match_current_question(db_manager):
+    round_info = db_manager.create_round(USER_ID, size=2)
+    current = db_manager.get_round_current_unanswered_question(round_info.round_id)
+    with pytest.raises(ValueError):
+        db_manager.answer_round_question(
+            round_info.round_id, QuestionResponse(question_id=current.question_id + 1000, text="x")
+        )
+
+def test_create_round_unknown_user(db_manager):
+    with pytest.raises(ValueError):
+        db_manager.create_round(404)
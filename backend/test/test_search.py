@@ -0,0 +1,44 @@
+from backend.database.search import fts_query, text_similarity
+from backend.schemas import CategoryChoices, DifficultyChoices
+
+
+def test_fts_query_quotes_terms():
+    assert fts_query("Capital of France?") == '"capital" "of" "france"*'
+    assert fts_query('NEAR("x" OR y)', match_any=True, prefix=False) == '"near" OR "x" OR "or" OR "y"'
+    assert fts_query(" ?! ") is None
+
+def test_text_similarity():
+    assert text_similarity("What is the capital of France?", "what is the CAPITAL of france") == 1.0
+    assert text_similarity("What is the capital of France?", "Who painted the Mona Lisa?") < 0.3
+    assert text_similarity("", "anything") == 0.0
+
+def test_search_ranks_and_filters(db_manager):
+    db_manager.add_question(CategoryChoices.GEOGRAPHY, DifficultyChoices.EASY, "What is the capital of France?")
+    db_manager.add_question(CategoryChoices.HISTORY, DifficultyChoices.HARD, "Which capital city was founded by Romans?")
+
+    assert [q.question_text for q in db_manager.search_questions("capital france")] == [
+        "What is the capital of France?"
+    ]
+    assert len(db_manager.search_questions("capit")) == 2  # Prefix match on the last word
+    assert [q.category for q in db_manager.search_questions("capital", category=CategoryChoices.HISTORY)] == ["history"]
+    assert len(db_manager.search_questions("capital", limit=1)) == 1
+    assert db_manager.search_questions("capital", offset=2) == []
+
+def test_search_index_follows_writes(db_manager):
+    added = db_manager.add_question(CategoryChoices.SCIENCE, DifficultyChoices.EASY, "What is the boiling point of water?")
+    assert [q.question_id for q in db_manager.search_questions("boiling")] == [added.question_id]
+
+    db_manager.update_question(added.question_id, question_text="What is the freezing point of water?")
+    assert db_manager.search_questions("boiling") == []
+    assert [q.question_id for q in db_manager.search_questions("freezing")] == [added.question_id]
+
+    db_manager.delete_question(added.question_id)
+    assert db_manager.search_questions("freezing") == []
+
+def test_find_duplicate_questions(db_manager):
+    original = db_manager.add_question(CategoryChoices.ART, DifficultyChoices.EASY, "Who painted the Mona Lisa?")
+    db_manager.add_question(CategoryChoices.ART, DifficultyChoices.EASY, "Who sculpted the statue of David?")
+
+    duplicates = db_manager.find_duplicate_questions("who painted THE mona lisa")
+    assert [(question.question_id, score) for question, score in duplicates] == [(original.question_id, 1.0)]
+    assert db_manager.find_duplicate_questions("Who wrote Hamlet?") == []
@@ -0,0 +1,66 @@
+import pytest
+from backend.database.seen import SeenBitmap, SeenQuestions
+from backend.schemas import CategoryChoices, DifficultyChoices, QuestionResponse
+
+USER_ID = 1
+
+
+def test_bitmap_set_operations():
+    bitmap = SeenBitmap([3, 17, 17, 1000])
+    assert len(bitmap) == 3
+    assert 17 in bitmap and 1000 in bitmap
+    assert 4 not in bitmap and 5000 not in bitmap and -1 not in bitmap
+    assert sorted(bitmap) == [3, 17, 1000]
+
+    bitmap.discard(17)
+    bitmap.discard(18)
+    assert 17 not in bitmap and len(bitmap) == 2
+
+    combined = bitmap | {4}
+    assert 4 in combined and 4 not in bitmap
+
+def test_seen_questions_loads_lazily_and_evicts():
+    loads = []
+    def loader(user_id):
+        loads.append(user_id)
+        return [user_id]
+
+    seen = SeenQuestions(loader, maxsize=2)
+    assert 1 in seen.get(1)
+    seen.mark(1, 10)
+    assert 10 in seen.get(1)
+    assert loads == [1]
+
+    seen.get(2)
+    seen.get(3)
+    assert 1 not in seen and len(seen) == 2
+    seen.get(1)
+    assert loads == [1, 2, 3, 1]
+
+    seen.discard_question(1)
+    assert 1 not in seen.get(1)
+
+def test_next_question_prefers_unseen(db_manager):
+    seen = set()
+    for _ in range(3):
+        question = db_manager.get_next_question(USER_ID, category=CategoryChoices.ART)
+        assert question.question_id not in seen
+        seen.add(question.question_id)
+        db_manager.mark_question_seen(USER_ID, question.question_id)
+
+    # All three art questions seen, falls back to a repeat
+    assert db_manager.get_next_question(USER_ID, category=CategoryChoices.ART).question_id in seen
+
+def test_next_question_tracks_round_answers(db_manager):
+    round_info = db_manager.create_round(USER_ID, size=1, category=CategoryChoices.ART, difficulty=DifficultyChoices.EASY)
+    question = db_manager.get_round_current_unanswered_question(round_info.round_id)
+    db_manager.get_next_question(USER_ID)  # Loads the seen-set before the answer
+    db_manager.answer_round_question(round_info.round_id, QuestionResponse(question_id=question.question_id, text="x"))
+
+    for _ in range(10):
+        assert db_manager.get_next_question(USER_ID).question_id != question.question_id
+
+def test_next_question_without_matches(db_manager):
+    db_manager.delete_question(db_manager.get_next_question(USER_ID, CategoryChoices.ART, DifficultyChoices.EASY).question_id)
+    with pytest.raises(IndexError):
+        db_manager.get_next_question(USER_ID, CategoryChoices.ART, DifficultyChoices.EASY)
@@ -0,0 +1,31 @@
+from backend.bench.serialization import run
+from backend.schemas import Question
+from backend.serialization import QUESTION_LIST_JSON, encode_questions, question_from_row
+
+ROW = (7, "hard", "art", 'Who painted "The Scream"?')
+
+
+def test_question_from_row_matches_validated_model():
+    question = question_from_row(ROW)
+    validated = Question(question_id=7, difficulty="hard", category="art", question_text='Who painted "The Scream"?')
+    assert question == validated
+    assert question.model_dump() == validated.model_dump()
+    assert question.model_fields_set == validated.model_fields_set
+    assert Question.model_validate(question) == validated
+
+def test_db_built_questions_can_be_edited_and_copied(db_manager):
+    question, other = db_manager.get_questions_by_ids([1, 2])[0]
+    copy = question.model_copy(update={"question_text": "Copied?"})
+    question.question_text = "Edited?"
+    assert (question.question_text, copy.question_text) == ("Edited?", "Copied?")
+    assert other.question_text == "A medium geography question?"  # Field sets are not shared between rows
+    assert question.model_fields_set is not other.model_fields_set
+
+def test_encode_questions_matches_pydantic():
+    questions = [question_from_row(ROW), question_from_row((8, "easy", "music", "Ünïcode?"))]
+    assert encode_questions(questions) == QUESTION_LIST_JSON.dump_json(questions)
+    assert encode_questions([]) == b"[]"
+
+def test_serialization_benchmark_runs():
+    timings = run(questions=200, repeat=1)
+    assert set(timings) == {"validated", "lean"}
@@ -0,0 +1,124 @@
+import time
+import pytest
+from backend.database.sessions import RoundSessionStore
+from backend.schemas import QuestionResponse, RoundStatus
+
+USER_ID = 1
+
+
+def stored_answers(db_manager):
+    with db_manager._pool.connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM RoundAnswers").fetchone()[0]
+
+def stored_index(db_manager, round_id):
+    with db_manager._pool.connection() as conn:
+        return conn.execute("SELECT current_index FROM Rounds WHERE round_id = ?", (round_id,)).fetchone()[0]
+
+def answer_current(store, round_id):
+    question = store.current_question(round_id)
+    return store.answer(round_id, QuestionResponse(question_id=question.question_id, text="guess"))
+
+@pytest.fixture
+def store(db_manager):
+    store = RoundSessionStore(db_manager, flush_interval=60, idle_timeout=60)
+    yield store
+    store.close()
+
+def test_answers_are_buffered_until_flush(db_manager, store):
+    round_id = db_manager.create_round(USER_ID, size=3).round_id
+    answer_current(store, round_id)
+    answer_current(store, round_id)
+
+    assert store.get_round(round_id).current_index == 2
+    assert stored_answers(db_manager) == 0
+    assert stored_index(db_manager, round_id) == 0
+
+    store.flush()
+    assert stored_answers(db_manager) == 2
+    assert stored_index(db_manager, round_id) == 2
+
+def test_completed_round_is_flushed_and_released(db_manager, store):
+    round_id = db_manager.create_round(USER_ID, size=2).round_id
+    answer_current(store, round_id)
+    result = answer_current(store, round_id)
+
+    assert result.round_status == RoundStatus.COMPLETED
+    assert round_id not in store
+    assert stored_answers(db_manager) == 2
+    assert db_manager.get_round_by_id(round_id).round_status == RoundStatus.COMPLETED
+    assert store.current_question(round_id) is None
+
+def test_failed_completion_flush_keeps_the_answer(db_manager, store, monkeypatch):
+    round_id = db_manager.create_round(USER_ID, size=2).round_id
+    answer_current(store, round_id)
+    save_round_progress = db_manager.save_round_progress
+    def failing_save(*args):
+        raise RuntimeError("disk I/O error")
+
+    monkeypatch.setattr(db_manager, "save_round_progress", failing_save)
+    result = answer_current(store, round_id)  # Applied, so no error for the client to retry on
+    assert result.round_status == RoundStatus.COMPLETED
+    assert round_id in store
+    assert stored_answers(db_manager) == 0
+    with pytest.raises(ValueError):  # A retry is refused, not counted twice
+        store.answer(round_id, QuestionResponse(question_id=result.question_id, text="guess"))
+
+    monkeypatch.setattr(db_manager, "save_round_progress", save_round_progress)
+    store.flush()
+    assert stored_answers(db_manager) == 2
+    assert db_manager.get_round_by_id(round_id).round_status == RoundStatus.COMPLETED
+
+def test_close_flushes_pending_answers(db_manager):
+    store = RoundSessionStore(db_manager, flush_interval=60)
+    round_id = db_manager.create_round(USER_ID, size=3).round_id
+    answer_current(store, round_id)
+    store.close()
+    assert stored_answers(db_manager) == 1
+
+def test_background_flusher(db_manager):
+    store = RoundSessionStore(db_manager, flush_interval=0.01)
+    store.start()
+    round_id = db_manager.create_round(USER_ID, size=3).round_id
+    answer_current(store, round_id)
+
+    deadline = time.monotonic() + 2
+    while stored_answers(db_manager) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    store.close()
+    assert stored_answers(db_manager) == 1
+
+def test_idle_sessions_are_evicted(db_manager):
+    store = RoundSessionStore(db_manager, flush_interval=60, idle_timeout=0)
+    round_id = db_manager.create_round(USER_ID, size=3).round_id
+    answer_current(store, round_id)
+    store.evict_idle()
+
+    assert round_id not in store
+    assert stored_answers(db_manager) == 1
+    # Reloaded from the database where it left off
+    assert store.get_round(round_id).current_index == 1
+    store.close()
+
+def test_answer_must_match_current_question(db_manager, store):
+    round_id = db_manager.create_round(USER_ID, size=2).round_id
+    question = store.current_question(round_id)
+    with pytest.raises(ValueError):
+        store.answer(round_id, QuestionResponse(question_id=question.question_id + 1000, text="x"))
+
+def test_unknown_round(store):
+    with pytest.raises(ValueError):
+        store.get(999)
+
+def test_write_through_store_persists_each_answer(db_manager):
+    store = RoundSessionStore(db_manager, flush_interval=60, write_through=True)
+    round_id = db_manager.create_round(USER_ID, size=3).round_id
+    question = store.current_question(round_id)
+    store.answer(round_id, QuestionResponse(question_id=question.question_id, text="guess"))
+
+    assert stored_answers(db_manager) == 1
+    assert stored_index(db_manager, round_id) == 1
+    assert round_id not in store
+    # A second worker answering the same question sees it was already taken
+    with pytest.raises(ValueError):
+        store.answer(round_id, QuestionResponse(question_id=question.question_id, text="guess"))
+    store.close()
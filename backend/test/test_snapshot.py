@@ -0,0 +1,145 @@
+import sqlite3
+import pytest
+from backend.database.db import TriviaDatabaseManager
+from backend.database.snapshot import QuestionSnapshot
+from backend.schemas import CategoryChoices, DifficultyChoices
+
+QUESTIONS = [
+    (3, "art", "easy", "Who painted the Mona Lisa?"),
+    (7, "art", "hard", "Which café did Picasso frequent?"),
+    (9, "music", "easy", "Who wrote Für Elise?"),
+]
+ANSWERS = [(3, "Leonardo"), (3, "da Vinci"), (9, "Beethoven")]
+
+
+@pytest.fixture
+def snapshot():
+    return QuestionSnapshot.from_rows(QUESTIONS, ANSWERS, change_id=5)
+
+@pytest.fixture
+def snapshot_manager(db_path):
+    manager = TriviaDatabaseManager(db_path=db_path, pool_size=2, snapshot=True)
+    yield manager
+    manager.close()
+
+
+def test_lookup_by_id(snapshot):
+    assert len(snapshot) == 3
+    assert snapshot.change_id == 5
+    question = snapshot.get(7)
+    assert (question.question_id, question.category, question.difficulty) == (7, "art", "hard")
+    assert question.question_text == "Which café did Picasso frequent?"
+    assert snapshot.get(4) is None and 4 not in snapshot and 9 in snapshot
+
+def test_answers_keep_the_first_correct_one(snapshot):
+    assert snapshot.answer(3) == "Leonardo"
+    assert snapshot.answer(7) is None
+    assert snapshot.answer(100) is None
+
+def test_select_and_page_follow_id_order(snapshot):
+    assert [q.question_id for q in snapshot.select()] == [3, 7, 9]
+    assert [q.question_id for q in snapshot.select(CategoryChoices.ART)] == [3, 7]
+    assert [q.question_id for q in snapshot.select(difficulty=DifficultyChoices.EASY)] == [3, 9]
+    assert snapshot.select(CategoryChoices.FOOD) == []
+
+    assert [q.question_id for q in snapshot.page(limit=2)] == [3, 7]
+    assert [q.question_id for q in snapshot.page(after=3, limit=2)] == [7, 9]
+    assert [q.question_id for q in snapshot.page(CategoryChoices.ART, after=7)] == []
+
+def test_saved_snapshot_is_memory_mapped(snapshot, tmp_path):
+    path = str(tmp_path / "questions.snapshot")
+    snapshot.save(path)
+    mapped = QuestionSnapshot.open(path)
+    assert mapped.change_id == 5
+    assert mapped.select() == snapshot.select()
+    assert mapped.answer(9) == "Beethoven"
+
+    (tmp_path / "garbage").write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        QuestionSnapshot.open(str(tmp_path / "garbage"))
+
+def by_id(questions):
+    return sorted(questions, key=lambda question: question.question_id)
+
+def test_manager_reads_match_the_database(db_manager, snapshot_manager):
+    # The unpaginated listings have no ORDER BY, the snapshot returns them in id order
+    for category in CategoryChoices:
+        assert snapshot_manager.get_question_by_category(category) == by_id(db_manager.get_question_by_category(category))
+    for difficulty in DifficultyChoices:
+        assert snapshot_manager.get_question_by_difficulty(difficulty) == by_id(
+            db_manager.get_question_by_difficulty(difficulty)
+        )
+    assert snapshot_manager.get_questions_by_category_and_difficulty(
+        CategoryChoices.ART, DifficultyChoices.HARD
+    ) == db_manager.get_questions_by_category_and_difficulty(CategoryChoices.ART, DifficultyChoices.HARD)
+    assert snapshot_manager.get_all_questions() == by_id(db_manager.get_all_questions())
+    assert snapshot_manager.get_questions_page(after=3, limit=4) == db_manager.get_questions_page(after=3, limit=4)
+    assert list(snapshot_manager.iter_questions(CategoryChoices.ART)) == list(db_manager.iter_questions(CategoryChoices.ART))
+    assert snapshot_manager.get_questions_by_ids([5, 999, 2]) == db_manager.get_questions_by_ids([5, 999, 2])
+    assert snapshot_manager.get_question_by_id(1) == db_manager.get_question_by_id(1)
+    assert snapshot_manager.get_correct_answer_by_question_id(4) == "Answer 4"
+
+def test_writes_swap_in_a_new_snapshot(snapshot_manager):
+    before = snapshot_manager._snapshot
+    added = snapshot_manager.add_question(CategoryChoices.FOOD, DifficultyChoices.HARD, "Which cheese is blue?")
+    assert snapshot_manager._snapshot is not before
+    assert snapshot_manager.get_question_by_id(added.question_id) == [added]
+
+    updated = snapshot_manager.update_question(added.question_id, category=CategoryChoices.ART)
+    assert updated[0].category == "art"
+    assert added.question_id in [q.question_id for q in snapshot_manager.get_question_by_category(CategoryChoices.ART)]
+    assert added.question_id not in [q.question_id for q in snapshot_manager.get_question_by_category(CategoryChoices.FOOD)]
+
+    snapshot_manager.delete_question(added.question_id)
+    assert snapshot_manager.get_question_by_id(added.question_id) == []
+
+def test_workers_share_the_snapshot_file(db_path, tmp_path, monkeypatch):
+    path = str(tmp_path / "questions.snapshot")
+    first = TriviaDatabaseManager(db_path=db_path, pool_size=2, snapshot=True, snapshot_path=path)
+    first.add_question(CategoryChoices.FOOD, DifficultyChoices.HARD, "Which nut is a seed?")
+
+    def rebuild(*args):
+        raise AssertionError("Snapshot rebuilt although the file was current")
+
+    monkeypatch.setattr(TriviaDatabaseManager, "build_question_snapshot", rebuild)
+    second = TriviaDatabaseManager(db_path=db_path, pool_size=2, snapshot=True, snapshot_path=path)
+    assert second.get_all_questions() == first.get_all_questions()
+    first.close()
+    second.close()
+
+def test_open_rejects_truncated_and_foreign_snapshots(tmp_path):
+    path = str(tmp_path / "questions.snapshot")
+    source = b"a" * 16
+    QuestionSnapshot.from_rows(QUESTIONS, ANSWERS, change_id=5, source=source, schema_version=3).save(path)
+    assert QuestionSnapshot.open(path, source, 3).source == source
+
+    with pytest.raises(ValueError, match="different database"):
+        QuestionSnapshot.open(path, b"b" * 16, 3)
+    with pytest.raises(ValueError, match="schema version"):
+        QuestionSnapshot.open(path, source, 4)
+
+    data = (tmp_path / "questions.snapshot").read_bytes()
+    (tmp_path / "questions.snapshot").write_bytes(data[:-1])
+    with pytest.raises(ValueError, match="Truncated"):
+        QuestionSnapshot.open(path)
+    (tmp_path / "questions.snapshot").write_bytes(data[:10])
+    with pytest.raises(ValueError, match="Truncated"):
+        QuestionSnapshot.open(path)
+
+def test_snapshot_file_of_another_database_is_rebuilt(db_path, tmp_path):
+    import shutil
+    other_path = str(tmp_path / "other.db")
+    shutil.copyfile(db_path, other_path)
+    path = str(tmp_path / "questions.snapshot")
+    first = TriviaDatabaseManager(db_path=db_path, pool_size=1, snapshot=True, snapshot_path=path)
+    first.add_question(CategoryChoices.FOOD, DifficultyChoices.HARD, "Only in the first database?")
+    first.close()
+
+    # Same change_id in the copy would have been enough to reuse the file before
+    with sqlite3.connect(other_path) as conn:
+        conn.execute("INSERT INTO QuestionChanges (question_id) VALUES (NULL)")
+    second = TriviaDatabaseManager(db_path=other_path, pool_size=1, snapshot=True, snapshot_path=path)
+    try:
+        assert len(second.get_all_questions()) == 30
+    finally:
+        second.close()